@@ -0,0 +1,15 @@
+"""
+Contains helpers that are shared by the tests.
+"""
+
+
+def overlap(range1, range2):
+    """
+    Return whether two ranges share at least one instant. This is a brute
+    force check based on the public interface, to verify faster ones against.
+    :param range1: a ``TimeRange``.
+    :param range2: a ``TimeRange``.
+    :return: ``True`` if the ranges overlap.
+    """
+    return (range1.start in range2 or range2.start in range1
+            or (range1.end is not None and range1.end in range2))
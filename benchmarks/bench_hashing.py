@@ -0,0 +1,107 @@
+"""
+Benchmark of the memory footprint of ``TimeRange`` instances and of the
+throughput of hashing and comparing them in sets and dicts.
+
+The current implementation is compared to the former one that had a
+``__dict__`` per instance and a hash that was built from ``strftime`` strings.
+
+Run it with::
+
+    python -m benchmarks.bench_hashing [number of ranges]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from trange import ForwardTimeRange
+
+
+class LegacyTimeRange:
+    """
+    A copy of the relevant parts of ``TimeRange`` as it was before it had
+    ``__slots__`` and a tuple based hash.
+    """
+    def __init__(self, start, end=None):
+        self._start = start
+        self._end = end
+        self._hash = None
+
+    @property
+    def start(self):
+        return self._start
+
+    @property
+    def end(self):
+        return self._end
+
+    def __hash__(self):
+        if not self._hash:
+            date_pattern = '%Y%m%d%H%M%S%f'
+            start_h = self.start.strftime(date_pattern)
+            end_h = self.end.strftime(date_pattern) if self.end else 20 * '0'
+            self._hash = int('%s%s%s' % (hash(self.__class__), start_h, end_h))
+        return self._hash
+
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+
+def _create(cls, pairs):
+    # Create a list of ranges of the given class.
+    return [cls(start, end) for start, end in pairs]
+
+
+def bytes_per_instance(cls, pairs):
+    """
+    Return the number of bytes that are allocated per instance of ``cls``
+    that is created from the given pairs.
+    :param cls: the class to instantiate with each pair.
+    :param pairs: a ``list`` of (start, end) tuples.
+    :return: the number of bytes per instance as ``float``.
+    """
+    gc.collect()
+    tracemalloc.start()
+    ranges = _create(cls, pairs)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ranges
+    return size / len(pairs)
+
+
+def _seconds(func):
+    # Return the number of seconds that func takes.
+    gc.collect()
+    before = time.perf_counter()
+    func()
+    return time.perf_counter() - before
+
+
+def run(number):
+    """
+    Run the benchmark with the given number of ranges and print the results.
+    :param number: the number of ranges to create.
+    """
+    start = datetime(2019, 1, 1)
+    # The datetime instances are shared, so only the ranges are measured.
+    pairs = [(start + timedelta(seconds=i), start + timedelta(seconds=i + 60))
+             for i in range(number)]
+    print('%-22s %12s %12s %12s %12s' % ('implementation', 'bytes/range',
+                                          'set (s)', 'dict (s)', 'lookup (s)'))
+    for cls in (LegacyTimeRange, ForwardTimeRange):
+        memory = bytes_per_instance(cls, pairs)
+        ranges = _create(cls, pairs)
+        set_time = _seconds(lambda: set(ranges))
+        # Fresh instances, so cached hashes do not flatter the results.
+        ranges = _create(cls, pairs)
+        dict_time = _seconds(lambda: {r: None for r in ranges})
+        lookup = {r: None for r in ranges}
+        others = _create(cls, pairs)
+        lookup_time = _seconds(lambda: [r in lookup for r in others])
+        print('%-22s %12.1f %12.3f %12.3f %12.3f' % (
+            cls.__name__, memory, set_time, dict_time, lookup_time))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,333 @@
+"""
+Benchmark suite of the hot paths of ``trange``: creating ranges, stepping,
+containment, hashing and comparing ranges in sets and dicts, set operations
+and the memory per instance.
+
+Like with asv, every function in this module of which the name starts with
+``time_`` or ``mem_`` is a benchmark. A ``time_`` function takes the number of
+operations and returns a function to time; its setup is not timed and is
+repeated for every run, so cached hashes do not flatter the results. A
+``mem_`` function takes the number of instances and returns the number of
+bytes per instance.
+
+Run the suite and store the results as JSON::
+
+    python -m benchmarks.suite run [-o results.json] [-k pattern]
+
+Compare two results and exit with status 1 if any benchmark regressed::
+
+    python -m benchmarks.suite compare baseline.json results.json
+
+Or run and compare at once::
+
+    python -m benchmarks.suite run -o results.json --compare baseline.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from statistics import median
+
+from benchmarks.bench_hashing import bytes_per_instance
+from trange import TimeRangeSet, trange
+from trange.trange import BackwardTimeRange, ForwardTimeRange
+
+
+DEFAULT_SIZE = 10 ** 4
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 1.25
+
+_START = datetime(2019, 1, 1)
+
+
+def _pairs(size, span=timedelta(minutes=1)):
+    # Return size pairs of shared datetime instances.
+    starts = [_START + timedelta(seconds=i) for i in range(size)]
+    return [(start, start + span) for start in starts]
+
+
+def _ranges(size):
+    # Return size distinct ranges.
+    return [ForwardTimeRange(start, end) for start, end in _pairs(size)]
+
+
+def _consume(iterable):
+    # Exhaust iterable without keeping its items.
+    deque(iterable, maxlen=0)
+
+
+def time_trange(size):
+    pairs = _pairs(size)
+    return lambda: [trange(start, end) for start, end in pairs]
+
+
+def time_from_pairs(size):
+    pairs = _pairs(size)
+    return lambda: ForwardTimeRange.from_pairs(pairs)
+
+
+def time_steps_1s(size):
+    steps = trange(_START, _START + timedelta(seconds=size - 1)).steps(
+        seconds=1)
+    return lambda: _consume(steps)
+
+
+def time_steps_1min(size):
+    steps = trange(_START, _START + timedelta(minutes=size - 1)).steps(
+        minutes=1)
+    return lambda: _consume(steps)
+
+
+def time_steps_1h(size):
+    steps = trange(_START, _START + timedelta(hours=size - 1)).steps(hours=1)
+    return lambda: _consume(steps)
+
+
+def time_steps_backward(size):
+    steps = trange(_START + timedelta(minutes=size - 1), _START).steps(
+        minutes=1)
+    return lambda: _consume(steps)
+
+
+def time_steps_index(size):
+    steps = trange(_START, _START + timedelta(minutes=size - 1)).steps(
+        minutes=1)
+    items = list(steps)
+    return lambda: [steps.index(item) for item in items]
+
+
+def time_windows(size):
+    windows = trange(_START, _START + timedelta(minutes=size + 59)).windows(
+        timedelta(hours=1), timedelta(minutes=1))
+    return lambda: _consume(windows)
+
+
+def time_windows_pairs(size):
+    windows = trange(_START, _START + timedelta(minutes=size + 59)).windows(
+        timedelta(hours=1), timedelta(minutes=1))
+    return lambda: _consume(windows.pairs())
+
+
+def time_windows_to_array(size):
+    windows = trange(_START, _START + timedelta(minutes=size + 59)).windows(
+        timedelta(hours=1), timedelta(minutes=1), clip=True)
+    return lambda: windows.to_array()
+
+
+def time_contains(size):
+    time_range = trange(_START, _START + timedelta(seconds=size // 2))
+    items = [_START + timedelta(seconds=i) for i in range(size)]
+    return lambda: [item in time_range for item in items]
+
+
+def time_contains_many(size):
+    time_range = trange(_START, _START + timedelta(seconds=size // 2))
+    items = [_START + timedelta(seconds=i) for i in range(size)]
+    return lambda: time_range.contains_many(items)
+
+
+def time_contains_rangeset(size):
+    range_set = TimeRangeSet(trange(_START + timedelta(minutes=2 * i),
+                                    _START + timedelta(minutes=2 * i + 1))
+                             for i in range(size))
+    items = [_START + timedelta(seconds=i * 97) for i in range(size)]
+    return lambda: [item in range_set for item in items]
+
+
+def time_hash_set(size):
+    ranges = _ranges(size)
+    return lambda: set(ranges)
+
+
+def time_hash_dict(size):
+    ranges = _ranges(size)
+    return lambda: {time_range: None for time_range in ranges}
+
+
+def time_dict_lookup(size):
+    lookup = dict.fromkeys(_ranges(size))
+    # Equal but distinct instances, so each lookup hashes and compares.
+    others = _ranges(size)
+    return lambda: [time_range in lookup for time_range in others]
+
+
+def time_eq(size):
+    ranges = _ranges(size)
+    others = _ranges(size)
+    return lambda: [a == b for a, b in zip(ranges, others)]
+
+
+def time_rangeset_union(size):
+    ranges = [trange(_START + timedelta(minutes=2 * i),
+                     _START + timedelta(minutes=2 * i + 1))
+              for i in range(size)]
+    first = TimeRangeSet(ranges[::2])
+    second = TimeRangeSet(ranges[1::2])
+    return lambda: first | second
+
+
+def time_rangeset_intersection(size):
+    first = TimeRangeSet(trange(_START + timedelta(minutes=2 * i),
+                                _START + timedelta(minutes=2 * i + 1))
+                         for i in range(size))
+    second = TimeRangeSet(trange(_START + timedelta(minutes=3 * i),
+                                 _START + timedelta(minutes=3 * i + 2))
+                          for i in range(size))
+    return lambda: first & second
+
+
+def mem_forward_range(size):
+    pairs = _pairs(size)
+    return bytes_per_instance(ForwardTimeRange, pairs)
+
+
+def mem_backward_range(size):
+    pairs = [(end, start) for start, end in _pairs(size)]
+    return bytes_per_instance(BackwardTimeRange, pairs)
+
+
+def benchmarks(pattern=None):
+    """
+    Return the benchmarks of this suite by name.
+    :param pattern: an optional substring that the names must contain.
+    :return: a ``dict`` of names and functions, sorted by name.
+    """
+    module = sys.modules[__name__]
+    return {name: getattr(module, name) for name in sorted(dir(module))
+            if name.startswith(('time_', 'mem_'))
+            and (pattern is None or pattern in name)}
+
+
+def run(size=DEFAULT_SIZE, repeat=DEFAULT_REPEAT, pattern=None, out=None):
+    """
+    Run the benchmarks and return their results.
+    :param size: the number of operations or instances per benchmark.
+    :param repeat: the number of runs per ``time_`` benchmark.
+    :param pattern: an optional substring that the names must contain.
+    :param out: an optional file to write a line per benchmark to.
+    :return: a ``dict`` with the environment under 'meta' and the results by
+    name under 'results'.
+    """
+    results = {}
+    for name, benchmark in benchmarks(pattern).items():
+        if name.startswith('mem_'):
+            value = benchmark(size)
+            result = {'unit': 'bytes', 'min': value, 'median': value}
+        else:
+            timings = []
+            for _ in range(repeat):
+                func = benchmark(size)
+                gc.collect()
+                before = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - before) / size)
+            result = {'unit': 's', 'min': min(timings),
+                      'median': median(timings)}
+        result.update(size=size, repeat=repeat)
+        results[name] = result
+        if out is not None:
+            print('%-28s %14s %14s' % (name, _format(result['min'], result),
+                                       _format(result['median'], result)),
+                  file=out)
+    return {'meta': {'python': platform.python_version(),
+                     'implementation': platform.python_implementation(),
+                     'platform': platform.platform(),
+                     'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'results': results}
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, out=None):
+    """
+    Compare the results of two runs by the minimum of each benchmark.
+    :param baseline: the results of the former run, as returned by ``run``.
+    :param current: the results of the latter run, as returned by ``run``.
+    :param threshold: the ratio of current to baseline above which a
+    benchmark counts as a regression.
+    :param out: an optional file to write a line per benchmark to.
+    :return: a ``list`` of the names of the benchmarks that regressed.
+    """
+    regressions = []
+    old_results = baseline['results']
+    new_results = current['results']
+    for name in sorted(set(old_results) & set(new_results)):
+        old, new = old_results[name], new_results[name]
+        ratio = new['min'] / old['min'] if old['min'] else float('inf')
+        regressed = ratio > threshold
+        if regressed:
+            regressions.append(name)
+        if out is not None:
+            print('%-28s %14s %14s %8.2f %s' % (
+                name, _format(old['min'], old), _format(new['min'], new),
+                ratio, 'REGRESSION' if regressed else ''), file=out)
+    return regressions
+
+
+def _format(value, result):
+    # Return value in the unit of result as readable text.
+    if result['unit'] == 'bytes':
+        return '%.1f B' % value
+    for unit, factor in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if value * factor >= 1:
+            return '%.3f %s' % (value * factor, unit)
+    return '%.1f ns' % (value * 1e9)
+
+
+def _load(path):
+    # Return the results that are stored in the file at path.
+    with open(path) as file:
+        return json.load(file)
+
+
+def main(argv=None):
+    """
+    Run the command line interface of the suite.
+    :param argv: the arguments, defaults to ``sys.argv[1:]``.
+    :return: the exit status: 1 if a benchmark regressed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-o', '--output', help='the JSON file to write')
+    run_parser.add_argument('-k', '--pattern',
+                            help='run only benchmarks with this in the name')
+    run_parser.add_argument('-n', '--size', type=int, default=DEFAULT_SIZE)
+    run_parser.add_argument('-r', '--repeat', type=int,
+                            default=DEFAULT_REPEAT)
+    run_parser.add_argument('--compare', metavar='BASELINE',
+                            help='a JSON file to compare the results to')
+    run_parser.add_argument('--threshold', type=float,
+                            default=DEFAULT_THRESHOLD)
+    compare_parser = commands.add_parser('compare',
+                                         help='compare two JSON files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float,
+                                default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        baseline, current = _load(args.baseline), _load(args.current)
+    elif args.command == 'run':
+        print('%-28s %14s %14s' % ('benchmark', 'min', 'median'))
+        current = run(args.size, args.repeat, args.pattern, sys.stdout)
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump(current, file, indent=2, sort_keys=True)
+        if not args.compare:
+            return 0
+        baseline = _load(args.compare)
+        print()
+    else:
+        parser.print_help()
+        return 0
+    print('%-28s %14s %14s %8s' % ('benchmark', 'baseline', 'current',
+                                    'ratio'))
+    regressions = compare(baseline, current, args.threshold, sys.stdout)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
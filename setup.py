@@ -4,9 +4,13 @@ Setup of this project.
 from setuptools import setup
 
 setup(name='trange',
-      version='0.1.1',
+      version='0.2.0',
       description='A library for time ranges',
       packages=[
           'trange'
       ],
+      extras_require={
+          'numpy': ['numpy'],
+          'pandas': ['pandas'],
+      },
       zip_safe=False)
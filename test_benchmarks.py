@@ -0,0 +1,57 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import TestCase
+from benchmarks import suite
+
+
+class TestSuite(TestCase):
+
+    def test_run(self):
+        out = StringIO()
+
+        result = suite.run(size=10, repeat=2, out=out)
+
+        self.assertEqual(set(suite.benchmarks()), set(result['results']))
+        self.assertEqual(len(result['results']),
+                         len(out.getvalue().splitlines()))
+        results = result['results']
+        self.assertEqual('bytes', results['mem_forward_range']['unit'])
+        self.assertEqual('s', results['time_trange']['unit'])
+        self.assertIn('python', result['meta'])
+
+    def test_pattern(self):
+        result = suite.run(size=10, repeat=1, pattern='steps_1')
+
+        self.assertEqual(['time_steps_1h', 'time_steps_1min', 'time_steps_1s'],
+                         sorted(result['results']))
+
+    def test_compare(self):
+        baseline = {'results': {'a': {'unit': 's', 'min': 1.0},
+                                'b': {'unit': 's', 'min': 1.0},
+                                'c': {'unit': 'bytes', 'min': 64.0}}}
+        current = {'results': {'a': {'unit': 's', 'min': 1.2},
+                               'b': {'unit': 's', 'min': 1.3},
+                               'c': {'unit': 'bytes', 'min': 72.0},
+                               'd': {'unit': 's', 'min': 1.0}}}
+        out = StringIO()
+
+        regressions = suite.compare(baseline, current, 1.25, out)
+
+        self.assertEqual(['b'], regressions)
+        self.assertEqual(['a', 'b', 'c'],
+                         suite.compare(baseline, current, 1.1))
+        self.assertEqual(3, len(out.getvalue().splitlines()))
+        self.assertIn('REGRESSION', out.getvalue().splitlines()[1])
+
+    def test_main(self):
+        out = StringIO()
+
+        with redirect_stdout(out):
+            status = suite.main(['run', '-n', '10', '-r', '1',
+                                 '-k', 'mem_forward'])
+
+        self.assertEqual(0, status)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith('benchmark'))
+        self.assertTrue(lines[1].startswith('mem_forward_range'))
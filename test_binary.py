@@ -0,0 +1,83 @@
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from unittest import TestCase
+from trange import trange, TimeRangeArray
+from trange import _optional
+from trange.binary import dump, dumps, load, loads, MappedTimeRanges
+
+
+class TestBinary(TestCase):
+
+    def setUp(self):
+        d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0, second=0,
+                      microsecond=1)
+        d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0, second=0,
+                      microsecond=0)
+        self.ranges = [trange(d1, d2), trange(d2, d1), trange(d1),
+                       trange(end=d2), trange(d1, d1),
+                       trange(datetime(1900, 1, 1), timedelta(days=1))]
+
+    def test_round_trip(self):
+        data = dumps(self.ranges)
+        self.assertEqual(16 + 17 * len(self.ranges), len(data))
+        self.assertEqual(self.ranges, loads(data).to_list())
+        file = BytesIO()
+        dump(TimeRangeArray.from_ranges(self.ranges), file)
+        file.seek(0)
+        self.assertEqual(self.ranges, list(load(file)))
+        self.assertEqual([], loads(dumps([])).to_list())
+
+    def test_round_trip_without_numpy(self):
+        missing = set(_optional._MISSING)
+        _optional._MISSING.add('numpy')
+        try:
+            data = dumps(self.ranges)
+            self.assertEqual(self.ranges, loads(data).to_list())
+        finally:
+            _optional._MISSING.clear()
+            _optional._MISSING.update(missing)
+        self.assertEqual(data, dumps(self.ranges))
+
+    def test_aware(self):
+        tz = timezone(timedelta(hours=1))
+        aware = [trange(datetime(2019, 1, 1, tzinfo=tz),
+                        datetime(2019, 1, 2, tzinfo=tz))]
+        with self.assertRaises(ValueError):
+            dumps(aware)
+        with self.assertRaises(ValueError):
+            dump(TimeRangeArray.from_ranges(aware), BytesIO())
+        naive = [trange(datetime(2018, 12, 31, 23), datetime(2019, 1, 1, 23))]
+        self.assertEqual(naive, loads(dumps(naive)).to_list())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            loads(b'NOPE' + dumps(self.ranges)[4:])
+        with self.assertRaises(ValueError):
+            loads(dumps(self.ranges)[:-1])
+
+    def test_mapped(self):
+        handle, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                dump(self.ranges, file)
+            with MappedTimeRanges(path) as mapped:
+                self.assertEqual(len(self.ranges), len(mapped))
+                self.assertEqual(self.ranges[3], mapped[3])
+                self.assertEqual(self.ranges[-1], mapped[-1])
+                self.assertEqual(self.ranges, list(mapped))
+                self.assertEqual(TimeRangeArray.from_ranges(self.ranges),
+                                 mapped.to_array())
+                start, end, forward = mapped.raw(2)
+                self.assertEqual(TimeRangeArray.INFINITE, end)
+                self.assertTrue(forward)
+                with self.assertRaises(IndexError):
+                    mapped[len(self.ranges)]
+                if _optional.try_import('numpy') is not None:
+                    records = mapped.records()
+                    self.assertEqual(list(mapped.to_array().starts),
+                                     records['start'].tolist())
+                    del records
+        finally:
+            os.remove(path)
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from itertools import count
+from unittest import TestCase
+from trange import trange
+
+
+class TestBucketize(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.events = [self.d1 + timedelta(minutes=7 * i)
+                       for i in range(-10, 230)]
+
+    def test_bucketize(self):
+        tr = trange(self.d1, self.d2)
+        steps = tr.steps(hours=5)
+        result = list(tr.bucketize(self.events, hours=5))
+        self.assertEqual([e for e in self.events if e in tr],
+                         [e for _, e in result])
+        for index, event in result:
+            self.assertTrue(steps[index] <= event)
+            self.assertTrue(index == len(steps) - 1
+                            or event < steps[index + 1])
+
+    def test_bucketize_backward(self):
+        tr = trange(self.d2, self.d1)
+        result = list(tr.bucketize(reversed(self.events), hours=5,
+                                   include_end=False))
+        self.assertEqual([e for e in reversed(self.events)
+                          if tr.contains(e, True, False)],
+                         [e for _, e in result])
+        self.assertEqual(0, result[0][0])
+        for index, event in result:
+            self.assertTrue(self.d2 - timedelta(hours=5) * (index + 1)
+                            < event <= self.d2 - timedelta(hours=5) * index)
+
+    def test_aggregate(self):
+        tr = trange(self.d1, self.d2)
+        counts = dict(tr.bucketize(self.events, hours=5, aggregate='count'))
+        self.assertEqual({0: 43, 1: 43, 2: 43, 3: 43, 4: 34}, counts)
+        self.assertEqual(list(counts.items()),
+                         list(tr.bucketize(self.events, hours=5,
+                                           aggregate='count', ordered=True)))
+        events = [(e, i) for i, e in enumerate(self.events)]
+        maxima = dict(tr.bucketize(events, hours=5, key=lambda e: e[0],
+                                   value=lambda e: e[1], aggregate='max'))
+        self.assertEqual(52, maxima[0])
+        sums = dict(tr.bucketize(events, hours=12, key=lambda e: e[0],
+                                 value=lambda e: e[1], aggregate='sum'))
+        self.assertEqual(sum(i for e, i in events if e in tr),
+                         sum(sums.values()))
+        with self.assertRaises(ValueError):
+            list(tr.bucketize(reversed(self.events), hours=5,
+                              aggregate='count', ordered=True))
+        with self.assertRaises(ValueError):
+            list(tr.bucketize(self.events, hours=5, aggregate='median'))
+
+    def test_unbounded(self):
+        tr = trange(self.d1)
+        events = (self.d1 + timedelta(minutes=i) for i in count())
+        aggregates = tr.bucketize(events, hours=1, aggregate='count',
+                                  ordered=True)
+        self.assertEqual([(0, 60), (1, 60), (2, 60)],
+                         [next(aggregates) for _ in range(3)])
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from threading import Thread
+from unittest import TestCase, skipIf
+from trange import trange
+from trange.cache import CacheInfo, StepCache
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestStepCache(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+
+    def test_steps(self):
+        cache = StepCache()
+        time_range = trange(self.d1, self.d2)
+
+        steps1 = cache.steps(time_range, minutes=5)
+        steps2 = cache.steps(trange(self.d1, self.d2), minutes=5)
+        steps3 = cache.steps(time_range, delta=timedelta(minutes=5))
+
+        self.assertEqual(tuple(time_range.steps(minutes=5)), steps1)
+        self.assertIs(steps1, steps2)
+        self.assertIs(steps1, steps3)
+        self.assertEqual(CacheInfo(2, 1, 128, 1), cache.info())
+
+    def test_keys(self):
+        cache = StepCache()
+        time_range = trange(self.d1, self.d2)
+
+        cache.steps(time_range, minutes=5)
+        cache.steps(time_range, minutes=5, include_end=False)
+        cache.steps(time_range, minutes=10)
+        cache.steps(trange(self.d2, self.d1), minutes=5)
+
+        self.assertEqual(CacheInfo(0, 4, 128, 4), cache.info())
+
+    def test_lru_eviction(self):
+        cache = StepCache(maxsize=2)
+        time_range = trange(self.d1, self.d2)
+
+        cache.steps(time_range, hours=1)
+        cache.steps(time_range, hours=2)
+        cache.steps(time_range, hours=1)
+        cache.steps(time_range, hours=3)
+        cache.steps(time_range, hours=1)
+        self.assertEqual(CacheInfo(2, 3, 2, 2), cache.info())
+        cache.steps(time_range, hours=2)
+
+        self.assertEqual(CacheInfo(2, 4, 2, 2), cache.info())
+        self.assertEqual(2, len(cache))
+
+    def test_clear(self):
+        cache = StepCache()
+        cache.steps(trange(self.d1, self.d2), hours=1)
+
+        cache.clear()
+
+        self.assertEqual(CacheInfo(0, 0, 128, 0), cache.info())
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            StepCache(maxsize=0)
+        with self.assertRaises(ValueError):
+            StepCache().steps(trange(self.d1), hours=1)
+
+    def test_threads(self):
+        cache = StepCache(maxsize=4)
+        ranges = [trange(self.d1, self.d2 + timedelta(hours=i))
+                  for i in range(6)]
+        errors = []
+
+        def work():
+            for i in range(300):
+                time_range = ranges[i % len(ranges)]
+                if cache.steps(time_range, minutes=30) != tuple(
+                        time_range.steps(minutes=30)):
+                    errors.append(time_range)
+
+        threads = [Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        info = cache.info()
+        self.assertEqual([], errors)
+        self.assertEqual(8 * 300, info.hits + info.misses)
+        self.assertEqual(4, info.currsize)
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_steps_array(self):
+        cache = StepCache()
+        time_range = trange(self.d1, self.d2)
+
+        array1 = cache.steps_array(time_range, minutes=5)
+        array2 = cache.steps_array(time_range, minutes=5)
+        array3 = cache.steps_array(time_range, minutes=5, limit=3)
+
+        self.assertIs(array1, array2)
+        self.assertEqual(3, len(array3))
+        self.assertTrue((time_range.steps_array(minutes=5) == array1).all())
+        self.assertFalse(array1.flags.writeable)
+        self.assertEqual(CacheInfo(1, 2, 128, 2), cache.info())
@@ -0,0 +1,187 @@
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from itertools import islice
+from unittest import TestCase
+from trange import trange, BusinessCalendar, CalendarStepSequence
+
+
+def _reference_months(time_range, months, include_start, include_end):
+    # Add months to start one by one, clamping the day of the month.
+    start = time_range.start
+    result = []
+    n = 0
+    while True:
+        month = start.month - 1 + n * months
+        year = start.year + month // 12
+        month = month % 12 + 1
+        day = min(start.day, monthrange(year, month)[1])
+        current = start.replace(year=year, month=month, day=day)
+        if not time_range.contains(current, include_start, include_end):
+            if current != start:
+                return result
+        else:
+            result.append(current)
+        n += 1
+
+
+def _reference_business_days(time_range, business_days, calendar,
+                             include_start, include_end):
+    # Step daily and keep every n-th business day.
+    direction = 1 if time_range.end >= time_range.start else -1
+    current = time_range.start
+    result = []
+    count = 0
+    while time_range.contains(current, True, True):
+        if calendar.is_business_day(current):
+            if count % business_days == 0:
+                result.append(current)
+            count += 1
+        current += timedelta(days=direction)
+    return [dt for dt in result
+            if time_range.contains(dt, include_start, include_end)]
+
+
+class TestCalendarSteps(TestCase):
+
+    def setUp(self):
+        self.calendar = BusinessCalendar(
+            holidays=[date(2019, 12, 25), date(2019, 12, 26),
+                      date(2020, 1, 1), date(2019, 12, 28)])
+
+    def test_months(self):
+        time_range = trange(datetime(2019, 1, 31, 9), datetime(2021, 3, 31, 9))
+        for months in (1, 2, 5, 12, 13):
+            for include_start in (True, False):
+                for include_end in (True, False):
+                    steps = time_range.calendar_steps(
+                        months=months, include_start=include_start,
+                        include_end=include_end)
+                    expected = _reference_months(time_range, months,
+                                                 include_start, include_end)
+                    self.assertEqual(expected, list(steps))
+                    self.assertEqual(len(expected), len(steps))
+                    self.assertEqual(expected[::-1], list(reversed(steps)))
+                    for index, dt in enumerate(expected):
+                        self.assertEqual(dt, steps[index])
+                        self.assertEqual(index, steps.index(dt))
+                        self.assertIn(dt, steps)
+
+    def test_month_clamping(self):
+        time_range = trange(datetime(2019, 1, 31), datetime(2019, 5, 1))
+
+        steps = time_range.calendar_steps(months=1)
+
+        self.assertEqual([date(2019, 1, 31), date(2019, 2, 28),
+                          date(2019, 3, 31), date(2019, 4, 30)],
+                         [dt.date() for dt in steps])
+        self.assertNotIn(datetime(2019, 2, 27), steps)
+        self.assertNotIn(datetime(2019, 3, 28), steps)
+
+    def test_years(self):
+        time_range = trange(datetime(2020, 2, 29), datetime(2024, 3, 1))
+
+        steps = time_range.calendar_steps(years=1)
+
+        self.assertEqual([datetime(2020, 2, 29), datetime(2021, 2, 28),
+                          datetime(2022, 2, 28), datetime(2023, 2, 28),
+                          datetime(2024, 2, 29)], list(steps))
+        self.assertEqual(list(steps),
+                         list(time_range.calendar_steps(months=12)))
+
+    def test_backward_months(self):
+        time_range = trange(datetime(2019, 12, 31), datetime(2019, 1, 31))
+
+        steps = time_range.calendar_steps(months=3, include_end=False)
+
+        self.assertEqual([datetime(2019, 12, 31), datetime(2019, 9, 30),
+                          datetime(2019, 6, 30), datetime(2019, 3, 31)],
+                         list(steps))
+
+    def test_business_days(self):
+        ranges = [trange(datetime(2019, 12, 21, 9), datetime(2020, 1, 17, 9)),
+                  trange(datetime(2020, 1, 17, 9), datetime(2019, 12, 21, 9)),
+                  trange(datetime(2019, 12, 23, 9), datetime(2020, 1, 3, 8))]
+        for time_range in ranges:
+            for business_days in (1, 2, 3, 7):
+                for include_start in (True, False):
+                    for include_end in (True, False):
+                        steps = time_range.calendar_steps(
+                            business_days=business_days,
+                            calendar=self.calendar,
+                            include_start=include_start,
+                            include_end=include_end)
+                        expected = _reference_business_days(
+                            time_range, business_days, self.calendar,
+                            include_start, include_end)
+                        self.assertEqual(expected, list(steps))
+                        self.assertEqual(len(expected), len(steps))
+                        for index, dt in enumerate(expected):
+                            self.assertEqual(dt, steps[index])
+                            self.assertEqual(index, steps.index(dt))
+
+    def test_business_days_skip_holidays_and_weekends(self):
+        time_range = trange(datetime(2019, 12, 21, 9), datetime(2020, 1, 3, 9))
+
+        steps = time_range.calendar_steps(business_days=1,
+                                          calendar=self.calendar)
+
+        self.assertEqual([date(2019, 12, 23), date(2019, 12, 24),
+                          date(2019, 12, 27), date(2019, 12, 30),
+                          date(2019, 12, 31), date(2020, 1, 2),
+                          date(2020, 1, 3)], [dt.date() for dt in steps])
+        self.assertNotIn(datetime(2019, 12, 25, 9), steps)
+        self.assertNotIn(datetime(2019, 12, 27, 10), steps)
+        self.assertNotIn(date(2019, 12, 27), steps)
+
+    def test_weekmask(self):
+        calendar = BusinessCalendar('0000011')
+        time_range = trange(datetime(2019, 1, 1), datetime(2019, 1, 31))
+
+        steps = time_range.calendar_steps(business_days=1, calendar=calendar)
+
+        self.assertEqual(8, len(steps))
+        self.assertTrue(all(dt.weekday() >= 5 for dt in steps))
+        self.assertEqual(calendar, BusinessCalendar([0, 0, 0, 0, 0, 1, 1]))
+        self.assertEqual(hash(calendar),
+                         hash(BusinessCalendar([0, 0, 0, 0, 0, 1, 1])))
+
+    def test_infinite(self):
+        time_range = trange(datetime(2019, 1, 31))
+
+        steps = time_range.calendar_steps(months=1)
+        business = time_range.calendar_steps(business_days=5)
+
+        self.assertIsInstance(steps, CalendarStepSequence)
+        self.assertEqual(datetime(2019, 2, 28), steps[1])
+        self.assertEqual([datetime(2019, 1, 31), datetime(2019, 3, 31)],
+                         list(islice(steps[::2], 2)))
+        self.assertEqual(datetime(2029, 2, 28), steps[121])
+        self.assertIn(datetime(2029, 2, 28), steps)
+        self.assertEqual(datetime(2019, 2, 7), business[1])
+        with self.assertRaises(TypeError):
+            len(steps)
+
+    def test_slicing(self):
+        time_range = trange(datetime(2019, 1, 1), datetime(2029, 1, 1))
+        steps = time_range.calendar_steps(months=1)
+
+        self.assertEqual(list(steps)[5:100:7], list(steps[5:100:7]))
+        self.assertEqual(list(steps)[::-3], list(steps[::-3]))
+        self.assertEqual(0, len(steps[10:5]))
+        self.assertEqual(steps[3:9], steps[3:9])
+
+    def test_errors(self):
+        time_range = trange(datetime(2019, 1, 1), datetime(2019, 2, 1))
+
+        with self.assertRaises(ValueError):
+            time_range.calendar_steps()
+        with self.assertRaises(ValueError):
+            time_range.calendar_steps(months=1, business_days=1)
+        with self.assertRaises(ValueError):
+            time_range.calendar_steps(months=1, calendar=self.calendar)
+        with self.assertRaises(TypeError):
+            time_range.calendar_steps(months=1.5)
+        with self.assertRaises(ValueError):
+            BusinessCalendar('11111')
+        with self.assertRaises(ValueError):
+            BusinessCalendar('0000000')
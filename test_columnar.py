@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from trange import trange, TimeRangeArray
+from trange import _optional
+from trange._epoch import INT64_MAX
+
+
+class TestTimeRangeArray(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d3 = datetime(year=2019, month=1, day=3, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.ranges = [trange(self.d2, self.d3), trange(self.d2, self.d1),
+                       trange(self.d3), trange(end=self.d2),
+                       trange(self.d1, self.d1)]
+
+    def _check_operations(self):
+        array = TimeRangeArray.from_ranges(self.ranges)
+        self.assertEqual(len(self.ranges), len(array))
+        self.assertEqual(self.ranges, array.to_list())
+        self.assertEqual(self.ranges[1], array[1])
+        self.assertEqual(self.ranges[-1], array[-1])
+        self.assertEqual(self.ranges[1:3], list(array[1:3]))
+        self.assertEqual([TimeRangeArray.INFINITE if r.end is None
+                          else r.delta // timedelta(microseconds=1)
+                          for r in self.ranges], list(array.deltas()))
+        for dt in (self.d1, self.d2, self.d3, self.d3 + timedelta(days=9)):
+            for include_start in (True, False):
+                for include_end in (True, False):
+                    self.assertEqual(
+                        [r.contains(dt, include_start, include_end)
+                         for r in self.ranges],
+                        list(array.contains(dt, include_start, include_end)))
+        lower, upper = array.bounds()
+        self.assertEqual(list(array.starts[:1]), list(lower[:1]))
+        self.assertEqual([array.ends[1], INT64_MAX], [lower[1], upper[2]])
+        window = trange(self.d2 + timedelta(hours=1), self.d3)
+        self.assertEqual([True, False, True, False, False],
+                         list(array.overlaps(window)))
+        self.assertEqual([self.ranges[i] for i in (3, 4, 1, 0, 2)],
+                         array.sorted().to_list())
+        self.assertEqual([self.ranges[0], self.ranges[2]],
+                         array.filter(array.overlaps(window)).to_list())
+        self.assertEqual(array, TimeRangeArray(array.starts, array.ends,
+                                               array.forward))
+
+    def test_operations(self):
+        self._check_operations()
+
+    def test_operations_without_numpy(self):
+        missing = set(_optional._MISSING)
+        _optional._MISSING.add('numpy')
+        try:
+            self._check_operations()
+        finally:
+            _optional._MISSING.clear()
+            _optional._MISSING.update(missing)
+
+    def test_constructor(self):
+        array = TimeRangeArray([0, 10, 5], [10, 0, TimeRangeArray.INFINITE])
+        self.assertEqual([1, 0, 1], list(array.forward))
+        self.assertEqual(trange(datetime(1970, 1, 1, microsecond=10),
+                                datetime(1970, 1, 1)), array[1])
+        with self.assertRaises(ValueError):
+            TimeRangeArray([0, 10], [10])
+        with self.assertRaises(ValueError):
+            TimeRangeArray([0], [10], [False])
+
+    def test_aware(self):
+        tz = timezone(timedelta(hours=2))
+        ranges = [trange(self.d1.replace(tzinfo=tz), self.d2.replace(
+            tzinfo=tz)), trange(self.d3.replace(tzinfo=tz))]
+
+        array = TimeRangeArray.from_ranges(ranges)
+
+        self.assertEqual(tz, array.tz)
+        self.assertEqual(ranges, array.to_list())
+        self.assertEqual([tz, tz], [r.start.tzinfo for r in array])
+        self.assertEqual(self.d1, array[0].start.replace(tzinfo=None))
+        self.assertEqual(tz, array[:1].tz)
+        self.assertEqual(tz, array.sorted().tz)
+        self.assertNotEqual(array, TimeRangeArray(array.starts, array.ends,
+                                                  array.forward))
+        self.assertIsNone(TimeRangeArray.from_ranges(self.ranges).tz)
+        with self.assertRaises(ValueError):
+            TimeRangeArray.from_ranges([ranges[0], self.ranges[0]])
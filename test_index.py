@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from random import Random
+from unittest import TestCase
+from trange import trange, TimeRangeIndex
+from _testutils import overlap
+
+
+class TestTimeRangeIndex(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        rnd = Random(42)
+        self.ranges = []
+        for _ in range(300):
+            start = self.d1 + timedelta(minutes=rnd.randint(0, 5000))
+            end = start + timedelta(minutes=rnd.randint(-300, 300))
+            self.ranges.append(trange(start, end))
+        self.ranges += [trange(self.d1 + timedelta(minutes=4000)),
+                        trange(end=self.d1 + timedelta(minutes=1000)),
+                        trange(self.d1, self.d1)]
+        self.instants = [self.d1 + timedelta(minutes=rnd.randint(-100, 5400))
+                         for _ in range(100)] + [self.d1]
+
+    def test_stab(self):
+        index = TimeRangeIndex(self.ranges)
+        self.assertEqual(len(self.ranges), len(index))
+        for instant in self.instants:
+            expected = [r for r in self.ranges if instant in r]
+            self.assertEqual(sorted(expected, key=repr),
+                             sorted(index.stab(instant), key=repr))
+
+    def test_overlapping(self):
+        index = TimeRangeIndex(self.ranges)
+        windows = self.ranges[:50] + [trange(self.d1), trange(end=self.d1)]
+        for window in windows:
+            expected = [r for r in self.ranges if overlap(r, window)]
+            self.assertEqual(sorted(expected, key=repr),
+                             sorted(index.overlapping(window), key=repr))
+
+    def test_add_and_remove(self):
+        index = TimeRangeIndex()
+        for time_range in self.ranges:
+            index.add(time_range)
+        index.add(self.ranges[0])
+        for time_range in self.ranges[::2]:
+            index.remove(time_range)
+        remaining = self.ranges[1::2] + [self.ranges[0]]
+        self.assertEqual(len(remaining), len(index))
+        self.assertTrue(self.ranges[0] in index)
+        self.assertFalse(self.ranges[2] in index)
+        for instant in self.instants:
+            expected = [r for r in remaining if instant in r]
+            self.assertEqual(sorted(expected, key=repr),
+                             sorted(index.stab(instant), key=repr))
+        lowers = [min(r.start, r.end or r.start) for r in index
+                  if r.end is not None]
+        self.assertEqual(sorted(lowers), lowers)
+        with self.assertRaises(KeyError):
+            index.remove(self.ranges[2])
+        index.discard(self.ranges[2])
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from trange import trange, instrument
+from trange.steps import StepIterator, StepSequence
+from trange.trange import ForwardTimeRange, TimeRange
+
+
+class TestInstrument(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+
+    def tearDown(self):
+        while instrument.is_enabled():
+            instrument.disable()
+
+    def test_collect(self):
+        with instrument.collect() as stats:
+            time_range = trange(self.d1, self.d2)
+            list(time_range.steps(hours=1))
+            list(reversed(time_range.steps(hours=2)))
+            self.d1 in time_range
+            trange(self.d2, self.d1).contains(self.d1, True, False)
+            hash(time_range)
+            hash(time_range)
+            ForwardTimeRange.from_pairs([(self.d1, self.d2)] * 3)
+
+        self.assertEqual(5, stats.count(instrument.CONSTRUCT))
+        self.assertEqual(25 + 13, stats.count(instrument.STEPS))
+        self.assertEqual(2, stats.count(instrument.CONTAINS))
+        self.assertEqual(1, stats.count(instrument.HASH))
+        self.assertLess(0, stats.seconds(instrument.STEPS))
+        self.assertEqual(0, stats.count('unknown'))
+        self.assertEqual(set(instrument.EVENTS), set(stats.as_dict()))
+
+    def test_step_paths(self):
+        time_range = trange(self.d1, self.d1 + timedelta(hours=10))
+        with instrument.collect() as stats:
+            list(time_range.steps(hours=1).iterator())
+        self.assertEqual(11, stats.count(instrument.STEPS))
+
+        year = trange(self.d1, self.d1 + timedelta(days=365))
+        with instrument.collect() as stats:
+            list(year.calendar_steps(months=1))
+            list(reversed(year.calendar_steps(months=1)))
+        self.assertEqual(26, stats.count(instrument.STEPS))
+
+        with instrument.collect() as stats:
+            list(time_range.tz_steps(timezone.utc, hours=1))
+        self.assertEqual(11, stats.count(instrument.STEPS))
+
+    def test_contains_many(self):
+        time_range = trange(self.d1, self.d2)
+        with instrument.collect() as stats:
+            time_range.contains_many([self.d1, self.d2, self.d2])
+            time_range.contains_many([self.d1, self.d2], assume_sorted=True)
+            mask = time_range.contains_many(
+                item for item in [self.d1, self.d2])
+
+        self.assertEqual([True, True], mask)
+        self.assertEqual(7, stats.count(instrument.CONTAINS))
+
+    def test_disabled(self):
+        originals = (ForwardTimeRange.__init__, ForwardTimeRange.contains,
+                     TimeRange.__hash__, StepSequence.__iter__,
+                     StepIterator.__next__)
+        stats = instrument.Stats()
+        instrument.add_observer(stats)
+
+        with instrument.collect():
+            self.assertIsNot(originals[0], ForwardTimeRange.__init__)
+        list(trange(self.d1, self.d2).steps(hours=1))
+        instrument.remove_observer(stats)
+
+        self.assertFalse(instrument.is_enabled())
+        self.assertEqual((ForwardTimeRange.__init__,
+                          ForwardTimeRange.contains, TimeRange.__hash__,
+                          StepSequence.__iter__, StepIterator.__next__),
+                         originals)
+        self.assertEqual({}, stats.as_dict())
+
+    def test_nested(self):
+        with instrument.collect() as outer:
+            trange(self.d1, self.d2)
+            with instrument.collect() as inner:
+                trange(self.d1, self.d2)
+            self.assertTrue(instrument.is_enabled())
+            trange(self.d1, self.d2)
+
+        self.assertEqual(3, outer.count(instrument.CONSTRUCT))
+        self.assertEqual(1, inner.count(instrument.CONSTRUCT))
+        self.assertFalse(instrument.is_enabled())
+
+    def test_observer(self):
+        events = []
+        observer = lambda *args: events.append(args)
+        instrument.add_observer(observer)
+        instrument.enable()
+        try:
+            list(trange(self.d1, self.d1 + timedelta(hours=1)).steps(
+                minutes=30))
+        finally:
+            instrument.disable()
+            instrument.remove_observer(observer)
+
+        self.assertEqual([instrument.CONSTRUCT, instrument.STEPS],
+                         [event for event, _, _ in events])
+        self.assertEqual(3, events[1][1])
+
+    def test_abandoned_steps(self):
+        with instrument.collect() as stats:
+            steps = iter(trange(self.d1).steps(hours=1))
+            next(steps)
+            next(steps)
+            steps.close()
+
+        self.assertEqual(2, stats.count(instrument.STEPS))
+
+    def test_stats(self):
+        stats = instrument.Stats()
+        stats('a', 1, 0.5)
+        stats('a', 2, 0.25)
+
+        self.assertEqual(3, stats.count('a'))
+        self.assertEqual(0.75, stats.seconds('a'))
+        self.assertEqual("Stats({'a': (3, 0.75)})", repr(stats))
+        stats.clear()
+        self.assertEqual({}, stats.as_dict())
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase, skipIf
+from trange import trange, TimeRangeArray, ZonedStepSequence
+from trange.interop import (from_datetimeindex, from_interval_index,
+                            to_datetimeindex, to_interval_index)
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+
+@skipIf(pandas is None, 'pandas is not installed')
+class TestInterop(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+
+    def test_to_datetimeindex(self):
+        for time_range in (trange(self.d1, self.d2), trange(self.d2, self.d1)):
+            steps = time_range.steps(minutes=7)
+
+            index = steps.to_datetimeindex(name='steps')
+
+            self.assertEqual(list(pandas.DatetimeIndex(list(steps))),
+                             list(index))
+            self.assertEqual('steps', index.name)
+        self.assertEqual(0, len(trange(self.d1, self.d1).steps(
+            hours=1, include_start=False).to_datetimeindex()))
+        with self.assertRaises(ValueError):
+            trange(self.d1).steps(hours=1).to_datetimeindex()
+
+    def test_to_datetimeindex_fixed_offset(self):
+        tz = timezone(timedelta(hours=2))
+        time_range = trange(self.d1.replace(tzinfo=tz),
+                            self.d2.replace(tzinfo=tz))
+
+        index = to_datetimeindex(time_range.steps(hours=1))
+
+        self.assertEqual(list(time_range.steps(hours=1)), list(index))
+        self.assertEqual(timedelta(hours=2), index[0].utcoffset())
+
+    @skipIf(ZoneInfo is None, 'zoneinfo is not available')
+    def test_to_datetimeindex_zoned(self):
+        tz = ZoneInfo('Europe/Amsterdam')
+        time_range = trange(datetime(2019, 3, 30, 1, 30, tzinfo=tz),
+                            datetime(2019, 10, 28, 3, tzinfo=tz))
+        for mode in ('wall', 'absolute'):
+            steps = time_range.tz_steps(mode=mode, minutes=30)
+
+            index = steps.to_datetimeindex()
+
+            self.assertEqual([dt.timestamp() for dt in steps],
+                             [ts.timestamp() for ts in index])
+            self.assertEqual([dt.utcoffset() for dt in steps],
+                             [ts.utcoffset() for ts in index])
+
+    def test_from_datetimeindex(self):
+        steps = trange(self.d1, self.d2).steps(minutes=7)
+        index = steps.to_datetimeindex()
+
+        self.assertEqual(steps, from_datetimeindex(index))
+        self.assertEqual(list(steps[:1]),
+                         list(from_datetimeindex(pandas.date_range(
+                             self.d1, periods=1, freq='7min'))))
+        with self.assertRaises(ValueError):
+            from_datetimeindex(pandas.DatetimeIndex([self.d1, self.d2,
+                                                     self.d2]))
+        with self.assertRaises(ValueError):
+            from_datetimeindex(pandas.DatetimeIndex([self.d1]))
+
+    def test_from_datetimeindex_aware(self):
+        index = pandas.date_range('2019-03-30', '2019-04-01', freq='h',
+                                  tz='Europe/Amsterdam')
+
+        steps = from_datetimeindex(index)
+
+        self.assertIsInstance(steps, ZonedStepSequence)
+        self.assertEqual('absolute', steps.mode)
+        self.assertEqual([ts.timestamp() for ts in index],
+                         [dt.timestamp() for dt in steps])
+        self.assertEqual(list(index), list(steps.to_datetimeindex()))
+
+    def test_to_interval_index(self):
+        ranges = [trange(self.d1, self.d2), trange(self.d2, self.d1),
+                  trange(self.d1, self.d1 + timedelta(hours=1))]
+
+        index = to_interval_index(ranges, name='ranges')
+        index_array = TimeRangeArray.from_ranges(ranges).to_interval_index(
+            closed='left')
+
+        expected = [pandas.Interval(pandas.Timestamp(self.d1),
+                                    pandas.Timestamp(self.d2), 'both')] * 2
+        expected.append(pandas.Interval(
+            pandas.Timestamp(self.d1),
+            pandas.Timestamp(self.d1 + timedelta(hours=1)), 'both'))
+        self.assertEqual(expected, list(index))
+        self.assertEqual('ranges', index.name)
+        self.assertEqual('left', index_array.closed)
+        self.assertEqual([True, True, False],
+                         list(index.contains(pandas.Timestamp(self.d2))))
+        with self.assertRaises(ValueError):
+            to_interval_index([trange(self.d1)])
+
+    def test_to_interval_index_aware(self):
+        tz = timezone(timedelta(hours=-5))
+        ranges = [trange(self.d1.replace(tzinfo=tz),
+                         self.d2.replace(tzinfo=tz))]
+
+        index = to_interval_index(ranges)
+
+        self.assertEqual(pandas.Timestamp(self.d1.replace(tzinfo=tz)),
+                         index[0].left)
+        self.assertEqual(tz, index[0].left.tzinfo)
+        self.assertEqual(ranges, from_interval_index(index).to_list())
+        self.assertEqual(timedelta(hours=-5),
+                         from_interval_index(index)[0].start.utcoffset())
+
+    def test_from_interval_index(self):
+        ranges = [trange(self.d1, self.d2),
+                  trange(self.d1, self.d1 + timedelta(hours=1))]
+
+        result = from_interval_index(to_interval_index(ranges))
+
+        self.assertEqual(TimeRangeArray.from_ranges(ranges), result)
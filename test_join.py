@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from random import Random
+from unittest import TestCase
+from trange import trange, interval_join, TimeRangeArray, TimeRangeSet
+from _testutils import overlap
+
+
+class TestIntervalJoin(TestCase):
+
+    def setUp(self):
+        self.base = datetime(2019, 1, 1)
+        rnd = Random(3)
+
+        def random_ranges(n):
+            result = []
+            for _ in range(n):
+                start = self.base + timedelta(minutes=rnd.randint(0, 1000))
+                end = start + timedelta(minutes=rnd.randint(-60, 60))
+                result.append(trange(start, end))
+            return result
+
+        self.left = random_ranges(150) + [trange(end=self.base)]
+        self.right = random_ranges(150) + [trange(self.base)]
+
+    def _expected(self):
+        return sorted((repr(l), repr(r)) for l in self.left
+                      for r in self.right if overlap(l, r))
+
+    def test_join(self):
+        pairs = list(interval_join(self.left, self.right))
+        self.assertEqual(self._expected(),
+                         sorted((repr(l), repr(r)) for l, r in pairs))
+
+    def test_join_sorted_and_columnar(self):
+        left = TimeRangeArray.from_ranges(self.left).sorted()
+        right = TimeRangeArray.from_ranges(self.right)
+        pairs = list(interval_join(left, right, assume_sorted=False))
+        self.assertEqual(self._expected(),
+                         sorted((repr(l), repr(r)) for l, r in pairs))
+        pairs = list(interval_join(left.to_list(), right.sorted().to_list(),
+                                   assume_sorted=True))
+        self.assertEqual(self._expected(),
+                         sorted((repr(l), repr(r)) for l, r in pairs))
+        with self.assertRaises(ValueError):
+            list(interval_join(self.left, self.right, assume_sorted=True))
+
+    def test_intersection(self):
+        for left, right, shared in interval_join(self.left, self.right,
+                                                 intersection=True):
+            self.assertTrue(shared.start in left and shared.start in right)
+            if shared.end is not None:
+                self.assertTrue(shared.end in left and shared.end in right)
+                expected = TimeRangeSet([left]) & TimeRangeSet([right])
+                self.assertEqual(shared.delta, expected.duration)
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+from trange import trange, map_split, BackwardTimeRange
+
+
+def _count_steps(time_range):
+    return len(time_range.steps(minutes=7))
+
+
+class TestSplit(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+
+    def test_split(self):
+        for tr in (trange(self.d1, self.d2), trange(self.d2, self.d1),
+                   trange(self.d1, self.d1)):
+            for delta in (timedelta(hours=1), timedelta(minutes=7),
+                          timedelta(microseconds=1)):
+                for include_start in (True, False):
+                    for include_end in (True, False):
+                        kwargs = dict(delta=delta,
+                                      include_start=include_start,
+                                      include_end=include_end)
+                        steps = tr.steps(**kwargs)
+                        if len(steps) > 10 ** 4:
+                            continue
+                        for n in (1, 3, 7, 100):
+                            chunks = tr.split(n, **kwargs)
+                            self.assertEqual(min(n, len(steps)), len(chunks))
+                            self.assertEqual(list(steps), [
+                                s for c in chunks for s in c.steps(delta=delta)])
+                        chunks = tr.split(chunk=timedelta(hours=5), **kwargs)
+                        self.assertEqual(list(steps), [
+                            s for c in chunks for s in c.steps(delta=delta)])
+
+    def test_split_contiguous(self):
+        chunks = trange(self.d1, self.d2).split(4, hours=1)
+        self.assertEqual(self.d1, chunks[0].start)
+        self.assertEqual(self.d2, chunks[-1].end)
+        for chunk1, chunk2 in zip(chunks, chunks[1:]):
+            self.assertEqual(chunk1.end + timedelta(microseconds=1),
+                             chunk2.start)
+
+    def test_split_invalid(self):
+        with self.assertRaises(ValueError):
+            trange(self.d1).split(3, hours=1)
+        with self.assertRaises(ValueError):
+            trange(self.d1, self.d2).split(hours=1)
+        with self.assertRaises(ValueError):
+            trange(self.d1, self.d2).split(0, hours=1)
+        # The arguments are validated, even if there are no steps.
+        empty = trange(self.d1, self.d1)
+        self.assertEqual([], empty.split(3, hours=1, include_start=False))
+        for n in (0, -1):
+            with self.assertRaises(ValueError):
+                empty.split(n, hours=1, include_start=False)
+        with self.assertRaises(TypeError):
+            empty.split(chunk=5, hours=1, include_start=False)
+
+    def test_split_backward(self):
+        end = self.d1 - timedelta(microseconds=3)
+        tr = trange(self.d1, end)
+        chunks = tr.split(4, microseconds=1)
+        self.assertEqual(4, len(chunks))
+        for chunk in chunks:
+            self.assertIsInstance(chunk, BackwardTimeRange)
+            self.assertEqual(chunk.start, chunk.end)
+        self.assertEqual(list(tr.steps(microseconds=1)),
+                         [chunk.start for chunk in chunks])
+
+    def test_map_split(self):
+        tr = trange(self.d2, self.d1)
+        results = list(map_split(_count_steps, tr, 5, minutes=7))
+        self.assertEqual(5, len(results))
+        self.assertEqual(len(tr.steps(minutes=7)), sum(results))
+        results = list(map_split(_count_steps, tr, processes=True,
+                                 max_workers=2, minutes=7))
+        self.assertEqual(len(tr.steps(minutes=7)), sum(results))
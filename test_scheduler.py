@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest import TestCase
+from trange import trange
+from trange.scheduler import StepScheduler
+
+
+def _run(coroutine):
+    # Run coroutine on a new event loop, as asyncio.run needs Python 3.7.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class FakeClock:
+    # A clock of which the time only advances by sleeping.
+
+    def __init__(self, now):
+        self.current = now
+        self.sleeps = []
+
+    def now(self, tz=None):
+        return self.current
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.current += timedelta(seconds=seconds)
+        await asyncio.sleep(0)
+
+
+class TestAsync(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=1, hour=12, minute=1,
+                           second=0, microsecond=0)
+
+    def test_asteps(self):
+        clock = FakeClock(self.d1 - timedelta(seconds=3))
+        tr = trange(self.d1, self.d2)
+
+        async def collect():
+            result = []
+            async for step in tr.asteps(clock=clock, seconds=10):
+                result.append((step, clock.current))
+                # A slow consumer does not cause any drift.
+                clock.current += timedelta(seconds=1, microseconds=1)
+            return result
+
+        result = _run(collect())
+        self.assertEqual(list(tr.steps(seconds=10)), [s for s, _ in result])
+        for step, moment in result:
+            self.assertEqual(step, moment)
+        self.assertEqual(3, clock.sleeps[0])
+
+    def test_scheduler(self):
+        clock = FakeClock(self.d1)
+        scheduler = StepScheduler(clock)
+        ticks = []
+        handles = []
+        for i in range(1, 51):
+            handles.append(scheduler.add(
+                trange(self.d1, self.d2),
+                lambda step, i=i: ticks.append((step, clock.current, i)),
+                seconds=i))
+
+        async def later(step):
+            ticks.append((step, clock.current, 0))
+
+        scheduler.add(trange(self.d1 + timedelta(seconds=30), self.d2), later,
+                      seconds=15)
+        scheduler.remove(handles.pop())
+        self.assertEqual(50, len(scheduler))
+        _run(scheduler.run())
+        self.assertEqual(0, len(scheduler))
+        expected = sorted((step, i) for i in range(1, 50)
+                          for step in trange(self.d1, self.d2).steps(seconds=i))
+        expected += [(self.d1 + timedelta(seconds=30), 0),
+                     (self.d1 + timedelta(seconds=45), 0),
+                     (self.d2, 0)]
+        self.assertEqual(sorted(expected),
+                         sorted((s, i) for s, _, i in ticks))
+        self.assertEqual([s for s, _, _ in ticks],
+                         sorted(s for s, _, _ in ticks))
+        for step, moment, _ in ticks:
+            self.assertEqual(step, moment)
+
+    def test_scheduler_add_while_running(self):
+        clock = FakeClock(self.d1)
+        scheduler = StepScheduler(clock)
+        ticks = []
+
+        def add_more(step):
+            ticks.append(step)
+            if len(ticks) == 1:
+                scheduler.add([step + timedelta(seconds=1)], ticks.append)
+
+        scheduler.add(trange(self.d1, self.d2), add_more, seconds=30)
+        _run(scheduler.run())
+        self.assertEqual([self.d1, self.d1 + timedelta(seconds=1),
+                          self.d1 + timedelta(seconds=30), self.d2], ticks)
+
+    def test_scheduler_add_errors(self):
+        scheduler = StepScheduler(FakeClock(self.d1))
+        with self.assertRaises(ValueError):
+            scheduler.add(trange(self.d1, self.d2), print)
+        with self.assertRaises(ValueError):
+            scheduler.add([self.d1], print, seconds=1)
+        self.assertEqual(0, len(scheduler))
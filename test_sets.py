@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from random import Random
+from unittest import TestCase
+from trange import trange, TimeRangeSet, ForwardTimeRange, BackwardTimeRange
+
+
+def _minutes(time_range_set, horizon):
+    # Return the set of minutes (as ints) that are covered, within horizon.
+    base = datetime(2019, 1, 1)
+    return {m for m in range(-horizon, horizon)
+            if base + timedelta(minutes=m) in time_range_set}
+
+
+class TestTimeRangeSet(TestCase):
+
+    def setUp(self):
+        self.base = datetime(2019, 1, 1)
+        rnd = Random(7)
+
+        def random_ranges(n):
+            result = []
+            for _ in range(n):
+                start = self.base + timedelta(minutes=rnd.randint(0, 300))
+                end = start + timedelta(minutes=rnd.randint(-30, 30))
+                result.append(trange(start, end))
+            return result
+
+        self.set1 = TimeRangeSet(random_ranges(40))
+        self.set2 = TimeRangeSet(random_ranges(40))
+
+    def at(self, minutes):
+        return self.base + timedelta(minutes=minutes)
+
+    def test_normalized(self):
+        rs = TimeRangeSet([trange(self.at(10), self.at(20)),
+                           trange(self.at(25), self.at(15)),
+                           trange(self.at(30), self.at(40)),
+                           trange(self.at(50), self.at(50))])
+        self.assertEqual([trange(self.at(10), self.at(25)),
+                          trange(self.at(30), self.at(40))], list(rs))
+        self.assertEqual([trange(self.at(25), self.at(30))], rs.gaps())
+        self.assertEqual(timedelta(minutes=25), rs.duration)
+        self.assertTrue(self.at(10) in rs)
+        self.assertFalse(self.at(25) in rs)
+        self.assertTrue(trange(self.at(12), self.at(24)) in rs)
+        self.assertFalse(trange(self.at(12), self.at(32)) in rs)
+
+    def test_algebra(self):
+        minutes1 = _minutes(self.set1, 400)
+        minutes2 = _minutes(self.set2, 400)
+        self.assertEqual(minutes1 | minutes2,
+                         _minutes(self.set1 | self.set2, 400))
+        self.assertEqual(minutes1 & minutes2,
+                         _minutes(self.set1 & self.set2, 400))
+        self.assertEqual(minutes1 - minutes2,
+                         _minutes(self.set1 - self.set2, 400))
+        within = trange(self.at(-10), self.at(350))
+        self.assertEqual(set(range(-10, 350)) - minutes1,
+                         _minutes(self.set1.complement(within), 400))
+        union = self.set1 | self.set2
+        for range1, range2 in zip(union, list(union)[1:]):
+            self.assertTrue(range1.end < range2.start)
+
+    def test_infinite(self):
+        rs = TimeRangeSet([trange(end=self.at(0)), trange(self.at(100))])
+        self.assertEqual([BackwardTimeRange(self.at(0)),
+                          ForwardTimeRange(self.at(100))], list(rs))
+        self.assertIsNone(rs.duration)
+        self.assertEqual([trange(self.at(0), self.at(100))],
+                         list(rs.complement()))
+        self.assertEqual([trange(self.at(50), self.at(100))],
+                         list(rs.complement(trange(self.at(50), self.at(150)))))
+        self.assertEqual([trange(end=self.at(0))],
+                         list(rs - [trange(self.at(50))]))
+        with self.assertRaises(ValueError):
+            list(rs | [trange(self.at(-10), self.at(200))])
@@ -0,0 +1,235 @@
+import pickle
+from datetime import datetime, timedelta
+from unittest import TestCase, skipIf
+from trange import trange, StepSequence, StepIterator, StepState
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _reference_steps(time_range, delta, include_start, include_end, limit):
+    # The original generator based implementation of TimeRange.steps.
+    current_date = time_range.start
+    if not include_start:
+        current_date += delta
+    result = []
+    while len(result) < limit and (not time_range.end or time_range.contains(
+            current_date, True, include_end)):
+        result.append(current_date)
+        current_date += delta
+    return result
+
+
+class TestStepSequence(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+
+    def test_equal_to_iteration(self):
+        ranges = [trange(self.d1, self.d2), trange(self.d2, self.d1),
+                  trange(self.d1, self.d1)]
+        deltas = [timedelta(hours=1), timedelta(hours=5),
+                  timedelta(hours=24), timedelta(hours=25),
+                  timedelta(minutes=7), timedelta(hours=-1)]
+        for tr in ranges:
+            for delta in deltas:
+                for include_start in (True, False):
+                    for include_end in (True, False):
+                        steps = tr.steps(delta=delta,
+                                         include_start=include_start,
+                                         include_end=include_end)
+                        sign = -1 if tr.end < tr.start else 1
+                        expected = _reference_steps(
+                            tr, delta * sign, include_start, include_end,
+                            10000)
+                        self.assertEqual(expected, list(steps))
+                        self.assertEqual(len(expected), len(steps))
+                        self.assertEqual(expected[::-1], list(reversed(steps)))
+                        for i, dt in enumerate(expected):
+                            self.assertEqual(dt, steps[i])
+                            self.assertEqual(i, steps.index(dt))
+                            self.assertTrue(dt in steps)
+
+    def test_indexing_and_slicing(self):
+        steps = trange(self.d1, self.d2).steps(hours=1)
+        expected = list(steps)
+        self.assertEqual(self.d2, steps[-1])
+        self.assertEqual(expected[3:20:4], list(steps[3:20:4]))
+        self.assertEqual(expected[::-3], list(steps[::-3]))
+        self.assertEqual(expected[30:], list(steps[30:]))
+        self.assertEqual(len(expected[5:-5]), len(steps[5:-5]))
+        with self.assertRaises(IndexError):
+            steps[25]
+        with self.assertRaises(ValueError):
+            steps.index(self.d1 + timedelta(minutes=1))
+        self.assertFalse(self.d1 + timedelta(minutes=1) in steps)
+        self.assertFalse('Dead Parrot' in steps)
+
+    def test_infinite(self):
+        steps = trange(self.d1).steps(seconds=5)
+        self.assertEqual(self.d1 + timedelta(seconds=5 * 10 ** 8),
+                         steps[10 ** 8])
+        self.assertEqual(10 ** 8, steps.index(steps[10 ** 8]))
+        self.assertEqual([self.d1, self.d1 + timedelta(seconds=10)],
+                         list(steps[:4:2]))
+        self.assertIsNone(steps[10:].length)
+        with self.assertRaises(TypeError):
+            len(steps)
+        with self.assertRaises(TypeError):
+            reversed(steps)
+        with self.assertRaises(IndexError):
+            steps[-1]
+        with self.assertRaises(ValueError):
+            steps[-5:]
+
+        backward = trange(end=self.d1).steps(seconds=5)
+        self.assertEqual(self.d1 - timedelta(seconds=50), backward[10])
+
+    def test_zero_step(self):
+        with self.assertRaises(ValueError):
+            trange(self.d1, self.d2).steps()
+
+    def test_eq_and_pickle(self):
+        steps = trange(self.d1, self.d2).steps(hours=1)
+        self.assertEqual(StepSequence(self.d1, timedelta(hours=1), 25), steps)
+        self.assertEqual(steps, pickle.loads(pickle.dumps(steps)))
+        self.assertEqual(hash(steps[:0]), hash(steps[3:3]))
+
+
+class TestStepsArray(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_steps_array(self):
+        for tr in (trange(self.d1, self.d2), trange(self.d2, self.d1)):
+            for include_start in (True, False):
+                for include_end in (True, False):
+                    kwargs = dict(minutes=7, include_start=include_start,
+                                  include_end=include_end)
+                    array = tr.steps_array(**kwargs)
+                    self.assertEqual('datetime64[us]', str(array.dtype))
+                    self.assertEqual(list(tr.steps(**kwargs)), array.tolist())
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_steps_array_infinite(self):
+        array = trange(end=self.d1).steps_array(seconds=1, limit=3)
+        self.assertEqual([self.d1, self.d1 - timedelta(seconds=1),
+                          self.d1 - timedelta(seconds=2)], array.tolist())
+        self.assertEqual(2, len(trange(self.d1, self.d2).steps_array(
+            hours=1, limit=2)))
+        with self.assertRaises(ValueError):
+            trange(self.d1).steps_array(seconds=1)
+
+
+class TestSnapping(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.values = [self.d1 + timedelta(minutes=13 * i)
+                       for i in range(-10, 130)]
+
+    def _reference(self, steps, value):
+        # Return the floor, ceil and nearest step by brute force.
+        before = [s for s in steps if (value - s) // steps.delta >= 0]
+        after = [s for s in steps if (s - value) // steps.delta >= 0]
+        floor = before[-1] if before else None
+        ceil = after[0] if after else None
+        nearest = floor
+        if floor is None or (ceil is not None
+                             and abs(ceil - value) < abs(value - floor)):
+            nearest = ceil
+        return floor, ceil, nearest
+
+    def _check(self, tr, **kwargs):
+        steps = tr.steps(**kwargs)
+        for value in self.values:
+            floor, ceil, nearest = self._reference(steps, value)
+            self.assertEqual(floor, tr.floor_step(value, **kwargs))
+            self.assertEqual(ceil, tr.ceil_step(value, **kwargs))
+            self.assertEqual(nearest, tr.nearest_step(value, **kwargs))
+            index = tr.step_index(value, **kwargs)
+            self.assertEqual(floor, None if index is None else steps[index])
+
+    def test_snapping(self):
+        for tr in (trange(self.d1, self.d2), trange(self.d2, self.d1)):
+            for include_start in (True, False):
+                for include_end in (True, False):
+                    self._check(tr, hours=5, include_start=include_start,
+                                include_end=include_end)
+                    self._check(tr, hours=1, include_start=include_start,
+                                include_end=include_end)
+
+    def test_snapping_infinite(self):
+        tr = trange(self.d1)
+        value = self.d1 + timedelta(days=365 * 100, seconds=7)
+        self.assertEqual(value - timedelta(seconds=2),
+                         tr.floor_step(value, seconds=5))
+        self.assertEqual(value + timedelta(seconds=3),
+                         tr.ceil_step(value, seconds=5))
+        self.assertEqual(value - timedelta(seconds=2),
+                         tr.nearest_step(value, seconds=5))
+        self.assertIsNone(tr.floor_step(self.d1 - timedelta(seconds=1),
+                                        seconds=5))
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_step_indices(self):
+        for tr in (trange(self.d1, self.d2), trange(self.d2, self.d1),
+                   trange(self.d1)):
+            for how in ('floor', 'ceil', 'nearest'):
+                steps = tr.steps(hours=5, include_start=False)
+                scalar = getattr(steps, how + '_index')
+                expected = [scalar(value) for value in self.values]
+                expected = [-1 if i is None else i for i in expected]
+                self.assertEqual(expected, tr.step_indices(
+                    self.values, how, hours=5, include_start=False).tolist())
+
+
+class TestStepIterator(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0,
+                           second=0, microsecond=0)
+
+    def test_resume(self):
+        steps = trange(self.d2, self.d1).steps(hours=1, include_start=False)
+        iterator = steps.iterator()
+        self.assertEqual(list(steps[:5]), [next(iterator) for _ in range(5)])
+        state = iterator.state
+        self.assertEqual(5, state.index)
+        restored = StepIterator.from_state(state)
+        self.assertEqual(list(steps[5:]), list(restored))
+        self.assertEqual(list(steps[5:]), list(iterator))
+        self.assertEqual([], list(iterator))
+        self.assertEqual(len(steps), iterator.state.index)
+
+    def test_resume_infinite(self):
+        steps = trange(self.d1).steps(seconds=1)
+        iterator = StepIterator.from_state(
+            StepState(steps.first, steps.delta, None, 10 ** 8))
+        self.assertEqual(steps[10 ** 8], next(iterator))
+        self.assertEqual(steps[10 ** 8 + 1], next(iterator))
+
+    def test_pickle(self):
+        steps = trange(self.d1, self.d2).steps(minutes=10)
+        iterator = steps.iterator(7)
+        next(iterator)
+        restored = pickle.loads(pickle.dumps(iterator))
+        self.assertEqual(iterator.state, restored.state)
+        self.assertEqual(list(iterator), list(restored))
+        self.assertEqual(list(steps[8:]), list(pickle.loads(pickle.dumps(
+            steps.iterator(8)))))
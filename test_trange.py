@@ -1,6 +1,13 @@
-from datetime import datetime, timedelta
-from unittest import TestCase
-from trange import trange, ForwardTimeRange, BackwardTimeRange
+import copy
+import pickle
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase, skipIf
+from trange import trange, TimeRange, ForwardTimeRange, BackwardTimeRange
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestTRange(TestCase):
@@ -180,3 +187,130 @@ class TestTRange(TestCase):
         self.assertTrue(d1 in datetime_range)
         self.assertFalse(d2 in datetime_range)
         self.assertTrue(d3 in datetime_range)
+
+    def test_contains_many(self):
+        d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0, second=0,
+                      microsecond=0)
+        d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0, second=0,
+                      microsecond=0)
+        items = [d1 + timedelta(hours=i) for i in range(-5, 30)]
+        ranges = [trange(d1, d2), trange(d2, d1), trange(d1), trange(end=d2)]
+        for tr in ranges:
+            for include_start in (True, False):
+                for include_end in (True, False):
+                    expected = [tr.contains(item, include_start, include_end)
+                                for item in items]
+                    self.assertEqual(expected, tr.contains_many(
+                        items, include_start, include_end))
+                    slc = tr.contains_many(items, include_start, include_end,
+                                           assume_sorted=True)
+                    self.assertEqual([item for item, contained
+                                      in zip(items, expected) if contained],
+                                     items[slc])
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_contains_many_array(self):
+        d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0, second=0,
+                      microsecond=0)
+        d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0, second=0,
+                      microsecond=0)
+        items = [d1 + timedelta(hours=i) for i in range(-5, 30)]
+        array = numpy.array(items, dtype='datetime64[us]')
+        for tr in [trange(d1, d2), trange(d2, d1), trange(d1), trange(end=d2)]:
+            for include_start in (True, False):
+                for include_end in (True, False):
+                    expected = tr.contains_many(items, include_start,
+                                                include_end)
+                    mask = tr.contains_many(array, include_start, include_end)
+                    self.assertEqual(expected, mask.tolist())
+                    self.assertEqual(
+                        tr.contains_many(items, include_start, include_end,
+                                         assume_sorted=True),
+                        tr.contains_many(array, include_start, include_end,
+                                         assume_sorted=True))
+
+    def test_hash_and_immutability(self):
+        d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0, second=0,
+                      microsecond=0)
+        d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0, second=0,
+                      microsecond=0)
+        ranges = {trange(d1, d2), trange(d1, d2), trange(d2, d1), trange(d1),
+                  trange(end=d1), ForwardTimeRange(d1, d1)}
+        self.assertEqual(5, len(ranges))
+        self.assertTrue(ForwardTimeRange(d1) != BackwardTimeRange(d1))
+        self.assertFalse(trange(d1, d2) == (d1, d2))
+        self.assertFalse(hasattr(trange(d1, d2), '__dict__'))
+        with self.assertRaises(AttributeError):
+            trange(d1, d2)._start = d2
+        with self.assertRaises(AttributeError):
+            del trange(d1, d2)._end
+        tr = trange(d2, d1)
+        self.assertEqual(tr, pickle.loads(pickle.dumps(tr)))
+        self.assertEqual(hash(tr), hash(copy.deepcopy(tr)))
+
+    def test_from_pairs(self):
+        d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0, second=0,
+                      microsecond=0)
+        d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0, second=0,
+                      microsecond=0)
+        pairs = [(d1, d2), (d2, d1), (d1, None), (None, d2), (d1, d1)]
+        expected = [trange(d1, d2), trange(d2, d1), trange(d1),
+                    trange(end=d2), trange(d1, d1)]
+        self.assertEqual(expected, TimeRange.from_pairs(pairs))
+        self.assertEqual(expected, TimeRange.from_pairs(pairs, trusted=True))
+        epoch = datetime(1970, 1, 1)
+        s1 = (d1 - epoch).total_seconds()
+        s2 = int((d2 - epoch).total_seconds())
+        self.assertEqual(expected[:2], TimeRange.from_pairs([(s1, s2),
+                                                             (d2, s1)]))
+        self.assertEqual(
+            [trange(d1.replace(tzinfo=timezone.utc),
+                    d2.replace(tzinfo=timezone.utc))],
+            TimeRange.from_pairs([(s1, s2)], tz=timezone.utc))
+        with self.assertRaises(TypeError):
+            TimeRange.from_pairs([(d1, 'Spam')])
+        with self.assertRaises(TypeError):
+            TimeRange.from_pairs([(True, d1)])
+
+    def test_from_timestamps(self):
+        d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0, second=0,
+                      microsecond=0)
+        d2 = datetime(year=2019, month=1, day=2, hour=12, minute=0, second=0,
+                      microsecond=0)
+        self.assertEqual([trange(d1, d2), trange(d2, d1)],
+                         TimeRange.from_timestamps([d1, d2], [d2, d1]))
+        self.assertEqual([trange(d1), trange(d2)],
+                         TimeRange.from_timestamps([d1, d2]))
+        with self.assertRaises(ValueError):
+            TimeRange.from_timestamps([d1, d2], [d2])
+        if numpy is not None:
+            starts = numpy.array([d1, d2], dtype='datetime64[us]')
+            ends = numpy.array([1546430400, 0])
+            self.assertEqual([trange(d1, d2), trange(d2, datetime(1970, 1, 1))],
+                             TimeRange.from_timestamps(starts, ends))
+            self.assertEqual([trange(d1, d2), trange(d2, d1)],
+                             TimeRange.from_timestamps(
+                                 numpy.array([d1, d2], dtype='datetime64[ns]'),
+                                 numpy.array([d2, d1], dtype='datetime64[ns]')))
+            self.assertEqual([trange(datetime(2019, 1, 1))],
+                             TimeRange.from_timestamps(numpy.array(
+                                 ['2019-01-01'], dtype='datetime64[D]')))
+
+    def test_from_timestamps_epoch(self):
+        epoch = datetime(1970, 1, 1)
+        starts = [1546344000, 1546430400.5, -86400.25, 0]
+        ends = [1546430400.123456, 1546344000, 0, 253402300799]
+        expected = [trange(epoch + timedelta(seconds=start),
+                           epoch + timedelta(seconds=end))
+                    for start, end in zip(starts, ends)]
+        self.assertEqual(expected, TimeRange.from_timestamps(starts, ends))
+        if numpy is not None:
+            self.assertEqual(expected, TimeRange.from_timestamps(
+                numpy.array(starts), numpy.array(ends)))
+            self.assertEqual(expected[:1], TimeRange.from_timestamps(
+                numpy.array(starts[:1], dtype='uint32'),
+                numpy.array([1546430400.123456], dtype='float64')))
+            with self.assertRaises(ValueError):
+                TimeRange.from_timestamps(numpy.array([numpy.nan]))
+            with self.assertRaises(OverflowError):
+                TimeRange.from_timestamps(numpy.array([2 ** 62]))
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from trange import trange, TimeRangeArray, WindowSequence
+from trange import _optional
+from trange.trange import BackwardTimeRange, ForwardTimeRange
+
+
+class TestWindowSequence(TestCase):
+
+    def setUp(self):
+        self.d1 = datetime(year=2019, month=1, day=1, hour=12, minute=0,
+                           second=0, microsecond=0)
+        self.d2 = datetime(year=2019, month=1, day=1, hour=15, minute=0,
+                           second=0, microsecond=0)
+        self.hour = timedelta(hours=1)
+
+    def _pairwise(self, time_range, size, stride):
+        # The windows as derived from steps, which windows replaces.
+        return [trange(step, step + size) for step
+                in time_range.steps(delta=stride)
+                if step + size <= time_range.end]
+
+    def test_sliding(self):
+        time_range = trange(self.d1, self.d2)
+        stride = timedelta(minutes=20)
+
+        windows = time_range.windows(self.hour, stride)
+
+        self.assertIsInstance(windows, WindowSequence)
+        self.assertEqual(self._pairwise(time_range, self.hour, stride),
+                         list(windows))
+        self.assertEqual(7, len(windows))
+        self.assertEqual(trange(self.d2 - self.hour, self.d2), windows[-1])
+        self.assertEqual(trange(self.d1 + 2 * stride,
+                                self.d1 + 2 * stride + self.hour),
+                         windows[2])
+
+    def test_tumbling(self):
+        windows = trange(self.d1, self.d2 + timedelta(minutes=30)).windows(
+            self.hour)
+
+        self.assertEqual([trange(self.d1 + i * self.hour,
+                                 self.d1 + (i + 1) * self.hour)
+                          for i in range(3)], list(windows))
+
+    def test_clip(self):
+        windows = trange(self.d1, self.d2).windows(
+            self.hour, timedelta(minutes=50), clip=True)
+
+        self.assertEqual(4, len(windows))
+        self.assertEqual(trange(self.d1 + timedelta(minutes=150), self.d2),
+                         windows[-1])
+        self.assertEqual(self.d2, windows.clip)
+        self.assertEqual(0, len(trange(self.d1, self.d1).windows(
+            self.hour, clip=True)))
+
+    def test_backward(self):
+        time_range = trange(self.d2, self.d1)
+
+        windows = time_range.windows(self.hour, timedelta(minutes=50),
+                                     clip=True)
+
+        self.assertEqual([trange(self.d2, self.d2 - self.hour),
+                          trange(self.d2 - timedelta(minutes=50),
+                                 self.d2 - timedelta(minutes=110)),
+                          trange(self.d2 - timedelta(minutes=100),
+                                 self.d2 - timedelta(minutes=160)),
+                          trange(self.d2 - timedelta(minutes=150), self.d1)],
+                         list(windows))
+        self.assertTrue(all(isinstance(window, BackwardTimeRange)
+                            for window in windows))
+        self.assertEqual(-self.hour, windows.size)
+        self.assertEqual(3, len(time_range.windows(self.hour)))
+
+    def test_too_short(self):
+        windows = trange(self.d1, self.d1 + timedelta(minutes=59)).windows(
+            self.hour)
+
+        self.assertEqual(0, len(windows))
+        self.assertFalse(windows)
+        self.assertEqual([], list(windows))
+
+    def test_infinite(self):
+        windows = trange(self.d1).windows(self.hour)
+
+        self.assertEqual(trange(self.d1 + 5 * self.hour,
+                                self.d1 + 6 * self.hour), windows[5])
+        self.assertIsNone(windows.length)
+        self.assertIn(windows[1000], windows)
+        self.assertEqual(3, len(next(windows.batches(3))))
+        with self.assertRaises(TypeError):
+            len(windows)
+        with self.assertRaises(TypeError):
+            reversed(windows)
+        with self.assertRaises(ValueError):
+            windows.to_array()
+
+    def test_sequence(self):
+        windows = trange(self.d1, self.d2).windows(self.hour,
+                                                   timedelta(minutes=30))
+
+        self.assertEqual(list(windows)[::-1], list(reversed(windows)))
+        self.assertEqual(list(windows)[1:4], list(windows[1:4]))
+        self.assertEqual(3, windows.index(windows[3]))
+        self.assertEqual(1, windows.count(windows[0]))
+        self.assertIn(trange(self.d1, self.d1 + self.hour), windows)
+        self.assertNotIn(trange(self.d1, self.d1 + 2 * self.hour), windows)
+        self.assertNotIn(trange(self.d1 + self.hour, self.d1), windows)
+        self.assertNotIn(self.d1, windows)
+        with self.assertRaises(ValueError):
+            windows.index(trange(self.d1, self.d2))
+        self.assertEqual(windows, trange(self.d1, self.d2).windows(
+            self.hour, timedelta(minutes=30)))
+        self.assertEqual(hash(windows), hash(trange(self.d1, self.d2).windows(
+            self.hour, timedelta(minutes=30))))
+
+    def test_pairs(self):
+        windows = trange(self.d1, self.d2).windows(self.hour, clip=True)
+
+        self.assertEqual([(window.start, window.end) for window in windows],
+                         list(windows.pairs()))
+
+    def _check_to_array(self):
+        for time_range in (trange(self.d1, self.d2),
+                           trange(self.d2, self.d1)):
+            for clip in (True, False):
+                windows = time_range.windows(self.hour, timedelta(minutes=50),
+                                             clip=clip)
+                for subset in (windows, windows[::-1], windows[1:3]):
+                    result = subset.to_array()
+
+                    self.assertIsInstance(result, TimeRangeArray)
+                    self.assertEqual(list(subset), result.to_list())
+                    self.assertEqual(TimeRangeArray.from_ranges(subset),
+                                     result)
+
+    def test_to_array(self):
+        self._check_to_array()
+
+    def test_to_array_without_numpy(self):
+        missing = set(_optional._MISSING)
+        _optional._MISSING.add('numpy')
+        try:
+            self._check_to_array()
+        finally:
+            _optional._MISSING.clear()
+            _optional._MISSING.update(missing)
+
+    def test_to_array_aware(self):
+        tz = timezone(timedelta(hours=2))
+        windows = trange(self.d1.replace(tzinfo=tz),
+                         self.d2.replace(tzinfo=tz)).windows(self.hour)
+
+        self.assertEqual(TimeRangeArray.from_ranges(windows),
+                         windows.to_array())
+
+    def test_batches(self):
+        windows = trange(self.d1, self.d2).windows(timedelta(minutes=10))
+
+        batches = list(windows.batches(7))
+
+        self.assertEqual([7, 7, 4], [len(batch) for batch in batches])
+        self.assertEqual(list(windows),
+                         [window for batch in batches for window in batch])
+        with self.assertRaises(ValueError):
+            next(windows.batches(0))
+
+    def test_errors(self):
+        time_range = trange(self.d1, self.d2)
+        with self.assertRaises(TypeError):
+            time_range.windows(60)
+        with self.assertRaises(TypeError):
+            time_range.windows(self.hour, 60)
+        with self.assertRaises(ValueError):
+            time_range.windows(timedelta(0))
+        with self.assertRaises(ValueError):
+            time_range.windows(self.hour, -self.hour)
+        with self.assertRaises(ValueError):
+            WindowSequence(time_range.steps(hours=1), timedelta(0))
+
+    def test_forward_class(self):
+        self.assertTrue(all(
+            isinstance(window, ForwardTimeRange)
+            for window in trange(self.d1, self.d2).windows(self.hour)))
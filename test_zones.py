@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from unittest import TestCase, skipIf
+from trange import trange, ZonedStepSequence
+from trange.zones import wall_offsets
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+
+def _summary(steps):
+    # Return the wall clock time, the offset and the fold of each step.
+    return [(dt.replace(tzinfo=None), dt.utcoffset(), dt.fold)
+            for dt in steps]
+
+
+@skipIf(ZoneInfo is None, 'zoneinfo is not available')
+class TestZonedStepSequence(TestCase):
+
+    def setUp(self):
+        self.tz = ZoneInfo('Europe/Amsterdam')
+
+    def test_spring_forward(self):
+        time_range = trange(datetime(2019, 3, 31, tzinfo=self.tz),
+                            datetime(2019, 3, 31, 5, tzinfo=self.tz))
+        one, two = timedelta(hours=1), timedelta(hours=2)
+
+        wall = time_range.tz_steps(hours=1)
+        absolute = time_range.tz_steps(hours=1, mode='absolute')
+
+        self.assertEqual([(datetime(2019, 3, 31, 0), one, 0),
+                          (datetime(2019, 3, 31, 1), one, 0),
+                          (datetime(2019, 3, 31, 3), two, 0),
+                          (datetime(2019, 3, 31, 3), two, 0),
+                          (datetime(2019, 3, 31, 4), two, 0),
+                          (datetime(2019, 3, 31, 5), two, 0)],
+                         _summary(wall))
+        self.assertEqual([(datetime(2019, 3, 31, 0), one, 0),
+                          (datetime(2019, 3, 31, 1), one, 0),
+                          (datetime(2019, 3, 31, 3), two, 0),
+                          (datetime(2019, 3, 31, 4), two, 0),
+                          (datetime(2019, 3, 31, 5), two, 0)],
+                         _summary(absolute))
+        self.assertEqual(2, wall.count(wall[3]))
+        self.assertEqual(2, wall.index(wall[3]))
+
+    def test_fall_back(self):
+        time_range = trange(datetime(2019, 10, 27, tzinfo=self.tz),
+                            datetime(2019, 10, 27, 4, tzinfo=self.tz))
+        one, two = timedelta(hours=1), timedelta(hours=2)
+
+        wall = time_range.tz_steps(hours=1)
+        absolute = time_range.tz_steps(hours=1, mode='absolute')
+
+        self.assertEqual([(datetime(2019, 10, 27, 0), two, 0),
+                          (datetime(2019, 10, 27, 1), two, 0),
+                          (datetime(2019, 10, 27, 2), two, 0),
+                          (datetime(2019, 10, 27, 3), one, 0),
+                          (datetime(2019, 10, 27, 4), one, 0)],
+                         _summary(wall))
+        self.assertEqual([(datetime(2019, 10, 27, 0), two, 0),
+                          (datetime(2019, 10, 27, 1), two, 0),
+                          (datetime(2019, 10, 27, 2), two, 0),
+                          (datetime(2019, 10, 27, 2), one, 1),
+                          (datetime(2019, 10, 27, 3), one, 0),
+                          (datetime(2019, 10, 27, 4), one, 0)],
+                         _summary(absolute))
+        self.assertEqual([2, 3], [absolute.index(dt) for dt in absolute[2:4]])
+
+    def test_days_across_dst(self):
+        time_range = trange(datetime(2019, 3, 30, 12, tzinfo=self.tz),
+                            datetime(2019, 4, 2, 12, tzinfo=self.tz))
+
+        wall = time_range.tz_steps(days=1)
+        absolute = time_range.tz_steps(days=1, mode='absolute')
+
+        self.assertEqual([12] * 4, [dt.hour for dt in wall])
+        self.assertEqual([12, 13, 13], [dt.hour for dt in absolute])
+        self.assertEqual(4, len(wall))
+
+    def test_equal_to_reference(self):
+        start = datetime(2018, 6, 3, 1, 17, tzinfo=self.tz)
+        end = datetime(2021, 2, 1, tzinfo=self.tz)
+        delta = timedelta(hours=7, minutes=13)
+        time_range = trange(start, end)
+        utc = start.astimezone(timezone.utc)
+
+        absolute = time_range.tz_steps(delta=delta, mode='absolute')
+        wall = time_range.tz_steps(delta=delta)
+
+        expected_absolute = []
+        while utc <= end:
+            expected_absolute.append(utc.astimezone(self.tz))
+            utc += delta
+        expected_wall = []
+        current = start
+        while current <= end:
+            expected_wall.append(
+                current.astimezone(timezone.utc).astimezone(self.tz))
+            current += delta
+        self.assertEqual(_summary(expected_absolute), _summary(absolute))
+        self.assertEqual(_summary(expected_wall), _summary(wall))
+        self.assertEqual(_summary(expected_wall[::-1]),
+                         _summary(reversed(wall)))
+        self.assertEqual(_summary(expected_absolute),
+                         _summary(absolute[i] for i in range(len(absolute))))
+        self.assertEqual(_summary(expected_wall[5:100:7]),
+                         _summary(wall[5:100:7]))
+
+    def test_backward_and_exclusive(self):
+        time_range = trange(datetime(2019, 3, 31, 5, tzinfo=self.tz),
+                            datetime(2019, 3, 31, tzinfo=self.tz))
+
+        steps = time_range.tz_steps(hours=1, mode='absolute',
+                                    include_start=False, include_end=False)
+
+        self.assertEqual([4, 3, 1], [dt.hour for dt in steps])
+
+    def test_infinite(self):
+        time_range = trange(datetime(2019, 12, 31, 22, tzinfo=self.tz))
+
+        steps = time_range.tz_steps(hours=1)
+
+        self.assertEqual([22, 23, 0, 1],
+                         [dt.hour for dt in islice(steps, 4)])
+        self.assertEqual(datetime(2020, 1, 1, 1, tzinfo=self.tz), steps[3])
+
+    def test_other_timezones(self):
+        start = datetime(2019, 3, 31, 0, 30)
+        time_range = trange(start, start + timedelta(hours=2))
+
+        amsterdam = time_range.tz_steps(self.tz, hours=1, mode='absolute')
+        utc = time_range.tz_steps(timezone.utc, hours=1)
+        aware = trange(start.replace(tzinfo=self.tz),
+                       start.replace(tzinfo=self.tz) + timedelta(hours=2))
+
+        self.assertEqual([0, 1, 3], [dt.hour for dt in amsterdam])
+        self.assertEqual([0, 1, 2], [dt.hour for dt in utc])
+        self.assertEqual([timezone.utc] * 3, [dt.tzinfo for dt in utc])
+        self.assertEqual(aware.tz_steps(mode='absolute', hours=1),
+                         amsterdam)
+        self.assertIn(amsterdam[2].astimezone(timezone.utc), amsterdam)
+        self.assertNotIn(start, amsterdam)
+
+    def test_wall_offsets(self):
+        boundaries, offsets = wall_offsets(self.tz, 2019, 2019)
+
+        self.assertIn(datetime(2019, 3, 31, 3), boundaries)
+        self.assertIn(datetime(2019, 10, 27, 3), boundaries)
+        self.assertEqual(len(boundaries) + 1, len(offsets))
+        self.assertEqual(sorted(boundaries), boundaries)
+        index = boundaries.index(datetime(2019, 3, 31, 3))
+        self.assertEqual([timedelta(hours=1), timedelta(hours=2)],
+                         offsets[index:index + 2])
+
+    def test_errors(self):
+        time_range = trange(datetime(2019, 1, 1), datetime(2019, 1, 2))
+
+        with self.assertRaises(ValueError):
+            time_range.tz_steps(hours=1)
+        with self.assertRaises(ValueError):
+            time_range.tz_steps(self.tz, hours=1, mode='utc')
+        with self.assertRaises(ValueError):
+            time_range.tz_steps(self.tz, hours=1).index(
+                datetime(2019, 1, 1, 0, 30, tzinfo=self.tz))
+
+    def test_repr_and_equality(self):
+        time_range = trange(datetime(2019, 1, 1, tzinfo=self.tz),
+                            datetime(2019, 1, 2, tzinfo=self.tz))
+        steps = time_range.tz_steps(hours=1)
+
+        self.assertIsInstance(steps, ZonedStepSequence)
+        self.assertEqual(steps, time_range.tz_steps(hours=1))
+        self.assertEqual(hash(steps), hash(time_range.tz_steps(hours=1)))
+        self.assertNotEqual(steps, time_range.tz_steps(hours=1,
+                                                       mode='absolute'))
+        self.assertTrue(repr(steps).startswith('ZonedStepSequence('))
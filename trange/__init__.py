@@ -1,2 +1,11 @@
 from trange.trange import (trange, TimeRange, ForwardTimeRange,
                            BackwardTimeRange)
+from trange.steps import StepSequence, StepIterator, StepState
+from trange.zones import ZonedStepSequence
+from trange.calendars import BusinessCalendar, CalendarStepSequence
+from trange.columnar import TimeRangeArray
+from trange.windows import WindowSequence
+from trange.index import TimeRangeIndex
+from trange.sets import TimeRangeSet
+from trange.join import interval_join
+from trange.parallel import map_split
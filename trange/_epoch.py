@@ -0,0 +1,54 @@
+"""
+Contains helpers for converting ``datetime`` instances to and from integer
+microseconds since the Unix epoch, as used by the columnar and binary
+representations of ``TimeRange`` instances.
+"""
+from datetime import datetime, timedelta, timezone
+
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+# The value that marks an infinite end. It lies far outside the range of
+# microseconds that a datetime can represent.
+INFINITE = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def to_micros(dt):
+    """
+    Return the number of microseconds between the Unix epoch and ``dt``.
+    Timezone aware datetimes are converted to UTC first.
+    :param dt: a ``datetime``.
+    :return: the microseconds as ``int``.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - EPOCH) // MICROSECOND
+
+
+def from_micros(micros, tz=None):
+    """
+    Return the ``datetime`` that lies ``micros`` microseconds after the Unix
+    epoch: a naive one or, if ``tz`` is given, an aware one in ``tz``.
+    :param micros: the microseconds as ``int``.
+    :param tz: an optional ``tzinfo``.
+    :return: a ``datetime``.
+    """
+    if tz is None:
+        return EPOCH + timedelta(microseconds=micros)
+    return (EPOCH_UTC + timedelta(microseconds=micros)).astimezone(tz)
+
+
+def bounds_micros(time_range):
+    """
+    Return the chronological lower and upper bound of ``time_range`` in
+    microseconds since the Unix epoch, with infinite bounds as ``INFINITE``
+    and ``INT64_MAX`` respectively.
+    :param time_range: a ``TimeRange``.
+    :return: a tuple of the lower and the upper bound.
+    """
+    lower, upper, _, _ = time_range._bounds(True, True)
+    return (INFINITE if lower is None else to_micros(lower),
+            INT64_MAX if upper is None else to_micros(upper))
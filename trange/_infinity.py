@@ -0,0 +1,61 @@
+"""
+Contains the bounds that lie before and after all ``datetime`` instances and
+helpers for converting ``TimeRange`` instances to and from chronological
+bounds.
+"""
+from functools import total_ordering
+
+from trange.trange import BackwardTimeRange, ForwardTimeRange
+
+
+@total_ordering
+class _Infinity:
+    # A bound that lies before (sign < 0) or after (sign > 0) all datetimes.
+    __slots__ = ('_sign',)
+
+    def __init__(self, sign):
+        self._sign = sign
+
+    def __eq__(self, other):
+        return self is other
+
+    def __lt__(self, other):
+        return self is not other and self._sign < 0
+
+    def __hash__(self):
+        return self._sign
+
+    def __repr__(self):
+        return '-infinity' if self._sign < 0 else 'infinity'
+
+
+PAST = _Infinity(-1)
+FUTURE = _Infinity(1)
+
+
+def bounds(time_range):
+    """
+    Return the chronological lower and upper bound of ``time_range``, with
+    infinite bounds as ``PAST`` and ``FUTURE``.
+    :param time_range: a ``TimeRange``.
+    :return: a tuple of the lower and the upper bound.
+    """
+    lower, upper, _, _ = time_range._bounds(True, True)
+    return (PAST if lower is None else lower,
+            FUTURE if upper is None else upper)
+
+
+def to_range(lower, upper):
+    """
+    Return a ``TimeRange`` that covers the given chronological bounds. It is
+    a ``ForwardTimeRange``, unless ``lower`` is ``PAST``.
+    :param lower: a ``datetime`` or ``PAST``.
+    :param upper: a ``datetime`` or ``FUTURE``.
+    :return: a ``TimeRange``.
+    """
+    if lower is PAST:
+        if upper is FUTURE:
+            raise ValueError('A range that covers all of time cannot be '
+                             'expressed as a TimeRange.')
+        return BackwardTimeRange(upper)
+    return ForwardTimeRange(lower, None if upper is FUTURE else upper)
@@ -0,0 +1,39 @@
+"""
+Contains helpers for importing optional dependencies lazily, so that
+importing ``trange`` itself never requires them.
+"""
+from importlib import import_module
+
+
+def import_optional(name, extra):
+    """
+    Import and return the module with the given ``name`` or raise an
+    ``ImportError`` that explains how to install it.
+    :param name: the name of the module to import.
+    :param extra: the name of the ``trange`` extra that installs the module.
+    :return: the imported module.
+    """
+    try:
+        return import_module(name)
+    except ImportError as err:
+        raise ImportError('%s is required for this feature, install it with '
+                          '"pip install trange[%s]".' % (name, extra)) from err
+
+
+_MISSING = set()
+
+
+def try_import(name):
+    """
+    Return the module with the given ``name`` if it can be imported, otherwise
+    return ``None``. A failed import is not retried.
+    :param name: the name of the module.
+    :return: the module or ``None``.
+    """
+    if name in _MISSING:
+        return None
+    try:
+        return import_module(name)
+    except ImportError:
+        _MISSING.add(name)
+        return None
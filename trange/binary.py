@@ -0,0 +1,218 @@
+"""
+Contains a compact binary format for storing many time ranges and a reader
+that memory-maps such a file.
+
+A file starts with a header of 16 bytes: the magic bytes ``TRNG``, the format
+version as unsigned 16-bit integer, two padding bytes and the number of
+ranges as unsigned 64-bit integer. The header is followed by one record of 17
+bytes per range: the start and the end as signed 64-bit integers of
+microseconds since the Unix epoch (in UTC) and a byte that is 1 for a
+``ForwardTimeRange`` and 0 for a ``BackwardTimeRange``. An infinite end is
+stored as ``INFINITE``. All integers are little-endian.
+
+The format stores naive ranges only, as it has no room for a timezone. Aware
+ranges are rejected rather than read back as naive ranges in UTC.
+"""
+import mmap
+from array import array
+from struct import Struct
+
+from trange._optional import import_optional, try_import
+from trange.columnar import TimeRangeArray
+
+
+MAGIC = b'TRNG'
+VERSION = 1
+
+_HEADER = Struct('<4sHxxQ')
+_RECORD = Struct('<qqB')
+_DTYPE = [('start', '<i8'), ('end', '<i8'), ('forward', 'u1')]
+
+
+def dumps(ranges):
+    """
+    Return the given ranges in the binary format.
+    :param ranges: a ``TimeRangeArray`` or an iterable of naive
+    ``TimeRange`` instances.
+    :return: the ranges as ``bytes``.
+    """
+    if not isinstance(ranges, TimeRangeArray):
+        ranges = TimeRangeArray.from_ranges(ranges)
+    if ranges.tz is not None:
+        raise ValueError('Timezone aware ranges cannot be stored in the '
+                         'trange binary format.')
+    header = _HEADER.pack(MAGIC, VERSION, len(ranges))
+    np = try_import('numpy')
+    if np is not None:
+        records = np.empty(len(ranges), dtype=_DTYPE)
+        records['start'] = np.frombuffer(ranges.starts, dtype=np.int64)
+        records['end'] = np.frombuffer(ranges.ends, dtype=np.int64)
+        records['forward'] = np.frombuffer(ranges.forward, dtype=np.int8)
+        return header + records.tobytes()
+    records = bytearray(_RECORD.size * len(ranges))
+    for i, row in enumerate(zip(ranges.starts, ranges.ends, ranges.forward)):
+        _RECORD.pack_into(records, i * _RECORD.size, *row)
+    return header + bytes(records)
+
+
+def dump(ranges, fp):
+    """
+    Write the given ranges in the binary format to the file ``fp``.
+    :param ranges: a ``TimeRangeArray`` or an iterable of naive
+    ``TimeRange`` instances.
+    :param fp: a file that is opened for writing bytes.
+    """
+    fp.write(dumps(ranges))
+
+
+def loads(data):
+    """
+    Return the ranges in ``data``, which is in the binary format, as a
+    ``TimeRangeArray``. No ``TimeRange`` instances are created.
+    :param data: a bytes-like object.
+    :return: a ``TimeRangeArray``.
+    """
+    size = _read_header(data)
+    np = try_import('numpy')
+    if np is not None:
+        records = np.frombuffer(data, dtype=_DTYPE, count=size,
+                                offset=_HEADER.size)
+        return TimeRangeArray(records['start'], records['end'],
+                              records['forward'])
+    starts = array('q')
+    ends = array('q')
+    forward = array('b')
+    end_of_records = _HEADER.size + size * _RECORD.size
+    for start, end, forward_ in _RECORD.iter_unpack(
+            memoryview(data)[_HEADER.size:end_of_records]):
+        starts.append(start)
+        ends.append(end)
+        forward.append(forward_)
+    return TimeRangeArray(starts, ends, forward)
+
+
+def load(fp):
+    """
+    Read the ranges from the file ``fp``, which is in the binary format, as a
+    ``TimeRangeArray``.
+    :param fp: a file that is opened for reading bytes.
+    :return: a ``TimeRangeArray``.
+    """
+    return loads(fp.read())
+
+
+class MappedTimeRanges:
+    """
+    A read-only sequence of the ranges in a file in the binary format, of
+    which the file is memory-mapped. Ranges are read from the mapped memory
+    only when they are accessed, so opening a file of any size is immediate.
+
+    It can be used as a context manager that closes the file on exit.
+    """
+    def __init__(self, path):
+        """
+        Constructor.
+        :param path: the path of the file to map.
+        """
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._size = _read_header(self._mmap)
+        except ValueError:
+            self._mmap.close()
+            raise
+
+    def raw(self, index):
+        """
+        Return the range at ``index`` as a tuple of its start, its end (or
+        ``INFINITE``) in microseconds since the Unix epoch and whether it is
+        forward, without creating a ``TimeRange``.
+        :param index: the index as ``int``.
+        :return: a tuple of (start, end, forward).
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('%s index out of range' % self.__class__.__name__)
+        start, end, forward = _RECORD.unpack_from(
+            self._mmap, _HEADER.size + index * _RECORD.size)
+        return start, end, bool(forward)
+
+    def records(self):
+        """
+        Return a zero-copy NumPy structured array with the fields ``start``,
+        ``end`` and ``forward`` that is backed by the mapped memory. This
+        requires NumPy to be installed.
+        :return: a ``numpy.ndarray``.
+        """
+        np = import_optional('numpy', 'numpy')
+        return np.frombuffer(self._mmap, dtype=_DTYPE, count=self._size,
+                             offset=_HEADER.size)
+
+    def to_array(self):
+        """
+        Return all ranges as a ``TimeRangeArray``.
+        :return: a ``TimeRangeArray``.
+        """
+        return loads(self._mmap)
+
+    def close(self):
+        """
+        Close the mapped file. Arrays from ``records`` must not be in use.
+        """
+        self._mmap.close()
+
+    def __len__(self):
+        """
+        Return the number of ranges in the file.
+        :return: the length as ``int``.
+        """
+        return self._size
+
+    def __getitem__(self, index):
+        """
+        Return the range at ``index`` as a ``TimeRange``.
+        :param index: the index as ``int``.
+        :return: a ``TimeRange``.
+        """
+        return TimeRangeArray._box(*self.raw(index))
+
+    def __iter__(self):
+        """
+        Return an iterator that creates the ``TimeRange`` instances lazily.
+        :return: an iterator of ``TimeRange`` instances.
+        """
+        for index in range(self._size):
+            yield self[index]
+
+    def __enter__(self):
+        """
+        Enter the context of this instance.
+        :return: this instance.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Close the mapped file when the context is left.
+        :param exc_info: the exception information, if any.
+        """
+        self.close()
+
+
+def _read_header(data):
+    # Return the number of ranges in data or raise a ValueError if data is
+    # not in the binary format.
+    if len(data) < _HEADER.size:
+        raise ValueError('The data is too short to be in the trange binary '
+                         'format.')
+    magic, version, size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('The data is not in the trange binary format.')
+    if version != VERSION:
+        raise ValueError('Version %s of the trange binary format is not '
+                         'supported.' % version)
+    if len(data) < _HEADER.size + size * _RECORD.size:
+        raise ValueError('The data is truncated: %s ranges were expected.'
+                         % size)
+    return size
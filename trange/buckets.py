@@ -0,0 +1,82 @@
+"""
+Contains the functions that assign timestamped events to the buckets of a
+step grid and aggregate them per bucket in a single pass.
+"""
+from operator import add
+
+
+_AGGREGATES = {
+    'count': (lambda value: 1, lambda total, value: total + 1),
+    'sum': (lambda value: value, add),
+    'min': (lambda value: value, min),
+    'max': (lambda value: value, max),
+}
+
+
+def assign(events, start, delta, accepts, key=None):
+    """
+    Yield a tuple of the bucket index and the event for each event that is
+    accepted. Bucket ``i`` holds the instants from ``start + i * delta`` up
+    to, but not including, ``start + (i + 1) * delta``; its index is
+    computed arithmetically.
+    :param events: an iterable of events, possibly unbounded.
+    :param start: the ``datetime`` at which bucket 0 starts.
+    :param delta: the signed ``timedelta`` size of a bucket.
+    :param accepts: a function that takes a ``datetime`` and returns whether
+    its event is to be assigned.
+    :param key: a function that returns the ``datetime`` of an event. If it
+    is omitted, the events are ``datetime`` instances themselves.
+    :return: a generator of (index, event) tuples.
+    """
+    for event in events:
+        moment = event if key is None else key(event)
+        if accepts(moment):
+            yield (moment - start) // delta, event
+
+
+def aggregate(assigned, how, value=None, ordered=False):
+    """
+    Aggregate the events per bucket and yield a tuple of the bucket index and
+    the aggregate for each bucket that holds at least one event.
+
+    If ``ordered`` is ``True``, the bucket indices must be non-decreasing, in
+    which case each bucket is yielded as soon as an event of a later bucket
+    arrives. This allows for unbounded input. Otherwise all buckets are
+    yielded in order of their index once the input is exhausted.
+    :param assigned: an iterable of (index, event) tuples.
+    :param how: one of 'count', 'sum', 'min' or 'max'.
+    :param value: a function that returns the value of an event that is to be
+    aggregated. If it is omitted, the event itself is aggregated.
+    :param ordered: determines whether the bucket indices are known to be
+    non-decreasing.
+    :return: a generator of (index, aggregate) tuples.
+    """
+    if how not in _AGGREGATES:
+        raise ValueError("argument 'aggregate' must be one of %s, not %r"
+                         % (', '.join(sorted(_AGGREGATES)), how))
+    initial, combine = _AGGREGATES[how]
+    if ordered:
+        current = None
+        total = None
+        for index, event in assigned:
+            item = event if value is None else value(event)
+            if index == current:
+                total = combine(total, item)
+                continue
+            if current is not None:
+                if index < current:
+                    raise ValueError('The events are not ordered: bucket %s '
+                                     'came after bucket %s.'
+                                     % (index, current))
+                yield current, total
+            current, total = index, initial(item)
+        if current is not None:
+            yield current, total
+    else:
+        totals = {}
+        for index, event in assigned:
+            item = event if value is None else value(event)
+            totals[index] = (combine(totals[index], item) if index in totals
+                             else initial(item))
+        for index in sorted(totals):
+            yield index, totals[index]
@@ -0,0 +1,135 @@
+"""
+Contains the ``StepCache`` class, an opt-in cache of materialized steps.
+"""
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+from trange._optional import import_optional
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+CacheInfo.__doc__ = """
+The statistics of a ``StepCache``: the number of ``hits`` and ``misses``
+since it was created or cleared, its ``maxsize`` and its current size.
+"""
+
+
+class StepCache:
+    """
+    A size bounded cache of materialized steps that evicts the least recently
+    used grid when it is full. It is meant for the same grids that are
+    materialized over and over, like the steps of the same time window for
+    many requests.
+
+    A grid is identified by the ``StepSequence`` that ``TimeRange.steps``
+    returns, which reflects the range, the step size and the inclusivity of
+    ``start`` and ``end``. As that sequence is lazy, looking up a grid takes
+    O(1), regardless of its size. Different arguments that give the same
+    steps share a grid.
+
+    A ``StepCache`` can be shared between threads. Grids are returned as
+    tuples or as read-only NumPy arrays, so they can be shared safely too.
+    """
+    def __init__(self, maxsize=128):
+        """
+        Constructor.
+        :param maxsize: the maximum number of grids in this cache.
+        """
+        if maxsize < 1:
+            raise ValueError("argument 'maxsize' must be positive, not %s"
+                             % maxsize)
+        self._maxsize = maxsize
+        self._grids = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def steps(self, time_range, **steps_kwargs):
+        """
+        Return the steps of ``time_range.steps(**steps_kwargs)`` as a tuple,
+        from this cache if possible.
+        :param time_range: a finite ``TimeRange``.
+        :param steps_kwargs: the keyword arguments of ``TimeRange.steps``.
+        :return: a ``tuple`` of ``datetime`` instances.
+        """
+        steps = time_range.steps(**steps_kwargs)
+        if steps.length is None:
+            raise ValueError('The steps of an infinite TimeRange cannot be '
+                             'cached.')
+        return self._get(('list', steps, steps.first.tzinfo), tuple, steps)
+
+    def steps_array(self, time_range, limit=None, **steps_kwargs):
+        """
+        Return the steps of ``time_range.steps(**steps_kwargs)`` as a
+        read-only NumPy ``datetime64[us]`` array, from this cache if possible.
+        This requires NumPy to be installed.
+
+        See ``TimeRange.steps_array``.
+        :param time_range: a ``TimeRange``.
+        :param limit: the maximum number of steps in the array. It is required
+        if ``time_range`` is infinite.
+        :param steps_kwargs: the keyword arguments of ``TimeRange.steps``.
+        :return: a ``numpy.ndarray`` of ``datetime64[us]``.
+        """
+        import_optional('numpy', 'numpy')
+        steps = time_range.steps(**steps_kwargs)
+        return self._get(('array', steps, limit), _read_only_array, steps,
+                         limit)
+
+    def info(self):
+        """
+        Return the statistics of this cache.
+        :return: a ``CacheInfo``.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize,
+                             len(self._grids))
+
+    def clear(self):
+        """
+        Remove all grids from this cache and reset its statistics.
+        """
+        with self._lock:
+            self._grids.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self):
+        """
+        Return the number of grids in this cache.
+        :return: the length as ``int``.
+        """
+        return len(self._grids)
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(maxsize=%r)' % (self.__class__.__name__, self._maxsize)
+
+    def _get(self, key, materialize, *args):
+        # Return the grid of key, materializing it with args on a miss. The
+        # lock is not held while materializing, so two threads may both
+        # materialize the same grid, of which the last is kept.
+        with self._lock:
+            grid = self._grids.get(key)
+            if grid is not None:
+                self._grids.move_to_end(key)
+                self._hits += 1
+                return grid
+            self._misses += 1
+        grid = materialize(*args)
+        with self._lock:
+            self._grids[key] = grid
+            self._grids.move_to_end(key)
+            if len(self._grids) > self._maxsize:
+                self._grids.popitem(last=False)
+        return grid
+
+
+def _read_only_array(steps, limit):
+    # Return the steps as a NumPy array that cannot be modified.
+    result = steps.to_array(limit)
+    result.flags.writeable = False
+    return result
@@ -0,0 +1,536 @@
+"""
+Contains the ``CalendarStepSequence`` class, the lazy sequence of
+``datetime`` instances that is returned by ``TimeRange.calendar_steps``, and
+the ``BusinessCalendar`` class that defines business days.
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import count as _count
+from operator import index as _index
+
+
+class BusinessCalendar:
+    """
+    An immutable calendar of business days, defined by the days of the week
+    that are business days and a set of holidays.
+
+    The calendar is precomputed when it is created: the number of business
+    days before each day of the week and the sorted holidays that fall on
+    business days. The rank of a day and the day of a rank are then computed
+    arithmetically, with a binary search through the holidays, so the length,
+    items and membership of business day steps never iterate over days.
+    Iterating walks through the business days of each year, which are
+    expanded once and cached.
+    """
+    __slots__ = ('_weekmask', '_holidays', '_weekdays', '_before')
+
+    def __init__(self, weekmask='1111100', holidays=()):
+        """
+        Constructor.
+        :param weekmask: the business days of the week from Monday to Sunday,
+        as a string of seven '1' and '0' characters or as seven booleans.
+        :param holidays: an iterable of ``date`` instances that are not
+        business days.
+        """
+        if isinstance(weekmask, str):
+            if len(weekmask) != 7 or set(weekmask) - set('01'):
+                raise ValueError("argument 'weekmask' must be a string of "
+                                 "seven '1' and '0' characters, not %r"
+                                 % (weekmask,))
+            weekmask = [day == '1' for day in weekmask]
+        weekmask = tuple(bool(day) for day in weekmask)
+        if len(weekmask) != 7 or not any(weekmask):
+            raise ValueError('The weekmask must have seven days of which at '
+                             'least one is a business day.')
+        self._weekmask = weekmask
+        self._weekdays = [day for day in range(7) if weekmask[day]]
+        self._before = [sum(weekmask[:day]) for day in range(8)]
+        self._holidays = sorted({holiday.toordinal() for holiday in holidays
+                                 if weekmask[holiday.weekday()]})
+
+    @property
+    def weekmask(self):
+        """
+        Return the business days of the week from Monday to Sunday.
+        :return: a tuple of seven booleans.
+        """
+        return self._weekmask
+
+    @property
+    def holidays(self):
+        """
+        Return the holidays that fall on business days of the week, sorted.
+        :return: a tuple of ``date`` instances.
+        """
+        return tuple(date.fromordinal(ordinal) for ordinal in self._holidays)
+
+    def is_business_day(self, value):
+        """
+        Return whether the day of ``value`` is a business day.
+        :param value: a ``date`` or ``datetime``.
+        :return: ``True`` if it is a business day.
+        """
+        ordinal = value.toordinal()
+        index = bisect_left(self._holidays, ordinal)
+        return (self._weekmask[value.weekday()]
+                and (index == len(self._holidays)
+                     or self._holidays[index] != ordinal))
+
+    def __eq__(self, other):
+        """
+        Return whether ``self == other``, which is the case if both calendars
+        have the same business days.
+        :param other: the right operand.
+        :return: ``True`` in case of equality.
+        """
+        if not isinstance(other, BusinessCalendar):
+            return NotImplemented
+        return (self._weekmask == other._weekmask
+                and self._holidays == other._holidays)
+
+    def __hash__(self):
+        """
+        Return a hashcode for this instance that is consistent with
+        ``__eq__``.
+        :return: a hashcode as ``int``.
+        """
+        return hash((self._weekmask, tuple(self._holidays)))
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        weekmask = ''.join('1' if day else '0' for day in self._weekmask)
+        return '%s(%r, %r)' % (self.__class__.__name__, weekmask,
+                               list(self.holidays))
+
+    def _rank(self, value):
+        # Return the number of business days before the day of value, counted
+        # from 0001-01-01, a Monday.
+        weeks, day = divmod(value.toordinal() - 1, 7)
+        return (weeks * len(self._weekdays) + self._before[day]
+                - bisect_left(self._holidays, value.toordinal()))
+
+    def _day(self, rank):
+        # Return the business day of which the rank is rank. Each holiday up
+        # to the candidate day moves the candidate one business day further.
+        holidays = 0
+        while True:
+            weeks, day = divmod(rank + holidays, len(self._weekdays))
+            ordinal = weeks * 7 + self._weekdays[day] + 1
+            passed = bisect_right(self._holidays, ordinal)
+            if passed == holidays:
+                return date.fromordinal(ordinal)
+            holidays = passed
+
+
+WEEKDAYS = BusinessCalendar()
+
+
+class CalendarStepSequence(Sequence):
+    """
+    A lazy and immutable sequence of ``datetime`` instances that lie a number
+    of calendar units apart: months (with years as twelve months) or business
+    days. Like a ``StepSequence``, its length, items, slices and membership
+    are computed arithmetically instead of by iterating.
+
+    Month steps are counted from the first step, so their day of the month is
+    clamped to the end of shorter months without drifting: stepping monthly
+    from January 31st gives February 28th (or 29th) and March 31st. Business
+    day steps keep the time of day of the first step.
+
+    A ``CalendarStepSequence`` of which ``length`` is ``None`` is infinite.
+    """
+    __slots__ = ('_unit', '_first', '_step', '_length')
+
+    def __init__(self, unit, first, step, length=None):
+        """
+        Constructor.
+        :param unit: the calendar unit, a ``MonthUnit`` or a
+        ``BusinessDayUnit``.
+        :param first: the position of the first step on the grid of ``unit``.
+        :param step: the number of units between two subsequent steps. It can
+        be negative, but not zero.
+        :param length: the number of steps or ``None`` if the sequence is
+        infinite.
+        """
+        if not step:
+            raise ValueError('The step size must not be zero.')
+        if length is not None and length < 0:
+            raise ValueError('The length must not be negative.')
+        self._unit = unit
+        self._first = first
+        self._step = step
+        self._length = length
+
+    @classmethod
+    def spanning(cls, unit, start, end, step, include_start=True,
+                 include_end=True):
+        """
+        Return a ``CalendarStepSequence`` that steps from ``start`` towards
+        ``end`` with steps of ``step`` units. The first step is the first
+        position of the grid of ``unit`` that is not before ``start`` in the
+        stepping direction.
+        :param unit: the calendar unit.
+        :param start: the ``datetime`` to start stepping from.
+        :param end: the ``datetime`` to stop at or ``None`` to step infinitely.
+        :param step: the number of units between two subsequent steps.
+        :param include_start: determines whether ``start`` is included if it
+        is on the grid.
+        :param include_end: determines whether ``end`` is included if it is
+        hit exactly.
+        :return: a ``CalendarStepSequence``.
+        """
+        if not step:
+            raise ValueError('The step size must not be zero.')
+        first = unit.ceil(start) if step > 0 else unit.floor(start)
+        if not include_start and unit.at(first) == start:
+            first += step
+        if end is None:
+            return cls(unit, first, step)
+        last = unit.floor(end) if step > 0 else unit.ceil(end)
+        if not include_end and unit.at(last) == end:
+            last -= 1 if step > 0 else -1
+        span = last - first
+        length = span // step + 1 if span * step >= 0 else 0
+        return cls(unit, first, step, length)
+
+    @property
+    def unit(self):
+        """
+        Return the calendar unit of this sequence.
+        :return: a ``MonthUnit`` or a ``BusinessDayUnit``.
+        """
+        return self._unit
+
+    @property
+    def length(self):
+        """
+        Return the number of steps in this sequence or ``None`` if it is
+        infinite.
+        :return: the length as ``int`` or ``None``.
+        """
+        return self._length
+
+    def index(self, value, start=0, stop=None):
+        """
+        Return the index of ``value`` in this sequence.
+        :param value: the ``datetime`` to look up.
+        :param start: the index to start searching at.
+        :param stop: the index to stop searching at.
+        :return: the index as ``int``.
+        """
+        index = self._offset(value)
+        if index is not None:
+            if self._length is None:
+                bounds = range(start, index + 1 if stop is None else stop)
+            else:
+                bounds = range(self._length)[start:stop]
+            if index in bounds:
+                return index
+        raise ValueError('%r is not in %s' % (value, self.__class__.__name__))
+
+    def count(self, value):
+        """
+        Return the number of occurrences of ``value`` in this sequence.
+        :param value: the ``datetime`` to count.
+        :return: 0 or 1.
+        """
+        return int(value in self)
+
+    def __len__(self):
+        """
+        Return the number of steps in this sequence.
+        :return: the length as ``int``.
+        """
+        if self._length is None:
+            raise TypeError('An infinite %s has no len().'
+                            % self.__class__.__name__)
+        return self._length
+
+    def __bool__(self):
+        """
+        Return whether this sequence holds any steps.
+        :return: ``True`` if this sequence is not empty.
+        """
+        return self._length != 0
+
+    def __getitem__(self, item):
+        """
+        Return the step at index ``item`` or a ``CalendarStepSequence`` if
+        ``item`` is a ``slice``.
+        :param item: an ``int`` or a ``slice``.
+        :return: a ``datetime`` or a ``CalendarStepSequence``.
+        """
+        if isinstance(item, slice):
+            return self._slice(item)
+        index = _index(item)
+        if index < 0:
+            if self._length is None:
+                raise IndexError('An infinite %s does not support negative '
+                                 'indices.' % self.__class__.__name__)
+            index += self._length
+        if index < 0 or (self._length is not None and index >= self._length):
+            raise IndexError('%s index out of range'
+                             % self.__class__.__name__)
+        return self._unit.at(self._first + self._step * index)
+
+    def __iter__(self):
+        """
+        Return an iterator over the steps in this sequence.
+        :return: an iterator of ``datetime`` instances.
+        """
+        if self._length == 0:
+            return iter(())
+        return self._unit.iterate(self._first, self._step, self._length)
+
+    def __reversed__(self):
+        """
+        Return an iterator over the steps in this sequence in reversed order.
+        :return: an iterator of ``datetime`` instances.
+        """
+        if self._length is None:
+            raise TypeError('An infinite %s cannot be reversed.'
+                            % self.__class__.__name__)
+        return iter(self[::-1])
+
+    def __contains__(self, item):
+        """
+        Return whether ``item`` is one of the steps in this sequence.
+        :param item: any object.
+        :return: ``True`` if ``item`` is in self.
+        """
+        return self._offset(item) is not None
+
+    def __eq__(self, other):
+        """
+        Return whether ``self == other``, which is the case if both sequences
+        step over the same grid in the same way.
+        :param other: the right operand.
+        :return: ``True`` in case of equality.
+        """
+        if not isinstance(other, CalendarStepSequence):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        """
+        Return a hashcode for this instance that is consistent with
+        ``__eq__``.
+        :return: a hashcode as ``int``.
+        """
+        return hash(self._key())
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(%r, %r, %r, %r)' % (self.__class__.__name__, self._unit,
+                                       self._first, self._step, self._length)
+
+    def _key(self):
+        # Return a tuple that identifies this sequence.
+        return self._unit, self._first, self._step, self._length
+
+    def _offset(self, item):
+        # Return the index of item in this sequence or None.
+        if not isinstance(item, datetime):
+            return None
+        try:
+            position = self._unit.floor(item)
+        except TypeError:
+            return None
+        if self._unit.at(position) != item:
+            return None
+        index, remainder = divmod(position - self._first, self._step)
+        if (remainder or index < 0
+                or (self._length is not None and index >= self._length)):
+            return None
+        return index
+
+    def _slice(self, slc):
+        # Return a CalendarStepSequence with the steps that are selected by
+        # slc.
+        if self._length is not None:
+            indices = range(self._length)[slc]
+        else:
+            step = 1 if slc.step is None else _index(slc.step)
+            start = 0 if slc.start is None else _index(slc.start)
+            stop = None if slc.stop is None else _index(slc.stop)
+            if step <= 0 or start < 0 or (stop is not None and stop < 0):
+                raise ValueError('An infinite %s can only be sliced with '
+                                 'non-negative indices and steps.'
+                                 % self.__class__.__name__)
+            if stop is None:
+                return self.__class__(self._unit,
+                                      self._first + self._step * start,
+                                      self._step * step)
+            indices = range(start, stop, step)
+        return self.__class__(self._unit,
+                              self._first + self._step * indices.start,
+                              self._step * indices.step, len(indices))
+
+
+class _Unit(ABC):
+    # The base of the calendar units, which map integer positions to the
+    # datetimes of a grid, monotonically.
+    __slots__ = ('_anchor',)
+
+    def __init__(self, anchor):
+        self._anchor = anchor
+
+    @abstractmethod
+    def at(self, position):
+        # Return the datetime at position.
+        pass
+
+    def floor(self, value):
+        # Return the greatest position of which the datetime is not after
+        # value. The estimate is off by at most a few positions.
+        position = self._estimate(value)
+        while self.at(position) > value:
+            position -= 1
+        while self.at(position + 1) <= value:
+            position += 1
+        return position
+
+    def ceil(self, value):
+        # Return the smallest position of which the datetime is not before
+        # value.
+        position = self.floor(value)
+        return position if self.at(position) == value else position + 1
+
+    def iterate(self, position, step, count):
+        # Yield the datetimes at count positions that lie step apart, from
+        # position on, or infinitely many if count is None.
+        at = self.at
+        positions = (range(position, position + step * count, step)
+                     if count is not None else _count(position, step))
+        for position_ in positions:
+            yield at(position_)
+
+    @abstractmethod
+    def _estimate(self, value):
+        # Return a position of which the datetime is close to value.
+        pass
+
+    def _key(self):
+        return (self._anchor,)
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self._key())
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__,
+                           ', '.join(repr(part) for part in self._key()))
+
+
+class MonthUnit(_Unit):
+    """
+    The grid of months from ``anchor``: position ``n`` is ``anchor`` plus
+    ``n`` months, with the day clamped to the end of the month.
+    """
+    __slots__ = ()
+
+    def at(self, position):
+        """
+        Return the ``datetime`` at ``position``.
+        :param position: the number of months from ``anchor`` as ``int``.
+        :return: a ``datetime``.
+        """
+        anchor = self._anchor
+        year, month = divmod(anchor.month - 1 + position, 12)
+        year += anchor.year
+        day = min(anchor.day, _days_in_month(year, month + 1))
+        return anchor.replace(year=year, month=month + 1, day=day)
+
+    def _estimate(self, value):
+        return ((value.year - self._anchor.year) * 12
+                + value.month - self._anchor.month)
+
+
+class BusinessDayUnit(_Unit):
+    """
+    The grid of business days of ``calendar`` at the time of day of
+    ``anchor``: position ``n`` is the business day of which the rank is
+    ``n``.
+    """
+    __slots__ = ('_calendar',)
+
+    def __init__(self, anchor, calendar=WEEKDAYS):
+        """
+        Constructor.
+        :param anchor: the ``datetime`` that defines the time of day.
+        :param calendar: a ``BusinessCalendar``.
+        """
+        _Unit.__init__(self, anchor)
+        self._calendar = calendar
+
+    def at(self, position):
+        """
+        Return the ``datetime`` at ``position``.
+        :param position: the rank of the business day as ``int``.
+        :return: a ``datetime``.
+        """
+        return datetime.combine(self._calendar._day(position),
+                                self._anchor.timetz())
+
+    def iterate(self, position, step, count):
+        # Walk through the cached business days of each year instead of
+        # looking up each position.
+        combine = datetime.combine
+        time = self._anchor.timetz()
+        day = self._calendar._day(position)
+        year = day.year
+        days = _business_days(self._calendar, year)
+        index = bisect_left(days, day)
+        remaining = -1 if count is None else count
+        while remaining:
+            yield combine(days[index], time)
+            remaining -= 1
+            if not remaining:
+                return
+            index += step
+            while index >= len(days):
+                index -= len(days)
+                year += 1
+                days = _business_days(self._calendar, year)
+            while index < 0:
+                year -= 1
+                days = _business_days(self._calendar, year)
+                index += len(days)
+
+    def _estimate(self, value):
+        return self._calendar._rank(value)
+
+    def _key(self):
+        return self._anchor.timetz(), self._calendar
+
+
+def _days_in_month(year, month):
+    # Return the number of days in the given month of the given year.
+    if month == 2:
+        return 29 if year % 4 == 0 and (year % 100 or year % 400 == 0) else 28
+    return 30 if month in (4, 6, 9, 11) else 31
+
+
+@lru_cache(maxsize=64)
+def _business_days(calendar, year):
+    # Return the business days of calendar in year.
+    first = date(year, 1, 1).toordinal()
+    last = date(year, 12, 31).toordinal()
+    holidays = set(calendar._holidays)
+    weekmask = calendar._weekmask
+    return tuple(date.fromordinal(ordinal)
+                 for ordinal in range(first, last + 1)
+                 if weekmask[(ordinal - 1) % 7] and ordinal not in holidays)
@@ -0,0 +1,400 @@
+"""
+Contains the ``TimeRangeArray`` class, a columnar container that holds many
+time ranges without creating a ``TimeRange`` instance for each of them.
+"""
+from array import array
+
+from trange._epoch import (INFINITE, INT64_MAX, bounds_micros, from_micros,
+                           to_micros)
+from trange._optional import try_import
+from trange.trange import BackwardTimeRange, ForwardTimeRange, _make
+
+
+_NUMPY_TYPES = {'q': 'int64', 'b': 'int8'}
+
+
+class TimeRangeArray:
+    """
+    A columnar container of time ranges. The starts and ends are stored as
+    packed 64-bit integers of microseconds since the Unix epoch (in UTC) and
+    the directions as packed bytes. An infinite end is stored as
+    ``INFINITE``. The ranges of an array are either all naive or all aware
+    in one timezone, ``tz``, which is restored when they are boxed again.
+
+    Operations such as ``contains``, ``overlaps`` and ``argsort`` work on the
+    columns directly. They are vectorized with NumPy if it is installed, in
+    which case they return NumPy arrays; otherwise they return lists. Only
+    indexing and iterating create ``TimeRange`` instances, one at a time.
+    """
+    __slots__ = ('_starts', '_ends', '_forward', '_tz')
+
+    INFINITE = INFINITE
+
+    def __init__(self, starts=(), ends=(), forward=None, tz=None):
+        """
+        Constructor.
+        :param starts: the starts as microseconds since the Unix epoch.
+        :param ends: the ends as microseconds since the Unix epoch or
+        ``INFINITE``.
+        :param forward: the directions, truthy for a ``ForwardTimeRange``. If
+        omitted, the direction is derived from ``starts`` and ``ends``, in
+        which case infinite ranges are forward.
+        :param tz: the ``tzinfo`` of the ranges or ``None`` if they are
+        naive. The columns are in UTC either way.
+        """
+        self._starts = _column('q', starts)
+        self._ends = _column('q', ends)
+        if len(self._starts) != len(self._ends):
+            raise ValueError('The number of starts and ends must be equal.')
+        np = try_import('numpy')
+        if forward is None and np is not None:
+            starts, ends = _view(np, self._starts), _view(np, self._ends)
+            forward = (ends == INFINITE) | (starts <= ends)
+        elif forward is None:
+            forward = [end == INFINITE or start <= end
+                       for start, end in zip(self._starts, self._ends)]
+        self._forward = _column('b', forward)
+        if len(self._forward) != len(self._starts):
+            raise ValueError('The number of directions must be equal to the '
+                             'number of starts.')
+        self._tz = tz
+        self._validate()
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """
+        Return a ``TimeRangeArray`` that holds the given ranges. The ranges
+        must either all be naive or all be aware in the same timezone.
+        :param ranges: an iterable of ``TimeRange`` instances.
+        :return: a ``TimeRangeArray``.
+        """
+        starts = array('q')
+        ends = array('q')
+        forward = array('b')
+        tzinfos = set()
+        for time_range in ranges:
+            start, end = time_range.start, time_range.end
+            tzinfos.add(start.tzinfo)
+            starts.append(to_micros(start))
+            if end is None:
+                ends.append(INFINITE)
+            else:
+                tzinfos.add(end.tzinfo)
+                ends.append(to_micros(end))
+            forward.append(not isinstance(time_range, BackwardTimeRange))
+        if len(tzinfos) > 1:
+            raise ValueError('The ranges of a TimeRangeArray must all be '
+                             'naive or all be aware in the same timezone.')
+        tz = tzinfos.pop() if tzinfos else None
+        return cls._from_columns(starts, ends, forward, tz)
+
+    @property
+    def starts(self):
+        """
+        Return the column of starts. It must not be modified.
+        :return: an ``array.array`` of microseconds since the Unix epoch.
+        """
+        return self._starts
+
+    @property
+    def ends(self):
+        """
+        Return the column of ends. It must not be modified.
+        :return: an ``array.array`` of microseconds since the Unix epoch, with
+        ``INFINITE`` for infinite ends.
+        """
+        return self._ends
+
+    @property
+    def forward(self):
+        """
+        Return the column of directions. It must not be modified.
+        :return: an ``array.array`` with 1 for forward and 0 for backward.
+        """
+        return self._forward
+
+    @property
+    def tz(self):
+        """
+        Return the timezone of the ranges.
+        :return: a ``tzinfo`` or ``None`` if the ranges are naive.
+        """
+        return self._tz
+
+    def to_list(self):
+        """
+        Return all ranges as ``TimeRange`` instances.
+        :return: a ``list`` of ``TimeRange`` instances.
+        """
+        return list(self)
+
+    def to_interval_index(self, closed='both', name=None, tz=None):
+        """
+        Return the ranges as a ``pandas.IntervalIndex``. This requires pandas
+        to be installed (``pip install trange[pandas]``).
+
+        See ``trange.interop.to_interval_index``.
+        :param closed: See ``trange.interop.to_interval_index``.
+        :param name: See ``trange.interop.to_interval_index``.
+        :param tz: See ``trange.interop.to_interval_index``.
+        :return: a ``pandas.IntervalIndex``.
+        """
+        # Imported here, as the interop module depends on this one.
+        from trange.interop import to_interval_index
+        return to_interval_index(self, closed, name, tz)
+
+    def deltas(self):
+        """
+        Return the difference between ``end`` and ``start`` of each range in
+        microseconds, like ``TimeRange.delta``. Infinite ranges have a delta
+        of ``INFINITE``.
+        :return: a ``numpy.ndarray`` or an ``array.array`` of ``int64``.
+        """
+        np = try_import('numpy')
+        if np is not None:
+            starts, ends = _view(np, self._starts), _view(np, self._ends)
+            return np.where(ends == INFINITE, INFINITE, ends - starts)
+        return array('q', [INFINITE if end == INFINITE else end - start
+                           for start, end in zip(self._starts, self._ends)])
+
+    def contains(self, item, include_start=True, include_end=True):
+        """
+        Return for each range whether it contains ``item``, consistent with
+        ``TimeRange.contains``.
+        :param item: a ``datetime``.
+        :param include_start: See ``TimeRange.contains``.
+        :param include_end: See ``TimeRange.contains``.
+        :return: a boolean mask as ``numpy.ndarray`` or ``list``.
+        """
+        micros = to_micros(item)
+        np = try_import('numpy')
+        if np is not None:
+            lower, upper = self._bounds(np)
+            forward = _view(np, self._forward).astype(bool)
+            lower_ok = np.where(forward,
+                                _compare(lower, micros, include_start),
+                                _compare(lower, micros, include_end))
+            upper_ok = np.where(forward,
+                                _compare(micros, upper, include_end),
+                                _compare(micros, upper, include_start))
+            return lower_ok & upper_ok
+        result = []
+        lowers, uppers = self._bounds(None)
+        for lower, upper, forward in zip(lowers, uppers, self._forward):
+            include_lower = include_start if forward else include_end
+            include_upper = include_end if forward else include_start
+            result.append(_compare(lower, micros, include_lower)
+                          and _compare(micros, upper, include_upper))
+        return result
+
+    def overlaps(self, other):
+        """
+        Return for each range whether it shares at least one instant with
+        ``other``, with all ends included.
+        :param other: a ``TimeRange``.
+        :return: a boolean mask as ``numpy.ndarray`` or ``list``.
+        """
+        other_lower, other_upper = bounds_micros(other)
+        np = try_import('numpy')
+        if np is not None:
+            lower, upper = self._bounds(np)
+            return (lower <= other_upper) & (upper >= other_lower)
+        return [lower <= other_upper and upper >= other_lower
+                for lower, upper in zip(*self._bounds(None))]
+
+    def bounds(self):
+        """
+        Return the chronological lower and upper bound of each range in
+        microseconds since the Unix epoch, regardless of its direction. An
+        infinite bound is ``INT64_MAX``.
+        :return: a tuple of two ``numpy.ndarray`` or two ``list`` instances.
+        """
+        return self._bounds(try_import('numpy'))
+
+    def argsort(self):
+        """
+        Return the indices that sort the ranges chronologically, by their
+        earliest instant first and by their latest instant second.
+        :return: the indices as ``numpy.ndarray`` or ``list``.
+        """
+        np = try_import('numpy')
+        if np is not None:
+            lower, upper = self._bounds(np)
+            return np.lexsort((upper, lower))
+        pairs = list(zip(*self._bounds(None)))
+        return sorted(range(len(pairs)), key=pairs.__getitem__)
+
+    def sorted(self):
+        """
+        Return a new ``TimeRangeArray`` with the ranges sorted
+        chronologically. See ``TimeRangeArray.argsort``.
+        :return: a ``TimeRangeArray``.
+        """
+        return self.take(self.argsort())
+
+    def take(self, indices):
+        """
+        Return a new ``TimeRangeArray`` with the ranges at the given indices.
+        :param indices: an iterable of ``int`` indices.
+        :return: a ``TimeRangeArray``.
+        """
+        np = try_import('numpy')
+        if np is not None:
+            indices = np.asarray(indices, dtype=np.int64)
+            starts, ends, forward = [
+                _column(column.typecode, _view(np, column)[indices])
+                for column in (self._starts, self._ends, self._forward)]
+            return self._from_columns(starts, ends, forward, self._tz)
+        indices = list(indices)
+        starts, ends, forward = [
+            array(column.typecode, [column[i] for i in indices])
+            for column in (self._starts, self._ends, self._forward)]
+        return self._from_columns(starts, ends, forward, self._tz)
+
+    def filter(self, mask):
+        """
+        Return a new ``TimeRangeArray`` with the ranges for which ``mask`` is
+        truthy, e.g. the result of ``contains`` or ``overlaps``.
+        :param mask: an iterable of booleans.
+        :return: a ``TimeRangeArray``.
+        """
+        np = try_import('numpy')
+        if np is not None:
+            return self.take(np.flatnonzero(np.asarray(mask, dtype=bool)))
+        return self.take(i for i, selected in enumerate(mask) if selected)
+
+    def __len__(self):
+        """
+        Return the number of ranges.
+        :return: the length as ``int``.
+        """
+        return len(self._starts)
+
+    def __getitem__(self, item):
+        """
+        Return the range at index ``item`` as a ``TimeRange`` or a new
+        ``TimeRangeArray`` if ``item`` is a ``slice``.
+        :param item: an ``int`` or a ``slice``.
+        :return: a ``TimeRange`` or a ``TimeRangeArray``.
+        """
+        if isinstance(item, slice):
+            return self._from_columns(self._starts[item], self._ends[item],
+                                      self._forward[item], self._tz)
+        return self._box(self._starts[item], self._ends[item],
+                         self._forward[item], self._tz)
+
+    def __iter__(self):
+        """
+        Return an iterator that creates the ``TimeRange`` instances lazily.
+        :return: an iterator of ``TimeRange`` instances.
+        """
+        box = self._box
+        tz = self._tz
+        for start, end, forward in zip(self._starts, self._ends,
+                                       self._forward):
+            yield box(start, end, forward, tz)
+
+    def __eq__(self, other):
+        """
+        Return whether ``self == other``, which is the case if all columns and
+        the timezones are equal.
+        :param other: the right operand.
+        :return: ``True`` in case of equality.
+        """
+        if not isinstance(other, TimeRangeArray):
+            return NotImplemented
+        return (self._starts == other._starts and self._ends == other._ends
+                and self._forward == other._forward and self._tz == other._tz)
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        tz = '' if self._tz is None else ', tz=%r' % self._tz
+        return '%s(%r, %r, %r%s)' % (self.__class__.__name__,
+                                     self._starts.tolist(),
+                                     self._ends.tolist(),
+                                     self._forward.tolist(), tz)
+
+    @classmethod
+    def _from_columns(cls, starts, ends, forward, tz=None):
+        # Create an instance from valid columns without copying them.
+        result = cls.__new__(cls)
+        result._starts = starts
+        result._ends = ends
+        result._forward = forward
+        result._tz = tz
+        return result
+
+    @staticmethod
+    def _box(start, end, forward, tz=None):
+        # Create a TimeRange from the values of one row, in tz if given.
+        cls = ForwardTimeRange if forward else BackwardTimeRange
+        return _make(cls, from_micros(start, tz),
+                     None if end == INFINITE else from_micros(end, tz))
+
+    def _bounds(self, np):
+        # Return the chronological lower and upper bounds of all ranges, with
+        # infinite bounds as the smallest and the largest int64.
+        if np is not None:
+            starts, ends = _view(np, self._starts), _view(np, self._ends)
+            forward = _view(np, self._forward).astype(bool)
+            infinite = ends == INFINITE
+            lower = np.where(forward, starts, ends)
+            upper = np.where(forward, np.where(infinite, INT64_MAX, ends),
+                             starts)
+            return lower, upper
+        lower = []
+        upper = []
+        for start, end, forward in zip(self._starts, self._ends,
+                                       self._forward):
+            if forward:
+                lower.append(start)
+                upper.append(INT64_MAX if end == INFINITE else end)
+            else:
+                lower.append(end)
+                upper.append(start)
+        return lower, upper
+
+    def _validate(self):
+        # Raise a ValueError if any row is not a valid TimeRange.
+        np = try_import('numpy')
+        if np is not None:
+            starts, ends = _view(np, self._starts), _view(np, self._ends)
+            forward = _view(np, self._forward).astype(bool)
+            invalid = (starts == INFINITE) | ((ends != INFINITE) & np.where(
+                forward, starts > ends, starts <= ends))
+            rows = np.flatnonzero(invalid)[:1]
+        else:
+            rows = [i for i, (start, end, forward) in enumerate(zip(
+                self._starts, self._ends, self._forward))
+                    if start == INFINITE or (end != INFINITE and (
+                        start > end if forward else start <= end))][:1]
+        for row in rows:
+            raise ValueError('The range (%s, %s) at index %s is not valid for '
+                             'its direction.' % (self._starts[row],
+                                                 self._ends[row], row))
+
+
+def _column(typecode, values):
+    # Return a new packed array of the given typecode with the given values.
+    np = try_import('numpy')
+    if np is not None and isinstance(values, np.ndarray):
+        result = array(typecode)
+        result.frombytes(values.astype(_NUMPY_TYPES[typecode]).tobytes())
+        return result
+    return array(typecode, values)
+
+
+def _view(np, column):
+    # Return a NumPy array that shares the memory of the given packed array.
+    return np.frombuffer(column, dtype=_NUMPY_TYPES[column.typecode])
+
+
+def _compare(left, right, inclusive):
+    # Return left <= right if inclusive else left < right.
+    return left <= right if inclusive else left < right
+
@@ -0,0 +1,237 @@
+"""
+Contains the ``TimeRangeIndex`` class, an interval index that finds the
+``TimeRange`` instances that contain an instant or overlap with a range in
+logarithmic time.
+"""
+from itertools import count
+from random import random
+
+from trange._epoch import bounds_micros, to_micros
+
+
+class TimeRangeIndex:
+    """
+    An index of ``TimeRange`` instances that supports point stabbing and
+    overlap queries. It is an interval tree in the form of a treap that is
+    ordered by the chronological lower bound of each range and augmented with
+    the greatest upper bound in each subtree.
+
+    Ranges are indexed by the instants they cover, regardless of their
+    direction. Infinite ranges (e.g. created with ``trange(end=...)``) cover
+    everything before or after their ``start``. Both ends of every range are
+    included, like with ``in``.
+
+    Inserting and removing ranges takes O(log n) on average, a query takes
+    O(log n + k) with k the number of ranges that are found.
+    """
+    def __init__(self, ranges=()):
+        """
+        Constructor.
+        :param ranges: an iterable of ``TimeRange`` instances to index.
+        """
+        self._root = None
+        self._ids = {}
+        self._counter = count()
+        self._size = 0
+        for time_range in ranges:
+            self.add(time_range)
+
+    def add(self, time_range):
+        """
+        Add ``time_range`` to this index. A range can be added more than
+        once.
+        :param time_range: a ``TimeRange``.
+        """
+        lower, upper = bounds_micros(time_range)
+        node = _Node((lower, upper, next(self._counter)), time_range)
+        self._ids.setdefault(time_range, []).append(node.key)
+        self._root = _insert(self._root, node)
+        self._size += 1
+
+    def remove(self, time_range):
+        """
+        Remove ``time_range`` from this index or raise a ``KeyError`` if it is
+        not in it. If the range was added more than once, one occurrence is
+        removed.
+        :param time_range: a ``TimeRange``.
+        """
+        keys = self._ids.get(time_range)
+        if not keys:
+            raise KeyError(time_range)
+        key = keys.pop()
+        if not keys:
+            del self._ids[time_range]
+        self._root = _delete(self._root, key)
+        self._size -= 1
+
+    def discard(self, time_range):
+        """
+        Remove ``time_range`` from this index if it is in it.
+        :param time_range: a ``TimeRange``.
+        """
+        if time_range in self._ids:
+            self.remove(time_range)
+
+    def stab(self, item):
+        """
+        Return all ranges that contain ``item``, ordered chronologically by
+        their lower bound.
+        :param item: a ``datetime``.
+        :return: a ``list`` of ``TimeRange`` instances.
+        """
+        micros = to_micros(item)
+        return list(self._search(micros, micros))
+
+    def overlapping(self, time_range):
+        """
+        Return all ranges that share at least one instant with
+        ``time_range``, ordered chronologically by their lower bound.
+        :param time_range: a ``TimeRange``.
+        :return: a ``list`` of ``TimeRange`` instances.
+        """
+        return list(self._search(*bounds_micros(time_range)))
+
+    def __len__(self):
+        """
+        Return the number of ranges in this index.
+        :return: the length as ``int``.
+        """
+        return self._size
+
+    def __contains__(self, item):
+        """
+        Return whether ``item`` was added to this index.
+        :param item: a ``TimeRange``.
+        :return: ``True`` if ``item`` is in self.
+        """
+        return item in self._ids
+
+    def __iter__(self):
+        """
+        Return an iterator over all ranges, ordered chronologically by their
+        lower bound.
+        :return: an iterator of ``TimeRange`` instances.
+        """
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.time_range
+            node = node.right
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(%r)' % (self.__class__.__name__, list(self))
+
+    def _search(self, lower, upper):
+        # Yield the ranges that overlap with [lower, upper] in order. Subtrees
+        # of which the greatest upper bound is before lower are skipped and
+        # the traversal stops at the first range that starts after upper.
+        stack = []
+        node = self._root
+        while True:
+            while node is not None and node.max_upper >= lower:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key[0] > upper:
+                return
+            if node.key[1] >= lower:
+                yield node.time_range
+            node = node.right
+
+
+class _Node:
+    # A node of the treap with the bounds and a unique number as key.
+    __slots__ = ('key', 'time_range', 'priority', 'max_upper', 'left',
+                 'right')
+
+    def __init__(self, key, time_range):
+        self.key = key
+        self.time_range = time_range
+        self.priority = random()
+        self.max_upper = key[1]
+        self.left = None
+        self.right = None
+
+
+def _update(node):
+    # Recompute the greatest upper bound of the subtree of node.
+    max_upper = node.key[1]
+    if node.left is not None and node.left.max_upper > max_upper:
+        max_upper = node.left.max_upper
+    if node.right is not None and node.right.max_upper > max_upper:
+        max_upper = node.right.max_upper
+    node.max_upper = max_upper
+
+
+def _rotate_right(node):
+    # Rotate the left child of node up and return it.
+    child = node.left
+    node.left = child.right
+    child.right = node
+    _update(node)
+    _update(child)
+    return child
+
+
+def _rotate_left(node):
+    # Rotate the right child of node up and return it.
+    child = node.right
+    node.right = child.left
+    child.left = node
+    _update(node)
+    _update(child)
+    return child
+
+
+def _insert(node, new):
+    # Insert new into the subtree of node and return the new subtree root.
+    if node is None:
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+        if node.left.priority > node.priority:
+            return _rotate_right(node)
+    else:
+        node.right = _insert(node.right, new)
+        if node.right.priority > node.priority:
+            return _rotate_left(node)
+    _update(node)
+    return node
+
+
+def _delete(node, key):
+    # Delete the node with key from the subtree of node and return the new
+    # subtree root.
+    if node.key == key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+    _update(node)
+    return node
+
+
+def _merge(left, right):
+    # Merge two subtrees of which all keys in left precede those in right.
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
@@ -0,0 +1,310 @@
+"""
+Contains opt-in instrumentation of the hot paths of ``trange``: creating
+ranges, yielding steps, ``contains`` checks and hash computations.
+
+Instrumentation is off by default. While it is off, nothing is patched and
+the hot paths run without any added overhead. ``enable`` wraps the hot paths
+with functions that count and time them and report every event to the
+registered observers. ``disable`` restores the original functions::
+
+    from trange import instrument
+
+    with instrument.collect() as stats:
+        for step in time_range.steps(minutes=1):
+            ...
+    stats.count(instrument.STEPS)
+
+An observer is a callable that is called with the name of the event, the
+number of times it occurred and the number of seconds it took, from the
+thread in which it occurred.
+
+The events cover exactly these code paths:
+
+- ``CONSTRUCT``: the constructors of ``ForwardTimeRange`` and
+  ``BackwardTimeRange`` and the unvalidated construction that ``from_pairs``,
+  ``TimeRangeArray`` and ``WindowSequence`` use, once per range.
+- ``STEPS``: the steps that are yielded by iterating (also in reverse) a
+  ``StepSequence``, a ``ZonedStepSequence`` or a ``CalendarStepSequence``,
+  and by ``StepIterator``. Indexing and slicing a sequence are not counted.
+- ``CONTAINS``: ``contains`` (and thus ``in``) of a ``TimeRange`` once per
+  call and ``contains_many`` once per item. The vectorized operations of
+  ``TimeRangeArray`` are not counted.
+- ``HASH``: the computations of ``TimeRange.__hash__``, not its cached
+  results.
+"""
+import sys
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+from trange import columnar, windows
+from trange.calendars import CalendarStepSequence
+from trange.steps import StepIterator, StepSequence
+from trange.trange import BackwardTimeRange, ForwardTimeRange, TimeRange
+
+
+CONSTRUCT = 'construct'
+STEPS = 'steps'
+CONTAINS = 'contains'
+HASH = 'hash'
+EVENTS = (CONSTRUCT, STEPS, CONTAINS, HASH)
+
+
+class Stats:
+    """
+    An observer that sums the count and the duration of every event. It can
+    be shared between threads.
+    """
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self._totals = {}
+        self._lock = Lock()
+
+    def __call__(self, event, count, seconds):
+        """
+        Add an occurrence of ``event`` to these statistics.
+        :param event: the name of the event.
+        :param count: the number of times ``event`` occurred.
+        :param seconds: the number of seconds that ``event`` took.
+        """
+        with self._lock:
+            total = self._totals.get(event)
+            if total is None:
+                self._totals[event] = [count, seconds]
+            else:
+                total[0] += count
+                total[1] += seconds
+
+    def count(self, event):
+        """
+        Return how many times ``event`` occurred.
+        :param event: the name of the event.
+        :return: the count as ``int``.
+        """
+        return self._totals.get(event, (0, 0.0))[0]
+
+    def seconds(self, event):
+        """
+        Return how many seconds ``event`` took in total.
+        :param event: the name of the event.
+        :return: the number of seconds as ``float``.
+        """
+        return self._totals.get(event, (0, 0.0))[1]
+
+    def as_dict(self):
+        """
+        Return these statistics as a ``dict`` with per event a tuple of the
+        count and the number of seconds.
+        :return: a ``dict``.
+        """
+        with self._lock:
+            return {event: tuple(total)
+                    for event, total in self._totals.items()}
+
+    def clear(self):
+        """
+        Reset these statistics.
+        """
+        with self._lock:
+            self._totals.clear()
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(%r)' % (self.__class__.__name__, self.as_dict())
+
+
+@contextmanager
+def collect(stats=None):
+    """
+    Enable instrumentation within a ``with`` block and collect the events
+    that occur in the meantime. Blocks can be nested.
+
+    Instrumentation patches classes and modules process-wide, so the events
+    that other threads cause during the block are collected as well.
+    :param stats: an optional ``Stats`` instance to add the events to.
+    :return: a context manager that gives the ``Stats`` instance.
+    """
+    stats = Stats() if stats is None else stats
+    add_observer(stats)
+    enable()
+    try:
+        yield stats
+    finally:
+        disable()
+        remove_observer(stats)
+
+
+def enable():
+    """
+    Enable instrumentation. Calls to ``enable`` and ``disable`` are counted,
+    so instrumentation stays enabled until ``disable`` has been called as
+    often as ``enable``.
+    """
+    global _enabled
+    with _lock:
+        _enabled += 1
+        if _enabled == 1:
+            for owner, name, wrap in _PATCHES:
+                original = getattr(owner, name)
+                _originals.append((owner, name, original))
+                setattr(owner, name, wrap(original))
+
+
+def disable():
+    """
+    Disable instrumentation and restore the original hot paths, once
+    ``disable`` has been called as often as ``enable``.
+    """
+    global _enabled
+    with _lock:
+        if _enabled == 0:
+            return
+        _enabled -= 1
+        if _enabled == 0:
+            while _originals:
+                owner, name, original = _originals.pop()
+                setattr(owner, name, original)
+
+
+def is_enabled():
+    """
+    Return whether instrumentation is enabled.
+    :return: ``True`` if instrumentation is enabled.
+    """
+    return _enabled > 0
+
+
+def add_observer(observer):
+    """
+    Register a callable that is called with ``(event, count, seconds)`` for
+    every instrumented event.
+    :param observer: a callable.
+    """
+    global _observers
+    with _lock:
+        _observers = _observers + (observer,)
+
+
+def remove_observer(observer):
+    """
+    Unregister an observer that was registered with ``add_observer``.
+    :param observer: the callable to unregister.
+    """
+    global _observers
+    with _lock:
+        observers = list(_observers)
+        observers.remove(observer)
+        _observers = tuple(observers)
+
+
+_lock = Lock()
+_enabled = 0
+_originals = []
+# Replaced rather than modified, so it can be iterated without the lock.
+_observers = ()
+
+
+def _emit(event, count, seconds):
+    # Report an event to all observers.
+    for observer in _observers:
+        observer(event, count, seconds)
+
+
+def _timed(event):
+    # Return a function that wraps a function to time every call as event.
+    def wrap(func):
+        def wrapper(*args, **kwargs):
+            before = perf_counter()
+            result = func(*args, **kwargs)
+            _emit(event, 1, perf_counter() - before)
+            return result
+        wrapper.__wrapped__ = func
+        return wrapper
+    return wrap
+
+
+def _wrap_steps(func):
+    # Wrap an __iter__ method, which __reversed__ uses too, to count and time
+    # the steps that it yields, excluding the time of the consumer.
+    def wrapper(self):
+        iterator = func(self)
+        count = 0
+        seconds = 0.0
+        try:
+            while True:
+                before = perf_counter()
+                try:
+                    step = next(iterator)
+                except StopIteration:
+                    seconds += perf_counter() - before
+                    return
+                seconds += perf_counter() - before
+                count += 1
+                yield step
+        finally:
+            _emit(STEPS, count, seconds)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _wrap_next(func):
+    # Wrap StepIterator.__next__ to count and time every step that it returns.
+    def wrapper(self):
+        before = perf_counter()
+        result = func(self)
+        _emit(STEPS, 1, perf_counter() - before)
+        return result
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _wrap_contains_many(func):
+    # Wrap TimeRange.contains_many to count every item that it checks. The
+    # count is taken from the mask, as items may be an exhausted iterator by
+    # then, unless a slice is returned, which requires items to be a sequence.
+    def wrapper(self, items, *args, **kwargs):
+        before = perf_counter()
+        result = func(self, items, *args, **kwargs)
+        seconds = perf_counter() - before
+        count = len(items) if isinstance(result, slice) else len(result)
+        _emit(CONTAINS, count, seconds)
+        return result
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _wrap_hash(func):
+    # Wrap TimeRange.__hash__ to time the computations, not cached lookups.
+    def wrapper(self):
+        if self._hash is not None:
+            return self._hash
+        before = perf_counter()
+        result = func(self)
+        _emit(HASH, 1, perf_counter() - before)
+        return result
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+# The attributes that are wrapped while instrumentation is enabled. The
+# modules that refer to _make are patched, as it bypasses __init__. The module
+# trange.trange is shadowed by the trange function in the package namespace.
+_PATCHES = (
+    (ForwardTimeRange, '__init__', _timed(CONSTRUCT)),
+    (BackwardTimeRange, '__init__', _timed(CONSTRUCT)),
+    (sys.modules['trange.trange'], '_make', _timed(CONSTRUCT)),
+    (columnar, '_make', _timed(CONSTRUCT)),
+    (windows, '_make', _timed(CONSTRUCT)),
+    (ForwardTimeRange, 'contains', _timed(CONTAINS)),
+    (BackwardTimeRange, 'contains', _timed(CONTAINS)),
+    (TimeRange, 'contains_many', _wrap_contains_many),
+    (TimeRange, '__hash__', _wrap_hash),
+    (StepSequence, '__iter__', _wrap_steps),
+    (CalendarStepSequence, '__iter__', _wrap_steps),
+    (StepIterator, '__next__', _wrap_next),
+)
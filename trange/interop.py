@@ -0,0 +1,132 @@
+"""
+Contains adapters between ``trange`` and pandas. The adapters build pandas
+objects from packed 64-bit integer buffers and vice versa, without creating a
+Python object per element. pandas is imported only when an adapter is used
+(``pip install trange[pandas]``).
+"""
+from trange._epoch import EPOCH, INFINITE, MICROSECOND, from_micros
+from trange._optional import import_optional
+from trange.columnar import TimeRangeArray
+from trange.steps import StepSequence
+from trange.zones import ABSOLUTE, WALL, ZonedStepSequence, wall_offsets
+
+
+def to_datetimeindex(steps, name=None):
+    """
+    Return the steps of a finite ``StepSequence`` or ``ZonedStepSequence`` as
+    a ``pandas.DatetimeIndex``. The index is built from one vectorized
+    ``datetime64[us]`` array. Timezone aware steps give an index with the
+    same instants in the same timezone.
+    :param steps: a ``StepSequence`` or a ``ZonedStepSequence``.
+    :param name: the name of the index.
+    :return: a ``pandas.DatetimeIndex``.
+    """
+    pd = import_optional('pandas', 'pandas')
+    np = import_optional('numpy', 'pandas')
+    mode = WALL
+    tz = steps.first.tzinfo if isinstance(steps, StepSequence) else None
+    if isinstance(steps, ZonedStepSequence):
+        mode = steps.mode
+        tz = steps.tz
+        steps = steps.naive
+    if steps.length is None:
+        raise ValueError('An infinite %s cannot be converted to a '
+                         'DatetimeIndex.' % steps.__class__.__name__)
+    first = steps.first.replace(tzinfo=None)
+    values = StepSequence(first, steps.delta, steps.length).to_array()
+    if tz is None:
+        return pd.DatetimeIndex(values, name=name)
+    if mode == WALL and len(values):
+        # Convert the wall times to UTC with the offset table of tz.
+        years = values[[0, -1]].astype('datetime64[Y]').astype(int) + 1970
+        boundaries, offsets = wall_offsets(tz, int(years.min()),
+                                           int(years.max()))
+        boundaries = np.array(boundaries, dtype='datetime64[us]')
+        offsets = np.array(offsets, dtype='timedelta64[us]')
+        values = values - offsets[np.searchsorted(boundaries, values,
+                                                  side='right')]
+    index = pd.DatetimeIndex(values, name=name)
+    return index.tz_localize('UTC').tz_convert(tz)
+
+
+def to_interval_index(ranges, closed='both', name=None, tz=None):
+    """
+    Return the given finite ranges as a ``pandas.IntervalIndex`` of which
+    each interval spans the instants that a range covers, regardless of its
+    direction. The index is built from the columns of a ``TimeRangeArray``.
+    :param ranges: a ``TimeRangeArray`` or an iterable of ``TimeRange``
+    instances.
+    :param closed: which ends of the intervals are closed: 'both', 'left',
+    'right' or 'neither'. Both ends of a ``TimeRange`` are included with
+    ``in``.
+    :param name: the name of the index.
+    :param tz: the timezone of the index. By default, the index has the
+    timezone of the ranges (``TimeRangeArray.tz``) and is naive if they are
+    naive. The columns of a ``TimeRangeArray`` hold naive int64 microseconds
+    since the Unix epoch, which are in UTC if the ranges are aware.
+    :return: a ``pandas.IntervalIndex``.
+    """
+    pd = import_optional('pandas', 'pandas')
+    # NumPy is required for bounds to return arrays.
+    import_optional('numpy', 'pandas')
+    if not isinstance(ranges, TimeRangeArray):
+        ranges = TimeRangeArray.from_ranges(ranges)
+    tz = ranges.tz if tz is None else tz
+    if INFINITE in ranges.ends:
+        raise ValueError('An infinite TimeRange cannot be converted to an '
+                         'IntervalIndex.')
+    lower, upper = ranges.bounds()
+    left = pd.DatetimeIndex(lower.view('datetime64[us]'))
+    right = pd.DatetimeIndex(upper.view('datetime64[us]'))
+    if tz is not None:
+        left = left.tz_localize('UTC').tz_convert(tz)
+        right = right.tz_localize('UTC').tz_convert(tz)
+    return pd.IntervalIndex.from_arrays(left, right, closed=closed, name=name)
+
+
+def from_datetimeindex(index):
+    """
+    Return an evenly spaced ``pandas.DatetimeIndex`` as a lazy sequence of
+    steps: a ``StepSequence`` if the index is naive or a ``ZonedStepSequence``
+    that steps in elapsed time if it is timezone aware.
+    :param index: a ``pandas.DatetimeIndex`` with a fixed step size.
+    :return: a ``StepSequence`` or a ``ZonedStepSequence``.
+    """
+    pd = import_optional('pandas', 'pandas')
+    np = import_optional('numpy', 'pandas')
+    values = _micros(index)
+    if len(values) < 2:
+        if index.freq is None:
+            raise ValueError('The step size of an index with less than two '
+                             'values and no freq is unknown.')
+        delta = pd.Timedelta(index.freq).to_pytimedelta()
+    else:
+        deltas = np.diff(values)
+        if (deltas != deltas[0]).any():
+            raise ValueError('The index is not evenly spaced.')
+        delta = MICROSECOND * int(deltas[0])
+    first = from_micros(int(values[0])) if len(values) else EPOCH
+    steps = StepSequence(first, delta, len(values))
+    if index.tz is None:
+        return steps
+    return ZonedStepSequence(steps, index.tz, ABSOLUTE)
+
+
+def from_interval_index(index):
+    """
+    Return the intervals of a ``pandas.IntervalIndex`` as a
+    ``TimeRangeArray`` of forward ranges. Which ends of the intervals are
+    closed is not kept. Timezone aware intervals keep their timezone.
+    :param index: a ``pandas.IntervalIndex`` of datetimes.
+    :return: a ``TimeRangeArray``.
+    """
+    return TimeRangeArray(_micros(index.left), _micros(index.right),
+                          tz=index.left.tz)
+
+
+def _micros(index):
+    # Return the values of a DatetimeIndex as int64 microseconds since the
+    # epoch, in UTC if the index is timezone aware.
+    if hasattr(index, 'as_unit'):
+        return index.as_unit('us').asi8
+    return index.asi8 // 1000
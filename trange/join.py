@@ -0,0 +1,69 @@
+"""
+Contains the ``interval_join`` function that finds the overlapping pairs of
+two collections of ``TimeRange`` instances.
+"""
+from heapq import heappop, heappush, merge
+from itertools import count
+
+from trange._infinity import bounds, to_range
+from trange.columnar import TimeRangeArray
+
+
+def interval_join(left, right, *, assume_sorted=False, intersection=False):
+    """
+    Return a generator of all pairs of a range in ``left`` and a range in
+    ``right`` that share at least one instant, with all ends included.
+
+    Both inputs are swept once in chronological order of the earliest instant
+    of their ranges (which is ``start`` for a ``ForwardTimeRange``), so the
+    memory in use is bounded by the number of ranges that are active at the
+    same time. Inputs that are already in that order can be streamed without
+    being sorted by passing ``assume_sorted=True``.
+
+    A ``TimeRangeArray`` is sorted on its columns and boxed lazily.
+    :param left: an iterable of ``TimeRange`` instances or a
+    ``TimeRangeArray``.
+    :param right: an iterable of ``TimeRange`` instances or a
+    ``TimeRangeArray``.
+    :param assume_sorted: determines whether both inputs are already sorted
+    by their earliest instant.
+    :param intersection: determines whether the intersection of each pair is
+    yielded as third element.
+    :return: a generator of tuples of (left range, right range) or (left
+    range, right range, intersection).
+    """
+    sequence = count()
+    events = merge(_events(left, 0, sequence, assume_sorted),
+                   _events(right, 1, sequence, assume_sorted))
+    active = ([], [])
+    for lower, side, number, upper, time_range in events:
+        # Ranges that end before lower cannot overlap anything that follows.
+        for heap in active:
+            while heap and heap[0][0] < lower:
+                heappop(heap)
+        for other_upper, _, _, other_range in active[1 - side]:
+            pair = ((time_range, other_range) if side == 0
+                    else (other_range, time_range))
+            if intersection:
+                yield pair + (to_range(lower, min(upper, other_upper)),)
+            else:
+                yield pair
+        heappush(active[side], (upper, number, lower, time_range))
+
+
+def _events(ranges, side, sequence, assume_sorted):
+    # Yield a sortable tuple for each range in chronological order.
+    if isinstance(ranges, TimeRangeArray):
+        if not assume_sorted:
+            ranges = ranges.sorted()
+        assume_sorted = True
+    if not assume_sorted:
+        ranges = sorted(ranges, key=bounds)
+    previous = None
+    for time_range in ranges:
+        lower, upper = bounds(time_range)
+        if previous is not None and lower < previous:
+            raise ValueError('The ranges are not sorted by their earliest '
+                             'instant: %r' % (time_range,))
+        previous = lower
+        yield lower, side, next(sequence), upper, time_range
@@ -0,0 +1,38 @@
+"""
+Contains the ``map_split`` function that maps a function over the chunks of
+a ``TimeRange`` on a thread or process pool.
+"""
+from os import cpu_count
+
+
+def map_split(func, time_range, n=None, *, chunk=None, executor=None,
+              processes=False, max_workers=None, **steps_kwargs):
+    """
+    Split ``time_range`` with ``TimeRange.split`` and return a generator
+    that yields ``func(chunk)`` for each chunk, in stepping order. The calls
+    are made concurrently on ``executor`` or, if it is omitted, on a new
+    thread or process pool that is shut down when the generator is exhausted
+    or closed.
+    :param func: a function that takes a ``TimeRange``. It must be picklable
+    for a process pool.
+    :param time_range: the ``TimeRange`` to split.
+    :param n: See ``TimeRange.split``. It defaults to the number of workers.
+    :param chunk: See ``TimeRange.split``.
+    :param executor: an optional ``concurrent.futures.Executor``.
+    :param processes: determines whether a new pool is a process pool
+    (``True``) or a thread pool (``False``).
+    :param max_workers: the number of workers of a new pool.
+    :param steps_kwargs: See ``TimeRange.split``.
+    :return: a generator of the results of ``func``.
+    """
+    if n is None and chunk is None:
+        n = max_workers or cpu_count() or 1
+    chunks = time_range.split(n, chunk=chunk, **steps_kwargs)
+    if executor is not None:
+        yield from executor.map(func, chunks)
+        return
+    # Imported here, as concurrent.futures is slow to import.
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_cls(max_workers) as pool:
+        yield from pool.map(func, chunks)
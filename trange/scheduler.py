@@ -0,0 +1,162 @@
+"""
+Contains the asyncio counterparts of ``TimeRange.steps``: the ``asteps``
+async generator that waits for the wall-clock instant of each step and the
+``StepScheduler`` that multiplexes many step streams on one event loop.
+"""
+import asyncio
+from datetime import datetime
+from heapq import heappop, heappush
+from inspect import isawaitable
+from itertools import count
+
+from trange.trange import TimeRange
+
+
+class SystemClock:
+    """
+    The default clock that is used by ``asteps`` and ``StepScheduler``. A
+    clock has a ``now`` method that returns the current ``datetime`` and an
+    async ``sleep`` method. Another clock can be injected, e.g. a fake clock
+    for testing.
+    """
+    def now(self, tz=None):
+        """
+        Return the current ``datetime``.
+        :param tz: the ``tzinfo`` of the steps that are waited for, ``None``
+        for naive local time.
+        :return: a ``datetime``.
+        """
+        return datetime.now(tz)
+
+    async def sleep(self, seconds):
+        """
+        Sleep for the given number of seconds.
+        :param seconds: the number of seconds as ``float``.
+        """
+        await asyncio.sleep(seconds)
+
+
+async def asteps(steps, clock=None):
+    """
+    Yield each ``datetime`` of ``steps`` as soon as the clock reaches it.
+    Every step is awaited at its own absolute instant, so delays of the event
+    loop or of the consumer do not accumulate. Steps that are already due are
+    yielded immediately.
+    :param steps: an iterable of ``datetime`` instances, e.g. a
+    ``StepSequence``.
+    :param clock: an optional clock, see ``SystemClock``.
+    :return: an async generator of ``datetime`` instances.
+    """
+    clock = clock or SystemClock()
+    for step in steps:
+        await _sleep_until(clock, step)
+        yield step
+
+
+class StepScheduler:
+    """
+    A scheduler that runs many step streams on one asyncio event loop. Each
+    stream has a callback that is called with each step when the clock
+    reaches it. The next step of every stream is kept on one timer heap, so
+    only a single sleep is pending at any time.
+
+    Callbacks are called one at a time in chronological order of their steps;
+    awaitable results are awaited before the next step is handled.
+    """
+    def __init__(self, clock=None):
+        """
+        Constructor.
+        :param clock: an optional clock, see ``SystemClock``.
+        """
+        self._clock = clock or SystemClock()
+        self._heap = []
+        self._streams = {}
+        self._counter = count()
+        self._wakeup = None
+
+    def add(self, steps, callback, **steps_kwargs):
+        """
+        Add a step stream to this scheduler. It may be running already.
+        :param steps: a ``TimeRange`` or an iterable of ``datetime`` instances.
+        :param callback: a function that is called with each step. It may
+        return an awaitable.
+        :param steps_kwargs: the keyword arguments of ``TimeRange.steps``,
+        which are required if ``steps`` is a ``TimeRange``.
+        :return: a handle that can be passed to ``remove``.
+        """
+        if isinstance(steps, TimeRange):
+            if not steps_kwargs:
+                raise ValueError('A step size is required to add a TimeRange, '
+                                 'e.g. add(time_range, callback, minutes=1).')
+            steps = steps.steps(**steps_kwargs)
+        elif steps_kwargs:
+            raise ValueError('Step keyword arguments can only be given with '
+                             'a TimeRange.')
+        handle = next(self._counter)
+        self._streams[handle] = iter(steps), callback
+        self._schedule(handle)
+        return handle
+
+    def remove(self, handle):
+        """
+        Remove the step stream with the given handle from this scheduler.
+        :param handle: a handle as returned by ``add``.
+        """
+        del self._streams[handle]
+
+    def __len__(self):
+        """
+        Return the number of step streams in this scheduler.
+        :return: the length as ``int``.
+        """
+        return len(self._streams)
+
+    async def run(self):
+        """
+        Run this scheduler until all step streams are exhausted or removed.
+        """
+        self._wakeup = asyncio.Event()
+        while self._heap:
+            when, _, handle = self._heap[0]
+            if handle not in self._streams:
+                heappop(self._heap)
+                continue
+            delay = (when - self._clock.now(when.tzinfo)).total_seconds()
+            if delay > 0:
+                await self._wait(delay)
+                continue
+            heappop(self._heap)
+            result = self._streams[handle][1](when)
+            if isawaitable(result):
+                await result
+            if handle in self._streams:
+                self._schedule(handle)
+
+    def _schedule(self, handle):
+        # Push the next step of a stream onto the heap or drop the stream.
+        step = next(self._streams[handle][0], None)
+        if step is None:
+            del self._streams[handle]
+            return
+        heappush(self._heap, (step, next(self._counter), handle))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait(self, delay):
+        # Sleep for delay seconds or until a stream is added.
+        self._wakeup.clear()
+        sleeper = asyncio.ensure_future(self._clock.sleep(delay))
+        waker = asyncio.ensure_future(self._wakeup.wait())
+        _, pending = await asyncio.wait(
+            (sleeper, waker), return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+
+async def _sleep_until(clock, moment):
+    # Sleep until the clock has reached moment.
+    while True:
+        delay = (moment - clock.now(moment.tzinfo)).total_seconds()
+        if delay <= 0:
+            return
+        await clock.sleep(delay)
@@ -0,0 +1,284 @@
+"""
+Contains the ``TimeRangeSet`` class, a normalized union of disjoint time
+ranges that supports set algebra.
+"""
+from bisect import bisect_right
+from datetime import timedelta
+from heapq import merge
+
+from trange._infinity import FUTURE, PAST, bounds, to_range
+from trange.trange import ForwardTimeRange, TimeRange
+
+
+class TimeRangeSet:
+    """
+    An immutable set of instants in time that is kept as a sorted list of
+    disjoint ranges. Overlapping and adjacent ranges are coalesced.
+
+    Ranges are treated as half-open: a ``TimeRange`` covers the instants from
+    its chronologically earliest end up to, but not including, its latest end.
+    This makes the difference of two sets exact; ranges of zero length are
+    empty. ``BackwardTimeRange`` instances are normalized to the instants they
+    cover, infinite ranges extend to the infinite past or future.
+
+    Iterating over a ``TimeRangeSet`` yields ``ForwardTimeRange`` instances,
+    or a ``BackwardTimeRange`` without end for a range that extends to the
+    infinite past.
+
+    Union, intersection and difference take O(n + m) with a sweep over both
+    sorted sets. Creating a set from unsorted ranges takes O(n log n).
+    """
+    __slots__ = ('_lowers', '_uppers')
+
+    def __init__(self, ranges=()):
+        """
+        Constructor.
+        :param ranges: an iterable of ``TimeRange`` instances.
+        """
+        self._lowers = []
+        self._uppers = []
+        self._extend(sorted(bounds(time_range) for time_range in ranges))
+
+    def union(self, *others):
+        """
+        Return a new ``TimeRangeSet`` with the instants that are in this set
+        or in any of the ``others``.
+        :param others: ``TimeRangeSet`` instances or iterables of
+        ``TimeRange`` instances.
+        :return: a ``TimeRangeSet``.
+        """
+        result = self
+        for other in others:
+            result = result._union(_as_set(other))
+        return result
+
+    def intersection(self, *others):
+        """
+        Return a new ``TimeRangeSet`` with the instants that are in this set
+        and in all of the ``others``.
+        :param others: ``TimeRangeSet`` instances or iterables of
+        ``TimeRange`` instances.
+        :return: a ``TimeRangeSet``.
+        """
+        result = self
+        for other in others:
+            result = result._intersection(_as_set(other))
+        return result
+
+    def difference(self, *others):
+        """
+        Return a new ``TimeRangeSet`` with the instants that are in this set
+        but not in any of the ``others``.
+        :param others: ``TimeRangeSet`` instances or iterables of
+        ``TimeRange`` instances.
+        :return: a ``TimeRangeSet``.
+        """
+        result = self
+        for other in others:
+            result = result._difference(_as_set(other))
+        return result
+
+    def complement(self, within=None):
+        """
+        Return a new ``TimeRangeSet`` with the instants that are not in this
+        set. If ``within`` is given, the result is limited to the instants of
+        ``within``.
+        :param within: an optional ``TimeRange`` or ``TimeRangeSet`` that
+        bounds the complement.
+        :return: a ``TimeRangeSet``.
+        """
+        everything = self._from_bounds([(PAST, FUTURE)])
+        if within is not None:
+            everything = _as_set(within)
+        return everything._difference(self)
+
+    def gaps(self):
+        """
+        Return the gaps between the ranges of this set as ``TimeRange``
+        instances in chronological order.
+        :return: a ``list`` of ``ForwardTimeRange`` instances.
+        """
+        return [ForwardTimeRange(upper, lower) for upper, lower
+                in zip(self._uppers, self._lowers[1:])]
+
+    @property
+    def duration(self):
+        """
+        Return the total ``timedelta`` that is covered by this set or ``None``
+        if it is infinite.
+        :return: a ``timedelta`` or ``None``.
+        """
+        if self._lowers and (self._lowers[0] is PAST
+                             or self._uppers[-1] is FUTURE):
+            return None
+        return sum((upper - lower for lower, upper
+                    in zip(self._lowers, self._uppers)), timedelta(0))
+
+    def __contains__(self, item):
+        """
+        Return whether ``item`` is in this set. The parameter ``item`` can be
+        of type ``datetime`` or ``TimeRange``. A ``TimeRange`` is in this set
+        if all the instants that it covers are.
+        :param item: a ``datetime`` or ``TimeRange``.
+        :return: ``True`` if ``item`` is in self.
+        """
+        if isinstance(item, TimeRange):
+            lower, upper = bounds(item)
+            if lower == upper:
+                return True
+            index = bisect_right(self._lowers, lower) - 1
+            return index >= 0 and upper <= self._uppers[index]
+        index = bisect_right(self._lowers, item) - 1
+        return index >= 0 and item < self._uppers[index]
+
+    def __iter__(self):
+        """
+        Return an iterator over the disjoint ranges of this set in
+        chronological order.
+        :return: an iterator of ``TimeRange`` instances.
+        """
+        for lower, upper in zip(self._lowers, self._uppers):
+            yield to_range(lower, upper)
+
+    def __len__(self):
+        """
+        Return the number of disjoint ranges in this set.
+        :return: the length as ``int``.
+        """
+        return len(self._lowers)
+
+    def __bool__(self):
+        """
+        Return whether this set holds any instants.
+        :return: ``True`` if this set is not empty.
+        """
+        return bool(self._lowers)
+
+    def __eq__(self, other):
+        """
+        Return whether ``self == other``, which is the case if both sets hold
+        the same instants.
+        :param other: the right operand.
+        :return: ``True`` in case of equality.
+        """
+        if not isinstance(other, TimeRangeSet):
+            return NotImplemented
+        return self._lowers == other._lowers and self._uppers == other._uppers
+
+    def __hash__(self):
+        """
+        Return a hashcode for this instance that is consistent with
+        ``__eq__``.
+        :return: a hashcode as ``int``.
+        """
+        return hash((tuple(self._lowers), tuple(self._uppers)))
+
+    def __or__(self, other):
+        """
+        See ``TimeRangeSet.union``.
+        :param other: the right operand.
+        :return: a ``TimeRangeSet``.
+        """
+        return self.union(other)
+
+    def __and__(self, other):
+        """
+        See ``TimeRangeSet.intersection``.
+        :param other: the right operand.
+        :return: a ``TimeRangeSet``.
+        """
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        """
+        See ``TimeRangeSet.difference``.
+        :param other: the right operand.
+        :return: a ``TimeRangeSet``.
+        """
+        return self.difference(other)
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(%r)' % (self.__class__.__name__, list(self))
+
+    @classmethod
+    def _from_bounds(cls, pairs):
+        # Create an instance from (lower, upper) pairs sorted by lower.
+        result = cls.__new__(cls)
+        result._lowers = []
+        result._uppers = []
+        result._extend(pairs)
+        return result
+
+    def _extend(self, pairs):
+        # Append (lower, upper) pairs that are sorted by lower and that do not
+        # precede the pairs in this set, coalescing where they touch.
+        lowers = self._lowers
+        uppers = self._uppers
+        for lower, upper in pairs:
+            if not lower < upper:
+                continue
+            if uppers and lower <= uppers[-1]:
+                if upper > uppers[-1]:
+                    uppers[-1] = upper
+            else:
+                lowers.append(lower)
+                uppers.append(upper)
+
+    def _pairs(self):
+        # Return the (lower, upper) pairs of this set.
+        return zip(self._lowers, self._uppers)
+
+    def _union(self, other):
+        # The union of two instances by merging their sorted bounds.
+        return self._from_bounds(merge(self._pairs(), other._pairs()))
+
+    def _intersection(self, other):
+        # The intersection of two instances by sweeping over both.
+        result = []
+        pairs1, pairs2 = list(self._pairs()), list(other._pairs())
+        i = j = 0
+        while i < len(pairs1) and j < len(pairs2):
+            lower1, upper1 = pairs1[i]
+            lower2, upper2 = pairs2[j]
+            lower = max(lower1, lower2)
+            upper = min(upper1, upper2)
+            if lower < upper:
+                result.append((lower, upper))
+            if upper1 < upper2:
+                i += 1
+            else:
+                j += 1
+        return self._from_bounds(result)
+
+    def _difference(self, other):
+        # The difference of two instances by sweeping over both.
+        result = []
+        pairs2 = list(other._pairs())
+        j = 0
+        for lower, upper in self._pairs():
+            while j < len(pairs2) and pairs2[j][1] <= lower:
+                j += 1
+            k = j
+            while k < len(pairs2) and pairs2[k][0] < upper:
+                lower2, upper2 = pairs2[k]
+                if lower < lower2:
+                    result.append((lower, lower2))
+                lower = max(lower, upper2)
+                k += 1
+            if lower < upper:
+                result.append((lower, upper))
+        return self._from_bounds(result)
+
+
+def _as_set(ranges):
+    # Return ranges as a TimeRangeSet.
+    if isinstance(ranges, TimeRangeSet):
+        return ranges
+    if isinstance(ranges, TimeRange):
+        ranges = [ranges]
+    return TimeRangeSet(ranges)
+
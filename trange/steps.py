@@ -0,0 +1,543 @@
+"""
+Contains the ``StepSequence`` class, the lazy sequence of ``datetime``
+instances that is returned by ``TimeRange.steps``.
+"""
+from collections import namedtuple
+from collections.abc import Iterator, Sequence
+from datetime import timedelta
+from operator import index as _index
+
+from trange._optional import import_optional
+
+
+_ZERO = timedelta(0)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class StepSequence(Sequence):
+    """
+    A lazy and immutable sequence of ``datetime`` instances that lie ``delta``
+    apart, starting at ``first``. Much like the builtin ``range``, the length,
+    the items, slices and the membership of a ``StepSequence`` are computed
+    arithmetically instead of by iterating.
+
+    A ``StepSequence`` of which ``length`` is ``None`` is infinite. Infinite
+    sequences can be iterated, indexed and sliced with non-negative indices,
+    but have no ``len()`` and cannot be reversed.
+    """
+    __slots__ = ('_first', '_delta', '_length')
+
+    def __init__(self, first, delta, length=None):
+        """
+        Constructor.
+        :param first: the first ``datetime`` of the sequence.
+        :param delta: a ``timedelta`` that defines the step size. It can be
+        negative, but not zero.
+        :param length: the number of steps or ``None`` if the sequence is
+        infinite.
+        """
+        if not isinstance(delta, timedelta):
+            raise TypeError("argument 'delta' must be an instance of "
+                            "datetime.timedelta, not %s"
+                            % type(delta).__name__)
+        if not delta:
+            raise ValueError('The step size must not be zero.')
+        if length is not None and length < 0:
+            raise ValueError('The length must not be negative.')
+        self._first = first
+        self._delta = delta
+        self._length = length
+
+    @classmethod
+    def spanning(cls, start, end, delta, include_start=True,
+                 include_end=True):
+        """
+        Return a ``StepSequence`` that steps from ``start`` towards ``end``
+        with steps of ``delta``. The result is equal to what repeatedly adding
+        ``delta`` to ``start`` would produce until ``end`` is passed.
+        :param start: the ``datetime`` to start stepping from.
+        :param end: the ``datetime`` to stop at or ``None`` to step infinitely.
+        :param delta: the ``timedelta`` step size.
+        :param include_start: determines whether ``start`` is included.
+        :param include_end: determines whether ``end`` is included if it is
+        hit exactly.
+        :return: a ``StepSequence``.
+        """
+        if not delta:
+            raise ValueError('The step size must not be zero.')
+        first = start if include_start else start + delta
+        if end is None:
+            return cls(first, delta)
+        count = _count_steps(end - start, delta, include_end)
+        if not include_start:
+            count = max(count - 1, 0)
+        return cls(first, delta, count)
+
+    @property
+    def first(self):
+        """
+        Return the first ``datetime`` of this sequence, even if the sequence
+        is empty.
+        :return: the first ``datetime``.
+        """
+        return self._first
+
+    @property
+    def delta(self):
+        """
+        Return the ``timedelta`` between two subsequent steps.
+        :return: the step size.
+        """
+        return self._delta
+
+    @property
+    def length(self):
+        """
+        Return the number of steps in this sequence or ``None`` if it is
+        infinite.
+        :return: the length as ``int`` or ``None``.
+        """
+        return self._length
+
+    @property
+    def last(self):
+        """
+        Return the last ``datetime`` of this sequence.
+        :return: the last ``datetime``.
+        """
+        if self._length is None:
+            raise ValueError('An infinite StepSequence has no last step.')
+        if not self._length:
+            raise IndexError('An empty StepSequence has no last step.')
+        return self._first + self._delta * (self._length - 1)
+
+    def to_array(self, limit=None):
+        """
+        Return the steps of this sequence as a NumPy ``datetime64[us]`` array
+        that is built in one vectorized operation. This requires NumPy to be
+        installed.
+        :param limit: the maximum number of steps in the array. It is required
+        if this sequence is infinite.
+        :return: a ``numpy.ndarray`` of ``datetime64[us]``.
+        """
+        np = import_optional('numpy', 'numpy')
+        length = self._length
+        if length is None:
+            if limit is None:
+                raise ValueError('An infinite %s requires a limit to be '
+                                 'converted to an array.'
+                                 % self.__class__.__name__)
+            length = limit
+        elif limit is not None:
+            length = min(length, limit)
+        if self._first.tzinfo is not None:
+            raise ValueError('Timezone aware steps cannot be converted to a '
+                             'datetime64 array.')
+        first = np.datetime64(self._first, 'us')
+        delta = np.timedelta64(self._delta // _MICROSECOND, 'us')
+        return first + np.arange(max(length, 0), dtype=np.int64) * delta
+
+    def to_datetimeindex(self, name=None):
+        """
+        Return the steps of this sequence as a ``pandas.DatetimeIndex``. This
+        requires pandas to be installed (``pip install trange[pandas]``).
+
+        See ``trange.interop.to_datetimeindex``.
+        :param name: the name of the index.
+        :return: a ``pandas.DatetimeIndex``.
+        """
+        # Imported here, as the interop module depends on this one.
+        from trange.interop import to_datetimeindex
+        return to_datetimeindex(self, name)
+
+    def iterator(self, index=0):
+        """
+        Return a ``StepIterator`` over this sequence that starts at ``index``
+        in O(1). Unlike the iterator that ``iter()`` returns, it exposes its
+        position as a compact ``state`` from which it can be restored and it
+        can be pickled.
+        :param index: the index of the first step to yield.
+        :return: a ``StepIterator``.
+        """
+        return StepIterator(self, index)
+
+    def floor_index(self, value):
+        """
+        Return the index of the last step that is not beyond ``value`` in the
+        stepping direction. If ``value`` lies beyond the last step, that is
+        the last step.
+        :param value: a ``datetime``.
+        :return: the index as ``int`` or ``None`` if there is no such step.
+        """
+        index = (value - self._first) // self._delta
+        if index < 0 or self._length == 0:
+            return None
+        if self._length is not None and index >= self._length:
+            return self._length - 1
+        return index
+
+    def ceil_index(self, value):
+        """
+        Return the index of the first step that is not before ``value`` in the
+        stepping direction. If ``value`` lies before the first step, that is
+        the first step.
+        :param value: a ``datetime``.
+        :return: the index as ``int`` or ``None`` if there is no such step.
+        """
+        index = max(-((self._first - value) // self._delta), 0)
+        if self._length is not None and index >= self._length:
+            return None
+        return index
+
+    def nearest_index(self, value):
+        """
+        Return the index of the step that is nearest to ``value``. In case of a
+        tie, the earlier step in the stepping direction wins.
+        :param value: a ``datetime``.
+        :return: the index as ``int`` or ``None`` if this sequence is empty.
+        """
+        floor = self.floor_index(value)
+        ceil = self.ceil_index(value)
+        if floor is None or ceil is None:
+            return ceil if floor is None else floor
+        floor_distance = abs(value - self[floor])
+        ceil_distance = abs(self[ceil] - value)
+        return floor if floor_distance <= ceil_distance else ceil
+
+    def floor(self, value):
+        """
+        Return the step at ``floor_index(value)``.
+        :param value: a ``datetime``.
+        :return: a ``datetime`` or ``None``.
+        """
+        return self._step_or_none(self.floor_index(value))
+
+    def ceil(self, value):
+        """
+        Return the step at ``ceil_index(value)``.
+        :param value: a ``datetime``.
+        :return: a ``datetime`` or ``None``.
+        """
+        return self._step_or_none(self.ceil_index(value))
+
+    def nearest(self, value):
+        """
+        Return the step at ``nearest_index(value)``.
+        :param value: a ``datetime``.
+        :return: a ``datetime`` or ``None``.
+        """
+        return self._step_or_none(self.nearest_index(value))
+
+    def indices(self, values, how='floor'):
+        """
+        Return the index of the floor, ceil or nearest step of each value in
+        one vectorized operation, consistent with ``floor_index``,
+        ``ceil_index`` and ``nearest_index``. Missing steps are -1. This
+        requires NumPy to be installed.
+        :param values: a NumPy ``datetime64`` array or an iterable of
+        ``datetime`` instances.
+        :param how: one of 'floor', 'ceil' or 'nearest'.
+        :return: a ``numpy.ndarray`` of ``int64``.
+        """
+        np = import_optional('numpy', 'numpy')
+        if how not in ('floor', 'ceil', 'nearest'):
+            raise ValueError("argument 'how' must be one of 'floor', 'ceil' or "
+                             "'nearest', not %r" % (how,))
+        values = np.asarray(values, dtype='datetime64[us]')
+        first = np.datetime64(self._first, 'us')
+        delta = self._delta // _MICROSECOND
+        offsets = (values - first).astype(np.int64)
+        length = self._length
+        floor = offsets // delta
+        ceil = np.maximum(-(-offsets // delta), 0)
+        if length is not None:
+            floor = np.minimum(floor, length - 1)
+            ceil = np.where(ceil >= length, -1, ceil)
+        floor = np.where(floor < 0, -1, floor)
+        if how == 'floor':
+            return floor
+        if how == 'ceil':
+            return ceil
+        floor_distance = np.abs(offsets - floor * delta)
+        ceil_distance = np.abs(ceil * delta - offsets)
+        return np.where((floor >= 0) & ((ceil < 0)
+                                        | (floor_distance <= ceil_distance)),
+                        floor, ceil)
+
+    def index(self, value, start=0, stop=None):
+        """
+        Return the index of ``value`` in this sequence.
+        :param value: the ``datetime`` to look up.
+        :param start: the index to start searching at.
+        :param stop: the index to stop searching at.
+        :return: the index as ``int``.
+        """
+        index = self._offset(value)
+        if index is not None:
+            if self._length is None:
+                bounds = range(start, index + 1 if stop is None else stop)
+            else:
+                bounds = range(self._length)[start:stop]
+            if index in bounds:
+                return index
+        raise ValueError('%r is not in %s' % (value, self.__class__.__name__))
+
+    def count(self, value):
+        """
+        Return the number of occurrences of ``value`` in this sequence.
+        :param value: the ``datetime`` to count.
+        :return: 0 or 1.
+        """
+        return int(value in self)
+
+    def __len__(self):
+        """
+        Return the number of steps in this sequence.
+        :return: the length as ``int``.
+        """
+        if self._length is None:
+            raise TypeError('An infinite %s has no len().'
+                            % self.__class__.__name__)
+        return self._length
+
+    def __bool__(self):
+        """
+        Return whether this sequence holds any steps.
+        :return: ``True`` if this sequence is not empty.
+        """
+        return self._length != 0
+
+    def __getitem__(self, item):
+        """
+        Return the step at index ``item`` or a ``StepSequence`` if ``item`` is
+        a ``slice``.
+        :param item: an ``int`` or a ``slice``.
+        :return: a ``datetime`` or a ``StepSequence``.
+        """
+        if isinstance(item, slice):
+            return self._slice(item)
+        index = _index(item)
+        if index < 0:
+            if self._length is None:
+                raise IndexError('An infinite %s does not support negative '
+                                 'indices.' % self.__class__.__name__)
+            index += self._length
+        if index < 0 or (self._length is not None and index >= self._length):
+            raise IndexError('%s index out of range'
+                             % self.__class__.__name__)
+        return self._first + self._delta * index
+
+    def __iter__(self):
+        """
+        Return an iterator over the steps in this sequence.
+        :return: an iterator of ``datetime`` instances.
+        """
+        if self._length == 0:
+            return
+        current = self._first
+        delta = self._delta
+        yield current
+        if self._length is None:
+            while True:
+                current += delta
+                yield current
+        for _ in range(self._length - 1):
+            current += delta
+            yield current
+
+    def __reversed__(self):
+        """
+        Return an iterator over the steps in this sequence in reversed order.
+        :return: an iterator of ``datetime`` instances.
+        """
+        if self._length is None:
+            raise TypeError('An infinite %s cannot be reversed.'
+                            % self.__class__.__name__)
+        return iter(self[::-1])
+
+    def __contains__(self, item):
+        """
+        Return whether ``item`` is one of the steps in this sequence.
+        :param item: any object.
+        :return: ``True`` if ``item`` is in self.
+        """
+        return self._offset(item) is not None
+
+    def __eq__(self, other):
+        """
+        Return whether ``self == other``, which is the case if both sequences
+        yield the same steps.
+        :param other: the right operand.
+        :return: ``True`` in case of equality.
+        """
+        if not isinstance(other, StepSequence):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        """
+        Return a hashcode for this instance that is consistent with
+        ``__eq__``.
+        :return: a hashcode as ``int``.
+        """
+        return hash(self._key())
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(%r, %r, %r)' % (self.__class__.__name__, self._first,
+                                   self._delta, self._length)
+
+    def _key(self):
+        # Return a tuple that identifies the steps of this sequence.
+        if self._length == 0:
+            return 0,
+        if self._length == 1:
+            return 1, self._first
+        return self._length, self._first, self._delta
+
+    def _step_or_none(self, index):
+        # Return the step at index or None if index is None.
+        return None if index is None else self._first + self._delta * index
+
+    def _offset(self, item):
+        # Return the index of item in this sequence or None.
+        try:
+            diff = item - self._first
+        except TypeError:
+            return None
+        if not isinstance(diff, timedelta):
+            return None
+        index, remainder = divmod(diff, self._delta)
+        if (remainder or index < 0
+                or (self._length is not None and index >= self._length)):
+            return None
+        return index
+
+    def _slice(self, slc):
+        # Return a StepSequence that holds the steps that are selected by slc.
+        if self._length is not None:
+            indices = range(self._length)[slc]
+        else:
+            step = 1 if slc.step is None else _index(slc.step)
+            start = 0 if slc.start is None else _index(slc.start)
+            stop = None if slc.stop is None else _index(slc.stop)
+            if step <= 0 or start < 0 or (stop is not None and stop < 0):
+                raise ValueError('An infinite %s can only be sliced with '
+                                 'non-negative indices and steps.'
+                                 % self.__class__.__name__)
+            if stop is None:
+                return self.__class__(self._first + self._delta * start,
+                                      self._delta * step)
+            indices = range(start, stop, step)
+        if not indices:
+            return self.__class__(self._first, self._delta * indices.step, 0)
+        return self.__class__(self._first + self._delta * indices.start,
+                              self._delta * indices.step, len(indices))
+
+
+StepState = namedtuple('StepState', ('first', 'delta', 'length', 'index'))
+StepState.__doc__ = """
+The state of a ``StepIterator``: the ``first`` step, the ``delta`` between
+steps and the ``length`` of the ``StepSequence`` it iterates over (which
+reflect the inclusivity of ``start`` and ``end``) and the ``index`` of the
+next step to yield.
+"""
+
+
+class StepIterator(Iterator):
+    """
+    An iterator over a ``StepSequence`` that can be checkpointed. Its
+    ``state`` holds the position of the iterator and ``from_state`` restores
+    an iterator from such state in O(1), without yielding any of the steps
+    before it. A ``StepIterator`` can be pickled as well.
+    """
+    __slots__ = ('_first', '_delta', '_length', '_index', '_current')
+
+    def __init__(self, sequence, index=0):
+        """
+        Constructor.
+        :param sequence: the ``StepSequence`` to iterate over.
+        :param index: the index of the first step to yield.
+        """
+        if index < 0:
+            raise ValueError('The index must not be negative.')
+        self._first = sequence.first
+        self._delta = sequence.delta
+        self._length = sequence.length
+        if self._length is not None:
+            index = min(index, self._length)
+        self._index = index
+        self._current = None
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Return a ``StepIterator`` that continues from the given state.
+        :param state: a ``StepState`` or an equivalent tuple.
+        :return: a ``StepIterator``.
+        """
+        first, delta, length, index = state
+        return cls(StepSequence(first, delta, length), index)
+
+    @property
+    def state(self):
+        """
+        Return the current state of this iterator.
+        :return: a ``StepState``.
+        """
+        return StepState(self._first, self._delta, self._length, self._index)
+
+    def __next__(self):
+        """
+        Return the next step.
+        :return: a ``datetime``.
+        """
+        index = self._index
+        if index == self._length:
+            raise StopIteration
+        current = self._current
+        if current is None:
+            current = self._first + self._delta * index
+        else:
+            current += self._delta
+        self._current = current
+        self._index = index + 1
+        return current
+
+    def __length_hint__(self):
+        """
+        Return the number of remaining steps if this iterator is finite.
+        :return: the number of remaining steps as ``int``.
+        """
+        if self._length is None:
+            return NotImplemented
+        return max(self._length - self._index, 0)
+
+    def __reduce__(self):
+        """
+        Return the information that is required to pickle this instance.
+        :return: a tuple of a callable and its arguments.
+        """
+        return self.__class__.from_state, (tuple(self.state),)
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s.from_state(%r)' % (self.__class__.__name__,
+                                      tuple(self.state))
+
+
+def _count_steps(span, delta, include_end):
+    # Return the number of non-negative multiples of delta that lie within
+    # span, starting from zero and stopping at the first multiple outside.
+    if (delta > _ZERO) != (span >= _ZERO):
+        # Stepping away from the end: only the start can be hit.
+        return int(include_end or span != _ZERO)
+    if not include_end:
+        span -= _MICROSECOND if delta > _ZERO else -_MICROSECOND
+    return max(span // delta + 1, 0)
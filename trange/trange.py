@@ -3,8 +3,14 @@ Contains the ``TimeRange``, ``ForwardTimeRange`` and ``BackwardTimeRange``
 classes and the ``trange`` function that can be used to created instances of
 these classes.
 """
-from abc import ABC, abstractmethod
+import sys
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
+from operator import ge, gt, le, lt
+
+from trange import buckets, calendars, zones
+from trange.steps import StepSequence
 
 
 def trange(start=None, end=None):
@@ -84,7 +90,7 @@ def trange(start=None, end=None):
     return cls(start_, end_)
 
 
-class TimeRange(ABC):
+class TimeRange(metaclass=ABCMeta):
     """
     An abstract class that defines a range of time. A ``TimeRange`` can have
     two ends or only one end. In the latter case, the instance ranges to
@@ -92,23 +98,95 @@ class TimeRange(ABC):
 
     A ``TimeRange`` always has a concrete ``start``. The direction of stepping
     through a ``TimeRange`` is always from ``start`` to ``end``.
+
+    A ``TimeRange`` is immutable and has no ``__dict__``, which keeps it small
+    and makes it safe to use as a key in sets and dicts.
     """
+    # The metaclass is used over ABC, as ABC has no __slots__ before Python
+    # 3.7, which would give every instance a __dict__.
+    __slots__ = ('_start', '_end', '_hash')
+
     def __init__(self, start, end=None):
         """
         Constructor.
         :param start: a datetime that marks the start of the range.
         :param end: an optional datetime that marks the end of the range.
         """
-        self._start = start
-        self._end = end
-        self._hash = None
+        _set_start(self, start)
+        _set_end(self, end)
+        _set_hash(self, None)
+
+    @staticmethod
+    def from_pairs(pairs, trusted=False, tz=None):
+        """
+        Return a ``list`` of ``TimeRange`` instances for the given pairs of
+        ``start`` and ``end``, much faster than calling ``trange`` for each
+        pair. Like with ``trange``, a ``ForwardTimeRange`` or a
+        ``BackwardTimeRange`` is created for each pair, depending on the order
+        of its ``start`` and ``end``. An ``end`` of ``None`` gives an infinite
+        ``ForwardTimeRange``, a ``start`` of ``None`` gives an infinite
+        ``BackwardTimeRange``.
+
+        The values can be ``datetime`` instances or numbers of seconds since
+        the Unix epoch. All values are type checked, unless ``trusted`` is
+        ``True``; the ranges themselves are never validated again.
+        :param pairs: an iterable of (start, end) tuples.
+        :param trusted: determines whether the type checks are skipped.
+        :param tz: the ``tzinfo`` for numeric values. If it is ``None``,
+        numbers are converted to naive datetimes in UTC.
+        :return: a ``list`` of ``TimeRange`` instances.
+        """
+        result = []
+        append = result.append
+        for start, end in pairs:
+            if start is None:
+                append(_make(BackwardTimeRange,
+                             _to_datetime('end', end, tz, trusted), None))
+                continue
+            start = _to_datetime('start', start, tz, trusted)
+            if end is None:
+                append(_make(ForwardTimeRange, start, None))
+                continue
+            end = _to_datetime('end', end, tz, trusted)
+            append(_make(ForwardTimeRange if start <= end
+                         else BackwardTimeRange, start, end))
+        return result
+
+    @staticmethod
+    def from_timestamps(starts, ends=None, trusted=False, tz=None):
+        """
+        Return a ``list`` of ``TimeRange`` instances for the given columns of
+        starts and ends. NumPy arrays are accepted as well; ``datetime64``
+        arrays of any unit are converted to microseconds first, as are numeric
+        arrays if ``tz`` is ``None``, which avoids converting every number in
+        Python.
+
+        See ``TimeRange.from_pairs``.
+        :param starts: an iterable of ``datetime`` instances or numbers of
+        seconds since the Unix epoch.
+        :param ends: an iterable of the same length as ``starts``. If it is
+        ``None``, all ranges are infinite.
+        :param trusted: See ``TimeRange.from_pairs``.
+        :param tz: See ``TimeRange.from_pairs``.
+        :return: a ``list`` of ``TimeRange`` instances.
+        """
+        starts = _to_list(starts, tz)
+        if ends is None:
+            return TimeRange.from_pairs(((start, None) for start in starts),
+                                        trusted, tz)
+        ends = _to_list(ends, tz)
+        if (hasattr(starts, '__len__') and hasattr(ends, '__len__')
+                and len(starts) != len(ends)):
+            raise ValueError('The number of starts and ends must be equal.')
+        return TimeRange.from_pairs(zip(starts, ends), trusted, tz)
 
     def steps(self, *, delta=None, weeks=0, days=0, hours=0, minutes=0,
               seconds=0, milliseconds=0, microseconds=0, include_start=True,
               include_end=True):
         """
-        Return a generator that allows you to iterate through steps of a given
-        size.
+        Return a ``StepSequence`` that allows you to iterate through steps of a
+        given size. The sequence is lazy: its ``len()``, items, slices and
+        membership are computed without iterating.
         :param delta: a ``timedelta`` instance that defines the step size.
         :param weeks: the number of weeks of the step size.
         :param days: the number of days of the step size.
@@ -121,7 +199,7 @@ class TimeRange(ABC):
         included in the iteration.
         :param include_end: determines whether the ``end`` datetime is included
         in the iteration.
-        :return: a generator.
+        :return: a ``StepSequence``.
         """
         if delta and not isinstance(delta, timedelta):
             raise TypeError("argument 'delta' must be an instance of "
@@ -134,12 +212,320 @@ class TimeRange(ABC):
                                     seconds=seconds,
                                     milliseconds=milliseconds,
                                     microseconds=microseconds)
-        current_date = self.start
-        if not include_start:
-            current_date += delta_
-        while not self.end or self.contains(current_date, True, include_end):
-            yield current_date
-            current_date += delta_
+        return StepSequence.spanning(self.start, self.end, delta_,
+                                     include_start, include_end)
+
+    def steps_array(self, *, delta=None, weeks=0, days=0, hours=0, minutes=0,
+                    seconds=0, milliseconds=0, microseconds=0,
+                    include_start=True, include_end=True, limit=None):
+        """
+        Return the steps of this ``TimeRange`` as a NumPy ``datetime64[us]``
+        array that is built in one vectorized operation. This requires NumPy
+        to be installed (``pip install trange[numpy]``).
+
+        See ``TimeRange.steps``.
+        :param delta: See ``TimeRange.steps``.
+        :param weeks: See ``TimeRange.steps``.
+        :param days: See ``TimeRange.steps``.
+        :param hours: See ``TimeRange.steps``.
+        :param minutes: See ``TimeRange.steps``.
+        :param seconds: See ``TimeRange.steps``.
+        :param milliseconds: See ``TimeRange.steps``.
+        :param microseconds: See ``TimeRange.steps``.
+        :param include_start: See ``TimeRange.steps``.
+        :param include_end: See ``TimeRange.steps``.
+        :param limit: the maximum number of steps in the array. It is required
+        if this ``TimeRange`` is infinite.
+        :return: a ``numpy.ndarray`` of ``datetime64[us]``.
+        """
+        steps = self.steps(delta=delta, weeks=weeks, days=days, hours=hours,
+                           minutes=minutes, seconds=seconds,
+                           milliseconds=milliseconds,
+                           microseconds=microseconds,
+                           include_start=include_start,
+                           include_end=include_end)
+        return steps.to_array(limit)
+
+    def tz_steps(self, tz=None, *, mode='wall', **steps_kwargs):
+        """
+        Return a ``ZonedStepSequence`` of timezone aware steps that are
+        correct across changes of the UTC offset, like daylight saving time.
+        In 'wall' mode, the steps are ``delta`` apart on the wall clock of
+        ``tz``, so daily steps stay at the same time of day. In 'absolute'
+        mode, the steps are ``delta`` apart in elapsed time.
+
+        See ``trange.zones.ZonedStepSequence``.
+        :param tz: the ``tzinfo`` to step in, e.g. a ``zoneinfo.ZoneInfo``.
+        It defaults to the ``tzinfo`` of ``start``. Naive ``start`` and
+        ``end`` are taken to be wall clock times in ``tz``.
+        :param mode: one of 'wall' or 'absolute'.
+        :param steps_kwargs: the keyword arguments of ``TimeRange.steps``.
+        :return: a ``ZonedStepSequence``.
+        """
+        tz = tz or self.start.tzinfo
+        if tz is None:
+            raise ValueError('A timezone is required to step through a naive '
+                             'TimeRange.')
+        return zones.spanning(self, tz, mode, **steps_kwargs)
+
+    def calendar_steps(self, *, months=0, years=0, business_days=0,
+                       calendar=None, include_start=True, include_end=True):
+        """
+        Return a ``CalendarStepSequence`` that steps through this
+        ``TimeRange`` in calendar units: months and years, or business days.
+        Like with ``steps``, its ``len()``, items, slices and membership are
+        computed without iterating.
+
+        Month and year steps are counted from ``start`` and their day of the
+        month is clamped to the end of shorter months. Business day steps are
+        at the time of day of ``start``, from the first business day that is
+        not before ``start``.
+
+        See ``trange.calendars.CalendarStepSequence``.
+        :param months: the number of months of the step size.
+        :param years: the number of years of the step size.
+        :param business_days: the number of business days of the step size.
+        :param calendar: a ``BusinessCalendar`` that defines the business
+        days. It defaults to Monday to Friday without holidays.
+        :param include_start: determines whether the ``start`` datetime is
+        included in the iteration.
+        :param include_end: determines whether the ``end`` datetime is included
+        in the iteration.
+        :return: a ``CalendarStepSequence``.
+        """
+        _check_type('months', months, int)
+        _check_type('years', years, int)
+        _check_type('business_days', business_days, int)
+        if bool(months or years) == bool(business_days):
+            raise ValueError("Either 'months' and 'years' or 'business_days' "
+                             "must be given.")
+        if business_days:
+            unit = calendars.BusinessDayUnit(
+                self.start, calendar or calendars.WEEKDAYS)
+            step = business_days
+        else:
+            if calendar is not None:
+                raise ValueError("A calendar can only be used with "
+                                 "'business_days'.")
+            unit = calendars.MonthUnit(self.start)
+            step = years * 12 + months
+        return calendars.CalendarStepSequence.spanning(
+            unit, self.start, self.end, step, include_start, include_end)
+
+    def floor_step(self, value, **steps_kwargs):
+        """
+        Return the last step of ``steps(**steps_kwargs)`` that is not beyond
+        ``value`` in the stepping direction, computed without iterating. If
+        ``value`` lies beyond the last step, that is the last step.
+        :param value: a ``datetime``.
+        :param steps_kwargs: the keyword arguments of ``TimeRange.steps``
+        that define the step grid.
+        :return: a ``datetime`` or ``None`` if there is no such step.
+        """
+        return self.steps(**steps_kwargs).floor(value)
+
+    def ceil_step(self, value, **steps_kwargs):
+        """
+        Return the first step of ``steps(**steps_kwargs)`` that is not before
+        ``value`` in the stepping direction, computed without iterating. If
+        ``value`` lies before the first step, that is the first step.
+        :param value: a ``datetime``.
+        :param steps_kwargs: See ``TimeRange.floor_step``.
+        :return: a ``datetime`` or ``None`` if there is no such step.
+        """
+        return self.steps(**steps_kwargs).ceil(value)
+
+    def nearest_step(self, value, **steps_kwargs):
+        """
+        Return the step of ``steps(**steps_kwargs)`` that is nearest to
+        ``value``, computed without iterating. In case of a tie, the earlier
+        step in the stepping direction wins.
+        :param value: a ``datetime``.
+        :param steps_kwargs: See ``TimeRange.floor_step``.
+        :return: a ``datetime`` or ``None`` if there are no steps.
+        """
+        return self.steps(**steps_kwargs).nearest(value)
+
+    def step_index(self, value, **steps_kwargs):
+        """
+        Return the index of ``floor_step(value, **steps_kwargs)`` within
+        ``steps(**steps_kwargs)``.
+        :param value: a ``datetime``.
+        :param steps_kwargs: See ``TimeRange.floor_step``.
+        :return: the index as ``int`` or ``None`` if there is no such step.
+        """
+        return self.steps(**steps_kwargs).floor_index(value)
+
+    def step_indices(self, values, how='floor', **steps_kwargs):
+        """
+        Return the index of the floor, ceil or nearest step of each value in
+        one vectorized operation. Missing steps are -1. This requires NumPy to
+        be installed.
+        :param values: a NumPy ``datetime64`` array or an iterable of
+        ``datetime`` instances.
+        :param how: one of 'floor', 'ceil' or 'nearest'.
+        :param steps_kwargs: See ``TimeRange.floor_step``.
+        :return: a ``numpy.ndarray`` of ``int64``.
+        """
+        return self.steps(**steps_kwargs).indices(values, how)
+
+    def split(self, n=None, *, chunk=None, **steps_kwargs):
+        """
+        Return contiguous sub-ranges of this ``TimeRange`` that are aligned
+        to the step grid of ``steps(**steps_kwargs)``, in stepping order.
+
+        The chunks are chosen such that concatenating ``chunk.steps(...)`` of
+        all chunks, with the same step size and the default ``include_start``
+        and ``include_end``, reproduces ``self.steps(**steps_kwargs)``
+        exactly. Each chunk ends one microsecond before the first step of the
+        next chunk, so no instant is in two chunks.
+        :param n: the number of chunks. There are fewer chunks if there are
+        fewer steps.
+        :param chunk: a ``timedelta`` that defines the size of each chunk
+        instead of ``n``. It is rounded down to a whole number of steps, with
+        a minimum of one step.
+        :param steps_kwargs: the keyword arguments of ``TimeRange.steps``
+        that define the step grid.
+        :return: a ``list`` of ``TimeRange`` instances.
+        """
+        if (n is None) == (chunk is None):
+            raise ValueError("Exactly one of 'n' and 'chunk' must be given.")
+        if chunk is not None:
+            _check_type('chunk', chunk, timedelta)
+        elif n < 1:
+            raise ValueError("argument 'n' must be positive, not %s" % n)
+        if not self.end:
+            raise ValueError('An infinite TimeRange cannot be split.')
+        steps = self.steps(**steps_kwargs)
+        length = len(steps)
+        if not length:
+            return []
+        if chunk is not None:
+            size = max(chunk // abs(steps.delta), 1)
+            indices = list(range(0, length, size))
+        else:
+            n = min(n, length)
+            indices = [length * i // n for i in range(n)]
+        epsilon = _MICROSECOND if steps.delta > timedelta(0) else -_MICROSECOND
+        last_end = self.end
+        if last_end == steps.last + steps.delta:
+            # The end is on the grid, but excluded.
+            last_end -= epsilon
+        ends = [steps[index] - epsilon for index in indices[1:]] + [last_end]
+        # The class of self is kept, as a chunk of one step has equal ends.
+        return [_make(self.__class__, steps[index], end)
+                for index, end in zip(indices, ends)]
+
+    def windows(self, size, stride=None, *, clip=False):
+        """
+        Return a ``WindowSequence`` of sub-ranges that span ``size`` and start
+        every ``stride``, from ``start`` towards ``end``. The windows have the
+        direction of this ``TimeRange``. With a ``stride`` that is smaller
+        than ``size`` the windows slide and overlap; by default, ``stride``
+        equals ``size`` and the windows tumble.
+
+        The sequence is lazy: its ``len()``, items and slices are computed
+        without iterating. Use ``pairs``, ``to_array`` or ``batches`` of the
+        sequence to get the windows without creating a ``TimeRange`` for
+        each of them.
+        :param size: a ``timedelta`` that defines the span of each window.
+        :param stride: a ``timedelta`` that defines the distance between the
+        starts of two subsequent windows.
+        :param clip: determines whether the windows that start within this
+        ``TimeRange``, but reach past ``end``, are included and clipped at
+        ``end`` (``True``) or left out (``False``).
+        :return: a ``WindowSequence``.
+        """
+        # Imported here, as the windows module depends on this one.
+        from trange.windows import WindowSequence
+        stride = size if stride is None else stride
+        _check_type('size', size, timedelta)
+        _check_type('stride', stride, timedelta)
+        for name, value in (('size', size), ('stride', stride)):
+            if value <= timedelta(0):
+                raise ValueError("argument '%s' must be positive, not %s"
+                                 % (name, value))
+        starts = self.steps(delta=stride, include_end=False)
+        size = size if starts.delta > timedelta(0) else -size
+        if self.end and not clip:
+            # The last complete window starts no later than size before end.
+            starts = (StepSequence.spanning(self.start, self.end - size,
+                                            starts.delta)
+                      if abs(self.delta) >= abs(size)
+                      else StepSequence(self.start, starts.delta, 0))
+        return WindowSequence(starts, size, self.end if clip else None)
+
+    def asteps(self, *, clock=None, **steps_kwargs):
+        """
+        Return an async generator that yields each step of
+        ``steps(**steps_kwargs)`` as soon as the clock reaches it. Each step
+        is awaited at its own absolute instant, so there is no drift.
+
+        See ``trange.scheduler.asteps``.
+        :param clock: an optional clock, see ``trange.scheduler.SystemClock``.
+        :param steps_kwargs: the keyword arguments of ``TimeRange.steps``.
+        :return: an async generator of ``datetime`` instances.
+        """
+        # Imported here, as asyncio is slow to import.
+        from trange.scheduler import asteps
+        return asteps(self.steps(**steps_kwargs), clock)
+
+    def bucketize(self, events, *, delta=None, weeks=0, days=0, hours=0,
+                  minutes=0, seconds=0, milliseconds=0, microseconds=0,
+                  key=None, include_start=True, include_end=True,
+                  aggregate=None, value=None, ordered=False):
+        """
+        Return a generator that assigns each event in ``events`` to a bucket
+        of the step grid of this ``TimeRange`` in a single pass. Events that
+        are not in this ``TimeRange`` are skipped.
+
+        Bucket ``i`` holds the instants from step ``i`` up to, but not
+        including, step ``i + 1``, where step 0 is ``start``. The index of the
+        bucket of an event is computed arithmetically, so ``events`` can be an
+        unbounded generator. For a ``BackwardTimeRange`` the buckets go back
+        in time.
+
+        Without ``aggregate``, tuples of (bucket index, event) are yielded.
+        With ``aggregate``, tuples of (bucket index, aggregate) are yielded
+        for each bucket that holds an event. If ``ordered`` is ``True``, the
+        events must arrive in step order and each bucket is yielded as soon as
+        it is complete; otherwise the buckets are yielded once ``events`` is
+        exhausted.
+
+        See ``TimeRange.steps``.
+        :param events: an iterable of events, possibly unbounded.
+        :param delta: See ``TimeRange.steps``.
+        :param weeks: See ``TimeRange.steps``.
+        :param days: See ``TimeRange.steps``.
+        :param hours: See ``TimeRange.steps``.
+        :param minutes: See ``TimeRange.steps``.
+        :param seconds: See ``TimeRange.steps``.
+        :param milliseconds: See ``TimeRange.steps``.
+        :param microseconds: See ``TimeRange.steps``.
+        :param key: a function that returns the ``datetime`` of an event. If
+        it is omitted, the events are ``datetime`` instances themselves.
+        :param include_start: See ``TimeRange.contains``.
+        :param include_end: See ``TimeRange.contains``.
+        :param aggregate: one of 'count', 'sum', 'min' or 'max' or ``None``.
+        :param value: a function that returns the value of an event that is to
+        be aggregated. If it is omitted, the event itself is aggregated.
+        :param ordered: determines whether the events are known to arrive in
+        step order.
+        :return: a generator of (index, event) or (index, aggregate) tuples.
+        """
+        steps = self.steps(delta=delta, weeks=weeks, days=days, hours=hours,
+                           minutes=minutes, seconds=seconds,
+                           milliseconds=milliseconds,
+                           microseconds=microseconds)
+
+        def accepts(moment):
+            return self.contains(moment, include_start, include_end)
+
+        assigned = buckets.assign(events, self.start, steps.delta, accepts,
+                                  key)
+        if aggregate is None:
+            return assigned
+        return buckets.aggregate(assigned, aggregate, value, ordered)
 
     @property
     def start(self):
@@ -170,14 +556,12 @@ class TimeRange(ABC):
 
     def __hash__(self):
         """
-        Return a unique hashcode for this instance.
-        :return: a unique hashcode as ``int``.
+        Return a hashcode for this instance that is consistent with
+        ``__eq__``. It is computed once and then cached.
+        :return: a hashcode as ``int``.
         """
-        if not self._hash:
-            date_pattern = '%Y%m%d%H%M%S%f'
-            start_h = self.start.strftime(date_pattern)
-            end_h = self.end.strftime(date_pattern) if self.end else 20 * '0'
-            self._hash = int('%s%s%s' % (hash(self.__class__), start_h, end_h))
+        if self._hash is None:
+            _set_hash(self, hash((self.__class__, self._start, self._end)))
         return self._hash
 
     def __eq__(self, other):
@@ -188,7 +572,35 @@ class TimeRange(ABC):
         :param other: the right operand.
         :return: ``True`` in case of equality.
         """
-        return hash(self) == hash(other)
+        if not isinstance(other, TimeRange):
+            return NotImplemented
+        return (self.__class__ is other.__class__
+                and self._start == other._start
+                and self._end == other._end)
+
+    def __setattr__(self, name, value):
+        """
+        Prevent attributes from being set, as a ``TimeRange`` is immutable.
+        :param name: the name of the attribute.
+        :param value: the value of the attribute.
+        """
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
+
+    def __delattr__(self, name):
+        """
+        Prevent attributes from being deleted, as a ``TimeRange`` is
+        immutable.
+        :param name: the name of the attribute.
+        """
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
+
+    def __reduce__(self):
+        """
+        Return the information that is required to pickle or copy this
+        instance.
+        :return: a tuple of the class and the constructor arguments.
+        """
+        return self.__class__, (self._start, self._end)
 
     def __repr__(self):
         """
@@ -208,6 +620,63 @@ class TimeRange(ABC):
         """
         return self.contains(item, True, True)
 
+    def contains_many(self, items, include_start=True, include_end=True,
+                      assume_sorted=False):
+        """
+        Return for each ``datetime`` in ``items`` whether it is in this
+        ``TimeRange``, consistent with ``contains``.
+
+        If ``assume_sorted`` is ``True``, ``items`` must be sorted in ascending
+        order and a ``slice`` is returned that selects the items that are in
+        this ``TimeRange``; it is found by bisection. Otherwise a boolean mask
+        is returned. NumPy ``datetime64`` arrays are compared in a vectorized
+        manner, in which case the mask is a NumPy array as well.
+        :param items: a sequence of ``datetime`` instances or a NumPy
+        ``datetime64`` array.
+        :param include_start: See ``TimeRange.contains``.
+        :param include_end: See ``TimeRange.contains``.
+        :param assume_sorted: determines whether ``items`` are known to be
+        sorted in ascending order.
+        :return: a ``slice`` if ``assume_sorted`` is ``True``, otherwise a
+        boolean mask as ``list`` or ``numpy.ndarray``.
+        """
+        lower, upper, include_lower, include_upper = self._bounds(
+            include_start, include_end)
+        np = sys.modules.get('numpy')
+        is_array = np is not None and isinstance(items, np.ndarray)
+        if is_array:
+            lower = None if lower is None else np.datetime64(lower)
+            upper = None if upper is None else np.datetime64(upper)
+        if assume_sorted:
+            if is_array:
+                lo = 0 if lower is None else int(np.searchsorted(
+                    items, lower, 'left' if include_lower else 'right'))
+                hi = len(items) if upper is None else int(np.searchsorted(
+                    items, upper, 'right' if include_upper else 'left'))
+            else:
+                lo = 0 if lower is None else (
+                    bisect_left if include_lower else bisect_right)(
+                        items, lower)
+                hi = len(items) if upper is None else (
+                    bisect_right if include_upper else bisect_left)(
+                        items, upper)
+            return slice(lo, max(lo, hi))
+        after_lower = ge if include_lower else gt
+        before_upper = le if include_upper else lt
+        if is_array:
+            mask = np.ones(len(items), dtype=bool)
+            if lower is not None:
+                mask &= after_lower(items, lower)
+            if upper is not None:
+                mask &= before_upper(items, upper)
+            return mask
+        if lower is None:
+            return [before_upper(item, upper) for item in items]
+        if upper is None:
+            return [after_lower(item, lower) for item in items]
+        return [after_lower(item, lower) and before_upper(item, upper)
+                for item in items]
+
     @abstractmethod
     def __str__(self):
         """
@@ -228,11 +697,19 @@ class TimeRange(ABC):
         :return: ``True`` if ``item`` is in self.
         """
 
+    @abstractmethod
+    def _bounds(self, include_start, include_end):
+        # Return a tuple (lower, upper, include_lower, include_upper) with the
+        # chronological bounds of this TimeRange. A bound of None is infinite.
+        pass
+
 
 class ForwardTimeRange(TimeRange):
     """
     A ``TimeRange`` implementation of which ``start >= end``.
     """
+    __slots__ = ()
+
     def __init__(self, start, end=None):
         """
         Constructor.
@@ -265,6 +742,10 @@ class ForwardTimeRange(TimeRange):
             before_end = True # Infinite end
         return after_start and before_end
 
+    def _bounds(self, include_start, include_end):
+        # See TimeRange._bounds.
+        return self.start, self.end, include_start, include_end
+
     def __str__(self):
         """
         Return this instance as string.
@@ -279,6 +760,8 @@ class BackwardTimeRange(TimeRange):
     """
     A ``TimeRange`` implementation of which ``start < end``.
     """
+    __slots__ = ()
+
     def __init__(self, start, end=None):
         """
         Constructor.
@@ -298,10 +781,10 @@ class BackwardTimeRange(TimeRange):
               seconds=0, milliseconds=0, microseconds=0, include_start=True,
               include_end=True):
         """
-        Return a generator for iterating through this ``BackwardTimeRange``
-        using steps of a given size.
+        Return a ``StepSequence`` for iterating through this
+        ``BackwardTimeRange`` using steps of a given size.
 
-        Be aware that steps are to be *positive* if the generator is to iterate
+        Be aware that steps are to be *positive* if the sequence is to iterate
         from ``start`` to ``end``.
 
         See ``TimeRange.steps``.
@@ -319,7 +802,7 @@ class BackwardTimeRange(TimeRange):
         """
         if delta:
             _check_type('delta', delta, timedelta)
-            delta = timedelta(seconds=delta.total_seconds() * -1)
+            delta = -delta
         return TimeRange.steps(self, delta=delta, weeks=weeks * -1,
                                days=days * -1, hours=hours * -1,
                                minutes=minutes * -1, seconds=seconds * -1,
@@ -328,6 +811,34 @@ class BackwardTimeRange(TimeRange):
                                include_start=include_start,
                                include_end=include_end)
 
+    def calendar_steps(self, *, months=0, years=0, business_days=0,
+                       calendar=None, include_start=True, include_end=True):
+        """
+        Return a ``CalendarStepSequence`` for iterating backward through this
+        ``BackwardTimeRange`` in calendar units.
+
+        Be aware that steps are to be *positive* if the sequence is to iterate
+        from ``start`` to ``end``.
+
+        See ``TimeRange.calendar_steps``.
+        :param months: See ``TimeRange.calendar_steps``.
+        :param years: See ``TimeRange.calendar_steps``.
+        :param business_days: See ``TimeRange.calendar_steps``.
+        :param calendar: See ``TimeRange.calendar_steps``.
+        :param include_start: See ``TimeRange.calendar_steps``.
+        :param include_end: See ``TimeRange.calendar_steps``.
+        :return: See ``TimeRange.calendar_steps``.
+        """
+        _check_type('months', months, int)
+        _check_type('years', years, int)
+        _check_type('business_days', business_days, int)
+        return TimeRange.calendar_steps(self, months=months * -1,
+                                        years=years * -1,
+                                        business_days=business_days * -1,
+                                        calendar=calendar,
+                                        include_start=include_start,
+                                        include_end=include_end)
+
     def contains(self, item, include_start, include_end):
         """
         See ``TimeRange.contains``.
@@ -345,6 +856,10 @@ class BackwardTimeRange(TimeRange):
             after_end = True # Infinite end
         return before_start and after_end
 
+    def _bounds(self, include_start, include_end):
+        # See TimeRange._bounds.
+        return self.end, self.start, include_end, include_start
+
     def __str__(self):
         """
         Return this instance as string.
@@ -355,6 +870,61 @@ class BackwardTimeRange(TimeRange):
         return '<..., %s]' % self.start
 
 
+# The slots of TimeRange are set through their descriptors, as __setattr__
+# is blocked to make instances immutable.
+_set_start = TimeRange._start.__set__
+_set_end = TimeRange._end.__set__
+_set_hash = TimeRange._hash.__set__
+_MICROSECOND = timedelta(microseconds=1)
+_EPOCH = datetime(1970, 1, 1)
+# The numbers of seconds since the epoch that a naive datetime can represent.
+_MIN_SECONDS = (datetime.min - _EPOCH) // timedelta(seconds=1)
+_MAX_SECONDS = (datetime.max - _EPOCH) // timedelta(seconds=1)
+
+
+def _make(cls, start, end):
+    # Create an instance of cls without any validation.
+    time_range = object.__new__(cls)
+    _set_start(time_range, start)
+    _set_end(time_range, end)
+    _set_hash(time_range, None)
+    return time_range
+
+
+def _to_datetime(arg_name, value, tz, trusted):
+    # Return value as datetime, converting it from seconds since the epoch if
+    # it is a number. Unless trusted, raise a TypeError for other types.
+    if isinstance(value, datetime):
+        return value
+    if not trusted and (isinstance(value, bool)
+                        or not isinstance(value, (int, float))):
+        raise TypeError("argument '%s' must be an instance of datetime or "
+                        "int or float, not %s"
+                        % (arg_name, type(value).__name__))
+    if tz is None:
+        return _EPOCH + timedelta(seconds=value)
+    return datetime.fromtimestamp(value, tz)
+
+
+def _to_list(values, tz):
+    # Return a NumPy array as list of Python objects, converting datetime64
+    # values to microseconds, so they become datetime instances rather than
+    # nanosecond ints or dates. Numbers of seconds are converted to datetime64
+    # at once if they become naive datetimes that are all in range. Other
+    # iterables are returned as they are.
+    if not hasattr(values, 'tolist'):
+        return values
+    kind = getattr(getattr(values, 'dtype', None), 'kind', None)
+    if (kind in ('i', 'u', 'f') and tz is None and len(values)
+            and _MIN_SECONDS <= values.min() and values.max() <= _MAX_SECONDS):
+        micros = values * 1000000 if kind == 'f' else (
+            values.astype('int64') * 1000000)
+        values = micros.round().astype('int64').astype('datetime64[us]')
+    elif kind == 'M':
+        values = values.astype('datetime64[us]')
+    return values.tolist()
+
+
 def _check_type(arg_name, arg, *types):
     # Check if the type of arg is in types. If not, raise a TypeError.
     for type_ in types:
@@ -0,0 +1,315 @@
+"""
+Contains the ``WindowSequence`` class, the lazy sequence of sub-ranges that is
+returned by ``TimeRange.windows``.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import timedelta
+from itertools import count
+
+from trange._epoch import MICROSECOND, to_micros
+from trange._optional import try_import
+from trange.columnar import TimeRangeArray, _column
+from trange.trange import (BackwardTimeRange, ForwardTimeRange, TimeRange,
+                           _make)
+
+
+_ZERO = timedelta(0)
+
+
+class WindowSequence(Sequence):
+    """
+    A lazy and immutable sequence of windows: sub-ranges that span ``size``
+    from each of the ``starts``. If ``clip`` is given, windows do not reach
+    past it. Windows with a positive ``size`` are ``ForwardTimeRange``
+    instances and windows with a negative ``size`` are ``BackwardTimeRange``
+    instances.
+
+    Like a ``StepSequence``, the length, the items, slices and the membership
+    of a ``WindowSequence`` are computed arithmetically. A ``TimeRange`` is
+    only created for a window that is indexed or iterated; ``pairs``,
+    ``to_array`` and ``batches`` give the windows without creating any.
+    """
+    __slots__ = ('_starts', '_size', '_clip')
+
+    def __init__(self, starts, size, clip=None):
+        """
+        Constructor.
+        :param starts: a ``StepSequence`` of the starts of the windows.
+        :param size: a ``timedelta`` that defines the span of each window. It
+        can be negative, but not zero.
+        :param clip: an optional ``datetime`` that no window reaches past.
+        """
+        if not isinstance(size, timedelta):
+            raise TypeError("argument 'size' must be an instance of "
+                            "datetime.timedelta, not %s"
+                            % type(size).__name__)
+        if not size:
+            raise ValueError('The window size must not be zero.')
+        self._starts = starts
+        self._size = size
+        self._clip = clip
+
+    @property
+    def starts(self):
+        """
+        Return the starts of the windows.
+        :return: a ``StepSequence``.
+        """
+        return self._starts
+
+    @property
+    def size(self):
+        """
+        Return the ``timedelta`` that each window spans, unless clipped.
+        :return: the window size.
+        """
+        return self._size
+
+    @property
+    def stride(self):
+        """
+        Return the ``timedelta`` between the starts of two subsequent windows.
+        :return: the stride.
+        """
+        return self._starts.delta
+
+    @property
+    def clip(self):
+        """
+        Return the ``datetime`` that no window reaches past or ``None``.
+        :return: the clip ``datetime`` or ``None``.
+        """
+        return self._clip
+
+    @property
+    def length(self):
+        """
+        Return the number of windows in this sequence or ``None`` if it is
+        infinite.
+        :return: the length as ``int`` or ``None``.
+        """
+        return self._starts.length
+
+    def pairs(self):
+        """
+        Return an iterator over the windows as ``(start, end)`` tuples,
+        without creating ``TimeRange`` instances.
+        :return: an iterator of tuples of two ``datetime`` instances.
+        """
+        size = self._size
+        clip = self._clip
+        forward = size > _ZERO
+        for start in self._starts:
+            end = start + size
+            if clip is not None and (end > clip if forward else end < clip):
+                end = clip
+            yield start, end
+
+    def to_array(self):
+        """
+        Return the windows of this finite sequence as a ``TimeRangeArray``.
+        The columns are computed arithmetically for naive datetimes, without
+        creating an object per window, and vectorized with NumPy if it is
+        installed.
+        :return: a ``TimeRangeArray``.
+        """
+        length = self._starts.length
+        if length is None:
+            raise ValueError('An infinite %s cannot be converted to a '
+                             'TimeRangeArray.' % self.__class__.__name__)
+        forward = array('b', [self._size > _ZERO]) * length
+        if self._starts.first.tzinfo is not None:
+            # Aware datetimes are added in wall time, but stored in UTC.
+            tz = self._starts.first.tzinfo
+            starts = array('q')
+            ends = array('q')
+            for start, end in self.pairs():
+                starts.append(to_micros(start))
+                ends.append(to_micros(end))
+            return TimeRangeArray._from_columns(starts, ends, forward, tz)
+        first = to_micros(self._starts.first)
+        stride = self._starts.delta // MICROSECOND
+        size = self._size // MICROSECOND
+        np = try_import('numpy')
+        if np is not None:
+            starts = first + stride * np.arange(length, dtype='int64')
+            ends = starts + size
+            if self._clip is not None:
+                clip = to_micros(self._clip)
+                ends = (np.minimum(ends, clip) if size > 0
+                        else np.maximum(ends, clip))
+            return TimeRangeArray._from_columns(_column('q', starts),
+                                                _column('q', ends), forward)
+        starts = range(first, first + stride * length, stride)
+        ends = range(first + size, first + size + stride * length, stride)
+        ends_column = array('q', ends)
+        if self._clip is not None:
+            clip = to_micros(self._clip)
+            clipped = _past(ends, clip, size > 0)
+            ends_column[clipped.start:clipped.stop] = (array('q', [clip])
+                                                       * len(clipped))
+        return TimeRangeArray._from_columns(array('q', starts), ends_column,
+                                            forward)
+
+    def batches(self, n):
+        """
+        Return an iterator over the windows in batches of ``n`` windows, each
+        as a ``TimeRangeArray``. The last batch may hold fewer windows. An
+        infinite sequence gives batches infinitely.
+        :param n: the maximum number of windows per batch.
+        :return: an iterator of ``TimeRangeArray`` instances.
+        """
+        if n < 1:
+            raise ValueError("argument 'n' must be positive, not %s" % n)
+        length = self._starts.length
+        offsets = count(0, n) if length is None else range(0, length, n)
+        for offset in offsets:
+            yield self[offset:offset + n].to_array()
+
+    def index(self, value, start=0, stop=None):
+        """
+        Return the index of ``value`` in this sequence.
+        :param value: the ``TimeRange`` to look up.
+        :param start: the index to start searching at.
+        :param stop: the index to stop searching at.
+        :return: the index as ``int``.
+        """
+        if self._offset(value) is not None:
+            return self._starts.index(value.start, start, stop)
+        raise ValueError('%r is not in %s' % (value, self.__class__.__name__))
+
+    def count(self, value):
+        """
+        Return the number of occurrences of ``value`` in this sequence.
+        :param value: the ``TimeRange`` to count.
+        :return: 0 or 1.
+        """
+        return int(value in self)
+
+    def __len__(self):
+        """
+        Return the number of windows in this sequence.
+        :return: the length as ``int``.
+        """
+        if self._starts.length is None:
+            raise TypeError('An infinite %s has no len().'
+                            % self.__class__.__name__)
+        return self._starts.length
+
+    def __bool__(self):
+        """
+        Return whether this sequence holds any windows.
+        :return: ``True`` if this sequence is not empty.
+        """
+        return bool(self._starts)
+
+    def __getitem__(self, item):
+        """
+        Return the window at index ``item`` or a ``WindowSequence`` if
+        ``item`` is a ``slice``.
+        :param item: an ``int`` or a ``slice``.
+        :return: a ``TimeRange`` or a ``WindowSequence``.
+        """
+        if isinstance(item, slice):
+            return self.__class__(self._starts[item], self._size, self._clip)
+        start = self._starts[item]
+        return _make(self._range_class(), start, self._end(start))
+
+    def __iter__(self):
+        """
+        Return an iterator over the windows in this sequence.
+        :return: an iterator of ``TimeRange`` instances.
+        """
+        cls = self._range_class()
+        for start, end in self.pairs():
+            yield _make(cls, start, end)
+
+    def __reversed__(self):
+        """
+        Return an iterator over the windows in this sequence in reversed
+        order.
+        :return: an iterator of ``TimeRange`` instances.
+        """
+        if self._starts.length is None:
+            raise TypeError('An infinite %s cannot be reversed.'
+                            % self.__class__.__name__)
+        return iter(self[::-1])
+
+    def __contains__(self, item):
+        """
+        Return whether ``item`` is one of the windows in this sequence.
+        :param item: any object.
+        :return: ``True`` if ``item`` is in self.
+        """
+        return self._offset(item) is not None
+
+    def __eq__(self, other):
+        """
+        Return whether ``self == other``, which is the case if both sequences
+        have equal starts, sizes and clips.
+        :param other: the right operand.
+        :return: ``True`` in case of equality.
+        """
+        if not isinstance(other, WindowSequence):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        """
+        Return a hashcode for this instance that is consistent with
+        ``__eq__``.
+        :return: a hashcode as ``int``.
+        """
+        return hash(self._key())
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(%r, %r, %r)' % (self.__class__.__name__, self._starts,
+                                   self._size, self._clip)
+
+    def _key(self):
+        # Return a tuple that identifies the windows of this sequence.
+        return self._starts, self._size, self._clip
+
+    def _range_class(self):
+        # Return the TimeRange class of the windows.
+        return ForwardTimeRange if self._size > _ZERO else BackwardTimeRange
+
+    def _end(self, start):
+        # Return the end of the window that starts at start.
+        end = start + self._size
+        clip = self._clip
+        if clip is not None and (end > clip if self._size > _ZERO
+                                 else end < clip):
+            return clip
+        return end
+
+    def _offset(self, item):
+        # Return the index of the window that is equal to item or None.
+        if (not isinstance(item, TimeRange)
+                or item.__class__ is not self._range_class()):
+            return None
+        index = self._starts._offset(item.start)
+        if index is None or item.end != self._end(item.start):
+            return None
+        return index
+
+
+def _past(values, clip, forward):
+    # Return the range of indices of the monotonic range values that lie past
+    # clip, which is after clip if forward and before clip otherwise.
+    length = len(values)
+    ascending = values.step > 0
+    ordered = values if ascending else values[::-1]
+    if forward:
+        position = bisect_right(ordered, clip)
+        return range(position, length) if ascending else range(
+            0, length - position)
+    position = bisect_left(ordered, clip)
+    return range(0, position) if ascending else range(
+        length - position, length)
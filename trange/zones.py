@@ -0,0 +1,371 @@
+"""
+Contains the ``ZonedStepSequence`` class, the lazy sequence of timezone aware
+``datetime`` instances that is returned by ``TimeRange.tz_steps``, and the
+cached tables of UTC offset transitions that it uses.
+"""
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from trange.steps import StepSequence
+
+
+WALL = 'wall'
+ABSOLUTE = 'absolute'
+
+_ZERO = timedelta(0)
+_SECOND = timedelta(seconds=1)
+_DAY = timedelta(days=1)
+
+
+class ZonedStepSequence(Sequence):
+    """
+    A lazy and immutable sequence of timezone aware ``datetime`` instances in
+    the timezone ``tz``, for example a ``zoneinfo.ZoneInfo``.
+
+    In 'absolute' mode, the steps lie ``delta`` apart in elapsed time, so
+    their wall clock time shifts when the UTC offset changes. In 'wall' mode,
+    the steps lie ``delta`` apart on the wall clock. A step that falls in a
+    gap, when clocks are set forward, is moved forward by the size of the gap
+    and a step that falls in a fold, when clocks are set back, is the first
+    of the two (``fold=0``), like the standard library resolves such times.
+
+    The steps are computed from a ``StepSequence`` of naive ``datetime``
+    instances in UTC or on the wall clock and a table of the transitions of
+    the UTC offset of ``tz``. The table is computed once per year and cached,
+    so a step takes an addition and only occasionally a table lookup.
+    """
+    __slots__ = ('_naive', '_tz', '_mode')
+
+    def __init__(self, naive, tz, mode=WALL):
+        """
+        Constructor.
+        :param naive: a ``StepSequence`` of naive ``datetime`` instances, in
+        UTC in 'absolute' mode or on the wall clock in 'wall' mode.
+        :param tz: the ``tzinfo`` of the steps.
+        :param mode: one of 'wall' or 'absolute'.
+        """
+        if mode not in (WALL, ABSOLUTE):
+            raise ValueError("argument 'mode' must be one of 'wall' or "
+                             "'absolute', not %r" % (mode,))
+        self._naive = naive
+        self._tz = tz
+        self._mode = mode
+
+    @property
+    def naive(self):
+        """
+        Return the underlying ``StepSequence`` of naive ``datetime``
+        instances, in UTC or on the wall clock depending on ``mode``.
+        :return: a ``StepSequence``.
+        """
+        return self._naive
+
+    @property
+    def tz(self):
+        """
+        Return the ``tzinfo`` of the steps.
+        :return: a ``tzinfo``.
+        """
+        return self._tz
+
+    @property
+    def mode(self):
+        """
+        Return the stepping mode, 'wall' or 'absolute'.
+        :return: the mode as ``str``.
+        """
+        return self._mode
+
+    def to_datetimeindex(self, name=None):
+        """
+        Return the steps of this sequence as a timezone aware
+        ``pandas.DatetimeIndex``. This requires pandas to be installed
+        (``pip install trange[pandas]``).
+
+        See ``trange.interop.to_datetimeindex``.
+        :param name: the name of the index.
+        :return: a ``pandas.DatetimeIndex``.
+        """
+        # Imported here, as the interop module depends on this one.
+        from trange.interop import to_datetimeindex
+        return to_datetimeindex(self, name)
+
+    def index(self, value, start=0, stop=None):
+        """
+        Return the index of the first occurrence of ``value`` in this
+        sequence.
+        :param value: the timezone aware ``datetime`` to look up.
+        :param start: the index to start searching at.
+        :param stop: the index to stop searching at.
+        :return: the index as ``int``.
+        """
+        for index in self._positions(value):
+            if index >= start and (stop is None or index < stop):
+                return index
+        raise ValueError('%r is not in %s' % (value, self.__class__.__name__))
+
+    def count(self, value):
+        """
+        Return the number of occurrences of ``value`` in this sequence. In
+        'wall' mode, a step that is moved out of a gap can coincide with the
+        next step.
+        :param value: the timezone aware ``datetime`` to count.
+        :return: the number of occurrences as ``int``.
+        """
+        return len(self._positions(value))
+
+    def __len__(self):
+        """
+        Return the number of steps in this sequence.
+        :return: the length as ``int``.
+        """
+        return len(self._naive)
+
+    def __bool__(self):
+        """
+        Return whether this sequence holds any steps.
+        :return: ``True`` if this sequence is not empty.
+        """
+        return bool(self._naive)
+
+    def __getitem__(self, item):
+        """
+        Return the step at index ``item`` or a ``ZonedStepSequence`` if
+        ``item`` is a ``slice``.
+        :param item: an ``int`` or a ``slice``.
+        :return: a ``datetime`` or a ``ZonedStepSequence``.
+        """
+        if isinstance(item, slice):
+            return self.__class__(self._naive[item], self._tz, self._mode)
+        return _localize(self._tz, self._mode, self._naive[item])
+
+    def __iter__(self):
+        """
+        Return an iterator over the steps in this sequence.
+        :return: an iterator of ``datetime`` instances.
+        """
+        return self._localize_all(iter(self._naive), self._naive.delta)
+
+    def __reversed__(self):
+        """
+        Return an iterator over the steps in this sequence in reverse order.
+        :return: an iterator of ``datetime`` instances.
+        """
+        return self._localize_all(reversed(self._naive),
+                                  -self._naive.delta)
+
+    def __contains__(self, item):
+        """
+        Return whether ``item`` is one of the steps of this sequence.
+        :param item: a ``datetime``.
+        :return: ``True`` if ``item`` is in self.
+        """
+        return bool(self._positions(item))
+
+    def __eq__(self, other):
+        """
+        Return whether ``self == other``, which is the case if both sequences
+        step through the same naive steps in the same timezone and mode.
+        :param other: the right operand.
+        :return: ``True`` in case of equality.
+        """
+        if not isinstance(other, ZonedStepSequence):
+            return NotImplemented
+        return ((self._naive, self._tz, self._mode)
+                == (other._naive, other._tz, other._mode))
+
+    def __hash__(self):
+        """
+        Return a hashcode for this instance that is consistent with
+        ``__eq__``.
+        :return: a hashcode as ``int``.
+        """
+        return hash((self._naive, self._tz, self._mode))
+
+    def __repr__(self):
+        """
+        Return a textual representation of this instance.
+        :return: a repr of this object.
+        """
+        return '%s(%r, %r, %r)' % (self.__class__.__name__, self._naive,
+                                   self._tz, self._mode)
+
+    def _localize_all(self, naives, delta):
+        # Yield the aware datetime of each naive datetime that lies delta
+        # after the previous one. Within a segment of the offset table, a step
+        # is an addition; the table is looked up when a step leaves it.
+        tz = self._tz
+        mode = self._mode
+        since = until = None
+        fold = 0
+        for naive in naives:
+            if since is None or not since <= naive < until:
+                (shift, fold), since, until = _lookup(tz, mode, naive)
+                current = (naive + shift).replace(tzinfo=tz, fold=fold)
+            else:
+                current += delta
+                if fold:
+                    current = current.replace(fold=fold)
+            yield current
+
+    def _positions(self, value):
+        # Return the sorted indices of the steps that are equal to value.
+        if not isinstance(value, datetime) or value.tzinfo is None:
+            return []
+        instant = to_naive(value, self._tz, ABSOLUTE)
+        naive = to_naive(value, self._tz, self._mode)
+        candidates = {naive}
+        if self._mode == WALL:
+            # A step that was moved out of a gap lies before its wall time.
+            _, values = _segments(self._tz, naive.year, WALL)
+            candidates.update(naive - shift for shift, _ in values)
+        result = []
+        for candidate in candidates:
+            if candidate in self._naive:
+                index = self._naive.index(candidate)
+                if to_naive(self[index], self._tz, ABSOLUTE) == instant:
+                    result.append(index)
+        return sorted(result)
+
+
+def to_naive(value, tz, mode):
+    """
+    Return ``value`` as a naive ``datetime`` in UTC in 'absolute' mode or on
+    the wall clock of ``tz`` in 'wall' mode. A naive ``value`` is taken to be
+    a wall clock time in ``tz``.
+    :param value: a ``datetime``.
+    :param tz: a ``tzinfo``.
+    :param mode: one of 'wall' or 'absolute'.
+    :return: a naive ``datetime``.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=tz)
+    if mode == ABSOLUTE:
+        return value.replace(tzinfo=None) - value.utcoffset()
+    return value.astimezone(tz).replace(tzinfo=None)
+
+
+def spanning(time_range, tz, mode, **steps_kwargs):
+    """
+    Return a ``ZonedStepSequence`` over the given ``TimeRange``. See
+    ``TimeRange.tz_steps``.
+    :param time_range: a ``TimeRange``.
+    :param tz: a ``tzinfo``.
+    :param mode: one of 'wall' or 'absolute'.
+    :param steps_kwargs: the keyword arguments of ``TimeRange.steps``.
+    :return: a ``ZonedStepSequence``.
+    """
+    start = to_naive(time_range.start, tz, mode)
+    end = time_range.end and to_naive(time_range.end, tz, mode)
+    delta = time_range.steps(**steps_kwargs).delta
+    include_start = steps_kwargs.get('include_start', True)
+    include_end = steps_kwargs.get('include_end', True)
+    naive = StepSequence.spanning(start, end, delta, include_start,
+                                  include_end)
+    return ZonedStepSequence(naive, tz, mode)
+
+
+def wall_offsets(tz, first_year, last_year):
+    """
+    Return the UTC offsets of the wall times of ``tz`` as a table, from which
+    the offset of a naive wall time can be looked up by bisection. Wall times
+    in a gap or a fold get the offset before the transition, like with
+    ``fold=0``.
+    :param tz: a ``tzinfo``.
+    :param first_year: the first year that the table covers.
+    :param last_year: the last year that the table covers.
+    :return: a tuple of the sorted naive boundaries at which the offset
+    changes and the offsets as ``timedelta`` instances, of which the first
+    applies before the first boundary and each next one from a boundary on.
+    """
+    boundaries = []
+    offsets = [_utc_offset(tz, datetime(first_year - 1, 1, 1))]
+    for year in range(first_year - 1, last_year + 1):
+        for instant, before, after in _transitions(tz, year):
+            boundaries.append(instant + max(before, after))
+            offsets.append(after)
+    return boundaries, offsets
+
+
+def _utc_offset(tz, instant):
+    # Return the UTC offset of tz at the naive UTC datetime instant.
+    return tz.fromutc(instant.replace(tzinfo=tz)).utcoffset()
+
+
+@lru_cache(maxsize=256)
+def _transitions(tz, year):
+    # Return the (instant, before, after) transitions of the UTC offset of tz
+    # at naive UTC instants in (year-01-01, (year + 1)-01-01]. The offset is
+    # sampled daily and each change is bisected to the second.
+    low = datetime(year, 1, 1)
+    end = datetime(year + 1, 1, 1)
+    before = _utc_offset(tz, low)
+    result = []
+    while low < end:
+        high = low + _DAY
+        after = _utc_offset(tz, high)
+        if after != before:
+            lower, upper = 0, _DAY // _SECOND
+            while upper - lower > 1:
+                middle = (lower + upper) // 2
+                if _utc_offset(tz, low + middle * _SECOND) == before:
+                    lower = middle
+                else:
+                    upper = middle
+            result.append((low + upper * _SECOND, before, after))
+            before = after
+        low = high
+    return tuple(result)
+
+
+@lru_cache(maxsize=256)
+def _segments(tz, year, mode):
+    # Return the sorted boundaries of the segments of naive datetimes around
+    # the given year and the (shift, fold) of each segment, of which the
+    # first is unbounded. A naive datetime of a segment is converted by
+    # adding its shift: the offset in 'absolute' mode, the size of a gap in
+    # 'wall' mode.
+    boundaries = []
+    if mode == ABSOLUTE:
+        values = [(_utc_offset(tz, datetime(year - 1, 1, 1)), 0)]
+    else:
+        values = [(_ZERO, 0)]
+    for year_ in (year - 1, year, year + 1):
+        for instant, before, after in _transitions(tz, year_):
+            if mode == ABSOLUTE:
+                boundaries.append(instant)
+                values.append((after, int(after < before)))
+                if after < before:
+                    # The wall times of the fold occur a second time.
+                    boundaries.append(instant + before - after)
+                    values.append((after, 0))
+            elif after > before:
+                # The wall times of the gap do not exist.
+                boundaries.append(instant + before)
+                values.append((after - before, 0))
+                boundaries.append(instant + after)
+                values.append((_ZERO, 0))
+    return boundaries, values
+
+
+def _lookup(tz, mode, naive):
+    # Return the (shift, fold) of the segment of naive and the bounds within
+    # which it applies, limited to the year of naive.
+    year = naive.year
+    boundaries, values = _segments(tz, year, mode)
+    index = bisect_right(boundaries, naive)
+    since = datetime(year, 1, 1)
+    until = datetime(year + 1, 1, 1)
+    if index and boundaries[index - 1] > since:
+        since = boundaries[index - 1]
+    if index < len(boundaries) and boundaries[index] < until:
+        until = boundaries[index]
+    return values[index], since, until
+
+
+def _localize(tz, mode, naive):
+    # Return the aware datetime of a single naive datetime.
+    (shift, fold), _, _ = _lookup(tz, mode, naive)
+    return (naive + shift).replace(tzinfo=tz, fold=fold)